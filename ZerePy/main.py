@@ -7,12 +7,13 @@ if __name__ == "__main__":
     parser.add_argument('--server', action='store_true', help='Run in server mode')
     parser.add_argument('--host', default='0.0.0.0', help='Server host (default: 0.0.0.0)')
     parser.add_argument('--port', type=int, default=int(os.environ.get("PORT", 8000)), help='Server port (default: 8000)')
+    parser.add_argument('--workers', type=int, default=1, help='Server worker processes (default: 1)')
     args = parser.parse_args()
 
     if args.server:
         try:
             from src.server import start_server
-            start_server(host=args.host, port=args.port)
+            start_server(host=args.host, port=args.port, workers=args.workers)
         except ImportError:
             print("Server dependencies not installed. Run: poetry install --extras server")
             exit(1)
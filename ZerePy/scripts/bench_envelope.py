@@ -0,0 +1,122 @@
+"""
+Calldata size and gas per store-data record: legacy JSON text vs envelope.
+
+Builds the payloads /analyze and PATCH /habits send through store-data.
+The legacy format is the double-encoded JSON text; the envelope uses
+whatever body format and compression this environment has installed
+(msgpack / zstandard when available, else compact JSON / zlib).
+
+Gas is the intrinsic cost of a store-data transaction: 21000 plus 16 per
+non-zero and 4 per zero calldata byte (EIP-2028). A self-transfer runs no
+contract code, so this is what the transaction costs.
+
+Usage: python scripts/bench_envelope.py [--calls N]
+"""
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.helpers.sonic.envelope import COMPRESSION_NONE, EnvelopeCodec, decode_payload
+
+TX_BASE_GAS = 21000
+ZERO_BYTE_GAS = 4
+NONZERO_BYTE_GAS = 16
+
+ANALYSIS_PARAGRAPHS = [
+    "Based on your answers, the late-night scrolling seems to start when work stress peaks and "
+    "you look for a quick way to switch off. The short relief it brings reinforces the habit, "
+    "while the lost sleep makes the next day's stress harder to handle.",
+    "1. Wind-down anchor (10 minutes): at 22:30 put the phone on its charger outside the bedroom "
+    "and spend ten minutes on a paper book or stretching. Tie it to an existing cue such as "
+    "brushing your teeth so it needs no extra willpower.",
+    "2. Stress offload (5 minutes): before leaving work, write the three open tasks that worry "
+    "you most and the first step for each. Externalising them lowers the urge to keep checking "
+    "messages in the evening.",
+    "3. Replacement reward: when the urge to scroll appears, take a short walk or make a cup of "
+    "herbal tea instead. You keep the break you were looking for without the blue light and the "
+    "endless feed.",
+    "Previous attempts failed because they relied on deleting apps outright, which removed the "
+    "coping mechanism without replacing it. Start with one habit for the first week, track it "
+    "daily, and add the next one only once it feels automatic.",
+    "Expected outcome: within two to three weeks most people report falling asleep earlier and "
+    "feeling less reactive to work messages. Review your progress at the end of each week and "
+    "adjust the times if they clash with your routine.",
+]
+
+
+def analysis_record() -> Dict[str, Any]:
+    """storage_data as /analyze builds it, with an analysis of about 3 KB"""
+    analysis = "\n\n".join(ANALYSIS_PARAGRAPHS * 2)
+    return {
+        "user_id": "user-7f3a9c21",
+        "responses": {
+            "current_behavior": "Scrolling social media in bed until after midnight",
+            "trigger_situations": "Stressful work days, feeling too tired to do anything else",
+            "consequences": "Poor sleep, tired mornings, irritability at work",
+            "previous_attempts": "Deleted the apps twice, reinstalled them within a week",
+        },
+        "analysis": analysis,
+        "timestamp": "2026-10-17T09:30:00+00:00",
+    }
+
+
+def habit_record() -> Dict[str, Any]:
+    """habit_data as PATCH /habits builds it"""
+    return {
+        "user_id": "user-7f3a9c21",
+        "habit_id": "wind-down-anchor",
+        "completed": True,
+        "timestamp": "2026-10-17T22:41:07+00:00",
+    }
+
+
+def store_payload(data: Dict[str, Any], data_type: str) -> Dict[str, Any]:
+    """The payload store_data wraps the caller's JSON string in"""
+    return {"type": data_type, "data": json.dumps(data), "timestamp": 1792230600}
+
+
+def calldata_gas(calldata: bytes) -> int:
+    zero = calldata.count(0)
+    return TX_BASE_GAS + zero * ZERO_BYTE_GAS + (len(calldata) - zero) * NONZERO_BYTE_GAS
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    codec = EnvelopeCodec()
+    print(f"Envelope body format {codec.body_format}, compression {codec.compression} "
+          f"(0 = json/none, 1 = msgpack/zlib, 2 = zstd)\n")
+
+    for name, payload in (
+        ("behavior_analysis", store_payload(analysis_record(), "behavior_analysis")),
+        ("habit_completion", store_payload(habit_record(), "habit_completion")),
+    ):
+        legacy = json.dumps(payload).encode("utf-8")
+        envelope = codec.encode(payload)
+        assert decode_payload(envelope, codec) == payload
+        assert decode_payload(legacy) == payload
+
+        legacy_gas, envelope_gas = calldata_gas(legacy), calldata_gas(envelope)
+        encode_us = min(timeit.repeat(lambda: codec.encode(payload), number=args.calls, repeat=3)) / args.calls * 1e6
+        decode_us = min(timeit.repeat(lambda: codec.decode(envelope), number=args.calls, repeat=3)) / args.calls * 1e6
+        compressed = (envelope[2] >> 4) != COMPRESSION_NONE
+
+        print(f"{name} (record data {len(payload['data'])} bytes)")
+        print(f"  legacy JSON   {len(legacy):6d} bytes  {legacy_gas:7d} gas")
+        print(f"  envelope      {len(envelope):6d} bytes  {envelope_gas:7d} gas"
+              f"  ({'compressed' if compressed else 'uncompressed'})")
+        print(f"  saved         {1 - len(envelope) / len(legacy):6.1%} bytes  "
+              f"{1 - (envelope_gas - TX_BASE_GAS) / (legacy_gas - TX_BASE_GAS):6.1%} calldata gas")
+        print(f"  encode {encode_us:.1f} us, decode {decode_us:.1f} us\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+Fail if importing the connection manager pulls in a connection SDK.
+
+Connection modules are loaded from CONNECTION_REGISTRY only when an agent
+names them, so a minimal agent must not pay for SDKs it never uses. The
+import runs in a fresh interpreter so modules loaded by this script do not
+mask a regression.
+
+Usage: python scripts/check_lazy_imports.py
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Top-level packages only connections (or their helpers) should import
+FORBIDDEN = ("openai", "anthropic", "tweepy", "web3", "solana", "solders", "requests", "httpx")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src.connection_manager
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted({name.split(".")[0] for name in sys.modules})}))
+"""
+
+
+def main() -> int:
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        print(completed.stderr, file=sys.stderr)
+        print("FAIL: importing src.connection_manager raised", file=sys.stderr)
+        return 1
+
+    report = json.loads(completed.stdout.strip().splitlines()[-1])
+    loaded = sorted(set(FORBIDDEN) & set(report["modules"]))
+    if loaded:
+        print(f"FAIL: importing src.connection_manager loaded {', '.join(loaded)}", file=sys.stderr)
+        return 1
+
+    print(f"OK: src.connection_manager imported in {report['elapsed'] * 1000:.1f} ms without any connection SDK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 from src.connection_manager import ConnectionManager
 from src.helpers import print_h_bar
+from src.helpers.resilience import RetryPolicy
 from src.action_handler import execute_action
 import src.actions.twitter_actions  
 import src.actions.echochamber_actions
@@ -85,32 +86,49 @@ class ZerePyAgent:
             if not self.username:
                 logger.warning("Twitter username not found, some Twitter functionalities may be limited")
 
+    def _example_account_requests(self) -> list:
+        return [
+            ("twitter", "get-latest-tweets", [example_account])
+            for example_account in self.example_accounts
+        ]
+
+    def _build_system_prompt(self, example_results: list) -> str:
+        prompt_parts = []
+        prompt_parts.extend(self.bio)
+
+        if self.traits:
+            prompt_parts.append("\nYour key traits are:")
+            prompt_parts.extend(f"- {trait}" for trait in self.traits)
+
+        if self.examples or self.example_accounts:
+            prompt_parts.append("\nHere are some examples of your style (Please avoid repeating any of these):")
+            if self.examples:
+                prompt_parts.extend(f"- {example}" for example in self.examples)
+
+            for result in example_results:
+                tweets = result.get("result")
+                if tweets:
+                    prompt_parts.extend(f"- {tweet['text']}" for tweet in tweets)
+
+        return "\n".join(prompt_parts)
+
     def _construct_system_prompt(self) -> str:
         """Construct the system prompt from agent configuration"""
         if self._system_prompt is None:
-            prompt_parts = []
-            prompt_parts.extend(self.bio)
-
-            if self.traits:
-                prompt_parts.append("\nYour key traits are:")
-                prompt_parts.extend(f"- {trait}" for trait in self.traits)
-
-            if self.examples or self.example_accounts:
-                prompt_parts.append("\nHere are some examples of your style (Please avoid repeating any of these):")
-                if self.examples:
-                    prompt_parts.extend(f"- {example}" for example in self.examples)
-
-                if self.example_accounts:
-                    for example_account in self.example_accounts:
-                        tweets = self.connection_manager.perform_action(
-                            connection_name="twitter",
-                            action_name="get-latest-tweets",
-                            params=[example_account]
-                        )
-                        if tweets:
-                            prompt_parts.extend(f"- {tweet['text']}" for tweet in tweets)
-
-            self._system_prompt = "\n".join(prompt_parts)
+            results = []
+            if self.example_accounts:
+                results = self.connection_manager.perform_actions(self._example_account_requests())
+            self._system_prompt = self._build_system_prompt(results)
+
+        return self._system_prompt
+
+    async def _aconstruct_system_prompt(self) -> str:
+        """Async variant of _construct_system_prompt for callers already on an event loop"""
+        if self._system_prompt is None:
+            results = []
+            if self.example_accounts:
+                results = await self.connection_manager.aperform_actions(self._example_account_requests())
+            self._system_prompt = self._build_system_prompt(results)
 
         return self._system_prompt
     
@@ -145,8 +163,27 @@ class ZerePyAgent:
             params=[prompt, system_prompt]
         )
 
+    async def aprompt_llm(self, prompt: str, system_prompt: str = None) -> str:
+        """Async variant of prompt_llm"""
+        system_prompt = system_prompt or await self._aconstruct_system_prompt()
+
+        return await self.connection_manager.aperform_action(
+            connection_name=self.model_provider,
+            action_name="generate-text",
+            params=[prompt, system_prompt]
+        )
+
     def perform_action(self, connection: str, action: str, **kwargs) -> None:
         return self.connection_manager.perform_action(connection, action, **kwargs)
+
+    async def aperform_action(self, connection: str, action: str, **kwargs) -> None:
+        return await self.connection_manager.aperform_action(connection, action, **kwargs)
+
+    def astream_action(self, connection: str, action: str, **kwargs):
+        return self.connection_manager.astream_action(connection, action, **kwargs)
+
+    async def aperform_actions(self, requests: list, **kwargs) -> list:
+        return await self.connection_manager.aperform_actions(requests, **kwargs)
     
     def select_action(self, use_time_based_weights: bool = False) -> dict:
         task_weights = [weight for weight in self.task_weights.copy()]
@@ -172,6 +209,10 @@ class ZerePyAgent:
             logger.info(f"{i}...")
             time.sleep(1)
 
+        # Back off on consecutive loop failures instead of hammering a failing upstream
+        failure_backoff = RetryPolicy(base_delay=self.loop_delay, max_delay=self.loop_delay * 8)
+        consecutive_failures = 0
+
         try:
             while True:
                 success = False
@@ -208,11 +249,14 @@ class ZerePyAgent:
                     logger.info(f"\n⏳ Waiting {self.loop_delay} seconds before next loop...")
                     print_h_bar()
                     time.sleep(self.loop_delay if success else 60)
+                    consecutive_failures = 0
 
                 except Exception as e:
+                    delay = failure_backoff.backoff(consecutive_failures)
+                    consecutive_failures += 1
                     logger.error(f"\n❌ Error in agent loop iteration: {e}")
-                    logger.info(f"⏳ Waiting {self.loop_delay} seconds before retrying...")
-                    time.sleep(self.loop_delay)
+                    logger.info(f"⏳ Waiting {delay:.0f} seconds before retrying...")
+                    time.sleep(delay)
 
         except KeyboardInterrupt:
             logger.info("\n🛑 Agent loop stopped by user.")
@@ -339,6 +339,9 @@ class ZerePyCLI:
 
     def _load_agent_from_file(self, agent_name):
         try: 
+            if self.agent is not None:
+                # The outgoing agent's threads must stop before its replacement starts its own
+                self.agent.connection_manager.close()
             self.agent = ZerePyAgent(agent_name)
             logger.info(f"\n✅ Successfully loaded agent: {self.agent.name}")
         except FileNotFoundError:
@@ -1,82 +1,81 @@
+import asyncio
+import importlib
 import logging
-from typing import Any, List, Optional, Type, Dict
-from src.connections.base_connection import BaseConnection
-from src.connections.anthropic_connection import AnthropicConnection
-from src.connections.eternalai_connection import EternalAIConnection
-from src.connections.goat_connection import GoatConnection
-from src.connections.groq_connection import GroqConnection
-from src.connections.openai_connection import OpenAIConnection
-from src.connections.twitter_connection import TwitterConnection
-from src.connections.farcaster_connection import FarcasterConnection
-from src.connections.ollama_connection import OllamaConnection
-from src.connections.echochambers_connection import EchochambersConnection
-from src.connections.solana_connection import SolanaConnection
-from src.connections.hyperbolic_connection import HyperbolicConnection
-from src.connections.galadriel_connection import GaladrielConnection
-from src.connections.sonic_connection import SonicConnection
-from src.connections.discord_connection import DiscordConnection
-from src.connections.allora_connection import AlloraConnection
-from src.connections.xai_connection import XAIConnection
-from src.connections.ethereum_connection import EthereumConnection
-from src.connections.together_connection import TogetherAIConnection
-from src.connections.evm_connection import EVMConnection
-from src.connections.perplexity_connection import PerplexityConnection
-from src.connections.monad_connection import MonadConnection
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, List, Optional, Tuple, Type, Dict
+from src.connections.base_connection import BaseConnection, get_action_executor
+from src.helpers.cache import MISS, ResponseCache, normalize_params
+from src.helpers.rate_limit import RateLimitExceeded
+from src.helpers.resilience import CircuitBreaker, CircuitOpenError
+from src.helpers.singleflight import AsyncSingleFlight, SingleFlight
 
 logger = logging.getLogger("connection_manager")
 
+# Connection name -> "module:ClassName". Modules are only imported when an
+# agent config actually names them, so unused SDKs never get loaded.
+CONNECTION_REGISTRY: Dict[str, str] = {
+    "twitter": "src.connections.twitter_connection:TwitterConnection",
+    "anthropic": "src.connections.anthropic_connection:AnthropicConnection",
+    "openai": "src.connections.openai_connection:OpenAIConnection",
+    "farcaster": "src.connections.farcaster_connection:FarcasterConnection",
+    "groq": "src.connections.groq_connection:GroqConnection",
+    "eternalai": "src.connections.eternalai_connection:EternalAIConnection",
+    "ollama": "src.connections.ollama_connection:OllamaConnection",
+    "echochambers": "src.connections.echochambers_connection:EchochambersConnection",
+    "goat": "src.connections.goat_connection:GoatConnection",
+    "solana": "src.connections.solana_connection:SolanaConnection",
+    "hyperbolic": "src.connections.hyperbolic_connection:HyperbolicConnection",
+    "galadriel": "src.connections.galadriel_connection:GaladrielConnection",
+    "sonic": "src.connections.sonic_connection:SonicConnection",
+    "discord": "src.connections.discord_connection:DiscordConnection",
+    "allora": "src.connections.allora_connection:AlloraConnection",
+    "xai": "src.connections.xai_connection:XAIConnection",
+    "ethereum": "src.connections.ethereum_connection:EthereumConnection",
+    "together": "src.connections.together_connection:TogetherAIConnection",
+    "evm": "src.connections.evm_connection:EVMConnection",
+    "perplexity": "src.connections.perplexity_connection:PerplexityConnection",
+    "monad": "src.connections.monad_connection:MonadConnection",
+}
+
+_loaded_classes: Dict[str, Type[BaseConnection]] = {}
+
+# In-flight actions per connection in a batch unless configured otherwise
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Times an action rejected with a 429 is re-queued behind the limiter before giving up
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+class ActionRequestError(Exception):
+    """Raised when an action call cannot be dispatched (unknown, unconfigured or missing params)"""
+    pass
+
 
 class ConnectionManager:
     def __init__(self, agent_config):
         self.connections: Dict[str, BaseConnection] = {}
+        self.response_cache = ResponseCache()
+        # Identical concurrent read actions share one execution
+        self._inflight = SingleFlight()
+        self._ainflight = AsyncSingleFlight()
         for config in agent_config:
             self._register_connection(config)
 
     @staticmethod
-    def _class_name_to_type(class_name: str) -> Type[BaseConnection]:
-        if class_name == "twitter":
-            return TwitterConnection
-        elif class_name == "anthropic":
-            return AnthropicConnection
-        elif class_name == "openai":
-            return OpenAIConnection
-        elif class_name == "farcaster":
-            return FarcasterConnection
-        elif class_name == "groq":
-            return GroqConnection
-        elif class_name == "eternalai":
-            return EternalAIConnection
-        elif class_name == "ollama":
-            return OllamaConnection
-        elif class_name == "echochambers":
-            return EchochambersConnection
-        elif class_name == "goat":
-            return GoatConnection
-        elif class_name == "solana":
-            return SolanaConnection
-        elif class_name == "hyperbolic":
-            return HyperbolicConnection
-        elif class_name == "galadriel":
-            return GaladrielConnection
-        elif class_name == "sonic":
-            return SonicConnection
-        elif class_name == "discord":
-            return DiscordConnection
-        elif class_name == "allora":
-            return AlloraConnection
-        elif class_name == "xai":
-            return XAIConnection
-        elif class_name == "ethereum":
-            return EthereumConnection
-        elif class_name == "together":
-            return TogetherAIConnection
-        elif class_name == "evm":
-            return EVMConnection
-        elif class_name == "perplexity":
-            return PerplexityConnection
-        elif class_name == "monad":
-            return MonadConnection
-        return None
+    def _class_name_to_type(class_name: str) -> Optional[Type[BaseConnection]]:
+        """Resolve a connection name to its class, importing the module on first use"""
+        if class_name in _loaded_classes:
+            return _loaded_classes[class_name]
+
+        target = CONNECTION_REGISTRY.get(class_name)
+        if target is None:
+            return None
+
+        module_path, class_attr = target.split(":")
+        module = importlib.import_module(module_path)
+        connection_class = getattr(module, class_attr)
+        _loaded_classes[class_name] = connection_class
+        return connection_class
 
     def _register_connection(self, config_dic: Dict[str, Any]) -> None:
         """
@@ -89,7 +88,20 @@ class ConnectionManager:
         """
         try:
             name = config_dic["name"]
+            # Optional per-host HTTP pool overrides: {"https://host": {"pool_maxsize": 10, "timeout": 5}}
+            http_pools = config_dic.get("http_pools", {})
+            if http_pools:
+                # Imported here so agents without HTTP connections never load requests
+                from src.helpers.transport import http
+            for host, pool_config in http_pools.items():
+                http.configure_host(
+                    host,
+                    pool_maxsize=pool_config.get("pool_maxsize"),
+                    timeout=pool_config.get("timeout")
+                )
             connection_class = self._class_name_to_type(name)
+            if connection_class is None:
+                raise ValueError(f"Unknown connection type '{name}'")
             connection = connection_class(config_dic)
             self.connections[name] = connection
         except Exception as e:
@@ -98,7 +110,7 @@ class ConnectionManager:
     def _check_connection(self, connection_string: str) -> bool:
         try:
             connection = self.connections[connection_string]
-            return connection.is_configured(verbose=True)
+            return connection.refresh_readiness(verbose=True)
         except KeyError:
             logging.error(
                 "\nUnknown connection. Try 'list-connections' to see all supported connections."
@@ -113,6 +125,7 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
             success = connection.configure()
+            connection.invalidate_readiness()
 
             if success:
                 logging.info(
@@ -136,7 +149,7 @@ class ConnectionManager:
         logging.info("\nAVAILABLE CONNECTIONS:")
         for name, connection in self.connections.items():
             status = (
-                "✅ Configured" if connection.is_configured() else "❌ Not Configured"
+                "✅ Configured" if connection.refresh_readiness() else "❌ Not Configured"
             )
             logging.info(f"- {name}: {status}")
 
@@ -145,7 +158,7 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
 
-            if connection.is_configured():
+            if connection.refresh_readiness():
                 logging.info(
                     f"\n✅ {connection_name} is configured. You can use any of its actions."
                 )
@@ -169,62 +182,337 @@ class ConnectionManager:
         except Exception as e:
             logging.error(f"\nAn error occurred: {e}")
 
+    def _build_action_kwargs(
+        self, connection: BaseConnection, connection_name: str, action_name: str, params: List[Any]
+    ) -> Dict[str, Any]:
+        """
+        Map positional params onto the action's parameters
+
+        Raises:
+            ActionRequestError: If the action is unknown or required params are missing
+        """
+        if action_name not in connection.actions:
+            raise ActionRequestError(
+                f"Unknown action '{action_name}' for connection '{connection_name}'"
+            )
+
+        action = connection.actions[action_name]
+        if action.streaming:
+            raise ActionRequestError(
+                f"Action '{action_name}' streams its output; run it with astream_action"
+            )
+
+        # Positional params map onto the action's parameters in declaration order
+        kwargs = action.bind_params(params)
+
+        missing_required = action.missing_params(kwargs)
+        if missing_required:
+            raise ActionRequestError(
+                f"Missing required parameters: {', '.join(missing_required)}"
+            )
+
+        return kwargs
+
+    @staticmethod
+    def _cache_lookup_key(connection: BaseConnection, action_name: str, kwargs: Dict[str, Any]):
+        """Return (policy, key) for cacheable calls, (None, None) otherwise"""
+        policy = connection.actions[action_name].cache
+        if policy is None:
+            return None, None
+        cache_key = policy.cache_key(kwargs)
+        if cache_key is None:
+            return None, None
+        return policy, cache_key
+
+    @staticmethod
+    def _ensure_available(connection_name: str, connection: BaseConnection) -> None:
+        """Fail fast while the connection's circuit breaker is open"""
+        breaker = connection.resilience.breaker
+        if breaker.state == CircuitBreaker.OPEN:
+            raise CircuitOpenError(connection_name, breaker.retry_in())
+
+    def check_available(self, connection_name: str) -> None:
+        """
+        Raise CircuitOpenError if the named connection's upstream is known to be down
+
+        Unknown connections are left for the action call itself to report.
+        """
+        connection = self.connections.get(connection_name)
+        if connection is not None:
+            self._ensure_available(connection_name, connection)
+
+    def record_failure(self, connection_name: str, error: Optional[BaseException] = None) -> None:
+        """Count a failure observed outside dispatch (e.g. a caller-side timeout) against the breaker"""
+        connection = self.connections.get(connection_name)
+        if connection is not None:
+            connection.resilience.breaker.record_failure(error)
+
+    def breaker_states(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit breaker snapshot per loaded connection"""
+        return {
+            name: connection.resilience.breaker.snapshot()
+            for name, connection in self.connections.items()
+        }
+
+    @staticmethod
+    def _dispatch(connection: BaseConnection, action_name: str, kwargs: Dict[str, Any]) -> Any:
+        """
+        Run the action once the connection's rate limiter allows it, re-queueing on 429.
+
+        Calls go through the connection's circuit breaker; only read actions are
+        retried with backoff, writes get a single attempt.
+        """
+        limiter = connection.rate_limiter
+        retry = connection.actions[action_name].coalescable
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            limiter.acquire(action_name)
+            try:
+                return connection.resilience.call(
+                    lambda: connection.perform_action(action_name, kwargs), retry=retry
+                )
+            except RateLimitExceeded:
+                if attempt == MAX_RATE_LIMIT_RETRIES:
+                    raise
+
+    @staticmethod
+    async def _adispatch(connection: BaseConnection, action_name: str, kwargs: Dict[str, Any]) -> Any:
+        """Async _dispatch: waiting for a slot happens on the event loop, not a worker thread"""
+        limiter = connection.rate_limiter
+        retry = connection.actions[action_name].coalescable
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await limiter.aacquire(action_name)
+            try:
+                return await connection.resilience.acall(
+                    lambda: connection.aperform_action(action_name, kwargs), retry=retry
+                )
+            except RateLimitExceeded:
+                if attempt == MAX_RATE_LIMIT_RETRIES:
+                    raise
+
     def perform_action(
         self, connection_name: str, action_name: str, params: List[Any]
     ) -> Optional[Any]:
         """Perform an action on a specific connection with given parameters"""
         try:
             connection = self.connections[connection_name]
+            self._ensure_available(connection_name, connection)
 
-            if not connection.is_configured():
-                logging.error(
-                    f"\nError: Connection '{connection_name}' is not configured"
-                )
-                return None
+            if not connection.is_ready():
+                raise ActionRequestError(f"Connection '{connection_name}' is not configured")
 
-            if action_name not in connection.actions:
-                logging.error(
-                    f"\nError: Unknown action '{action_name}' for connection '{connection_name}'"
-                )
-                return None
-
-            action = connection.actions[action_name]
-
-            # Convert list of params to kwargs dictionary, handling both required and optional params
-            kwargs = {}
-            param_index = 0
-
-            # Add provided parameters up to the number provided
-            for i, param in enumerate(action.parameters):
-                if param_index < len(params):
-                    kwargs[param.name] = params[param_index]
-                    param_index += 1
-
-            # Validate all required parameters are present
-            missing_required = [
-                param.name
-                for param in action.parameters
-                if param.required and param.name not in kwargs
-            ]
-
-            if missing_required:
-                logging.error(
-                    f"\nError: Missing required parameters: {', '.join(missing_required)}"
+            kwargs = self._build_action_kwargs(connection, connection_name, action_name, params)
+            policy, cache_key = self._cache_lookup_key(connection, action_name, kwargs)
+            if cache_key is not None:
+                cached = self.response_cache.get(connection_name, action_name, cache_key, policy)
+                if cached is not MISS:
+                    return cached
+
+            if connection.actions[action_name].coalescable:
+                result = self._inflight.do(
+                    (connection_name, action_name, normalize_params(kwargs)),
+                    lambda: self._dispatch(connection, action_name, kwargs)
                 )
-                return None
+            else:
+                result = self._dispatch(connection, action_name, kwargs)
+            if cache_key is not None and policy.should_store(result):
+                self.response_cache.set(connection_name, action_name, cache_key, result, policy)
+            return result
+
+        except ActionRequestError as e:
+            logging.error(f"\nError: {e}")
+            return None
+        except Exception as e:
+            logging.error(
+                f"\nAn error occurred while trying action {action_name} for {connection_name} connection: {e}"
+            )
+            return None
+
+    async def _aready_connection(self, connection_name: str) -> BaseConnection:
+        """
+        The named connection, once it is known to be available and configured
+
+        Raises:
+            ActionRequestError: If the connection is unknown or not configured
+            CircuitOpenError: If its circuit breaker is open
+        """
+        try:
+            connection = self.connections[connection_name]
+        except KeyError:
+            raise ActionRequestError(f"Unknown connection '{connection_name}'")
+
+        self._ensure_available(connection_name, connection)
+        ready = connection.cached_readiness()
+        if ready is None:
+            # Stale readiness may need a network probe, keep it off the event loop
+            loop = asyncio.get_running_loop()
+            ready = await loop.run_in_executor(
+                get_action_executor(), connection.refresh_readiness
+            )
+        if not ready:
+            raise ActionRequestError(f"Connection '{connection_name}' is not configured")
+        return connection
+
+    async def _aexecute_action(
+        self, connection_name: str, action_name: str, params: List[Any]
+    ) -> Any:
+        """Run an action asynchronously, raising instead of logging on failure"""
+        connection = await self._aready_connection(connection_name)
+        kwargs = self._build_action_kwargs(connection, connection_name, action_name, params)
+        policy, cache_key = self._cache_lookup_key(connection, action_name, kwargs)
+        if cache_key is not None:
+            cached = self.response_cache.get(connection_name, action_name, cache_key, policy)
+            if cached is not MISS:
+                return cached
 
-            return connection.perform_action(action_name, kwargs)
+        if connection.actions[action_name].coalescable:
+            result = await self._ainflight.do(
+                (connection_name, action_name, normalize_params(kwargs)),
+                lambda: self._adispatch(connection, action_name, kwargs)
+            )
+        else:
+            result = await self._adispatch(connection, action_name, kwargs)
+        if cache_key is not None and policy.should_store(result):
+            self.response_cache.set(connection_name, action_name, cache_key, result, policy)
+        return result
+
+    async def aperform_action(
+        self, connection_name: str, action_name: str, params: List[Any]
+    ) -> Optional[Any]:
+        """Async version of perform_action, awaiting the connection's aperform_action"""
+        try:
+            return await self._aexecute_action(connection_name, action_name, params)
 
+        except ActionRequestError as e:
+            logging.error(f"\nError: {e}")
+            return None
         except Exception as e:
             logging.error(
                 f"\nAn error occurred while trying action {action_name} for {connection_name} connection: {e}"
             )
             return None
 
+    async def astream_action(
+        self, connection_name: str, action_name: str, params: List[Any]
+    ) -> AsyncIterator[Any]:
+        """
+        Run a streaming action, yielding its chunks as they arrive
+
+        Unlike aperform_action this raises on failure: a caller part way
+        through a stream has to know it broke off. Streams skip the response
+        cache and in-flight coalescing, and are never retried.
+        """
+        connection = await self._aready_connection(connection_name)
+        if action_name not in connection.actions:
+            raise ActionRequestError(
+                f"Unknown action '{action_name}' for connection '{connection_name}'"
+            )
+        action = connection.actions[action_name]
+        if not action.streaming:
+            raise ActionRequestError(f"Action '{action_name}' does not stream; use aperform_action")
+
+        kwargs = action.bind_params(params)
+        missing_required = action.missing_params(kwargs)
+        if missing_required:
+            raise ActionRequestError(
+                f"Missing required parameters: {', '.join(missing_required)}"
+            )
+
+        await connection.rate_limiter.aacquire(action_name)
+        async for chunk in connection.resilience.astream(
+            lambda: connection.astream_action(action_name, kwargs)
+        ):
+            yield chunk
+
+    async def aperform_actions(
+        self,
+        requests: List[Tuple[str, str, List[Any]]],
+        max_concurrency: Optional[Dict[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several independent actions concurrently
+
+        Args:
+            requests: (connection_name, action_name, params) tuples
+            max_concurrency: Optional per-connection cap on in-flight actions, falling
+                back to the connection's "max_concurrency" config value
+
+        Returns:
+            One result dict per request, in request order, with "status" set to
+            "success" (and "result") or "error" (and "error")
+        """
+        max_concurrency = max_concurrency or {}
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+        for connection_name, _, _ in requests:
+            if connection_name in semaphores:
+                continue
+            connection = self.connections.get(connection_name)
+            limit = max_concurrency.get(connection_name)
+            if limit is None and connection is not None:
+                limit = connection.config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+            semaphores[connection_name] = asyncio.Semaphore(limit or DEFAULT_MAX_CONCURRENCY)
+
+        async def _run(connection_name: str, action_name: str, params: List[Any]) -> Dict[str, Any]:
+            item = {"connection": connection_name, "action": action_name}
+            async with semaphores[connection_name]:
+                try:
+                    item["result"] = await self._aexecute_action(connection_name, action_name, params or [])
+                    item["status"] = "success"
+                except Exception as e:
+                    logging.error(
+                        f"\nAn error occurred while trying action {action_name} for {connection_name} connection: {e}"
+                    )
+                    item["status"] = "error"
+                    item["error"] = str(e)
+            return item
+
+        return await asyncio.gather(
+            *(_run(connection_name, action_name, params) for connection_name, action_name, params in requests)
+        )
+
+    def perform_actions(
+        self,
+        requests: List[Tuple[str, str, List[Any]]],
+        max_concurrency: Optional[Dict[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Blocking wrapper around aperform_actions for sync callers
+
+        Coroutines should await aperform_actions instead. Sync code that still
+        ends up on a running event loop cannot asyncio.run() there, so the batch
+        gets its own loop on a dedicated thread; the action executor is left
+        alone because the batch's sync fallbacks run on it.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aperform_actions(requests, max_concurrency))
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="zerepy-batch") as executor:
+            return executor.submit(
+                asyncio.run, self.aperform_actions(requests, max_concurrency)
+            ).result()
+
+    def start_readiness_revalidators(self, interval: Optional[float] = None) -> None:
+        """Keep every connection's readiness cache warm from background threads"""
+        for connection in self.connections.values():
+            connection.start_readiness_revalidator(interval)
+
+    def stop_readiness_revalidators(self) -> None:
+        """Stop all background readiness refreshes"""
+        for connection in self.connections.values():
+            connection.stop_readiness_revalidator()
+
+    def close(self) -> None:
+        """Stop every connection's background threads; call before dropping the manager"""
+        for name, connection in self.connections.items():
+            try:
+                connection.close()
+            except Exception as e:
+                logging.error(f"Error closing connection {name}: {e}")
+
     def get_model_providers(self) -> List[str]:
         """Get a list of all LLM provider connections"""
         return [
             name
             for name, conn in self.connections.items()
-            if conn.is_configured() and getattr(conn, "is_llm_provider", lambda: False)
+            if conn.is_ready() and getattr(conn, "is_llm_provider", lambda: False)
         ]
@@ -2,7 +2,8 @@ import logging
 from typing import List, Dict, Any
 from dotenv import set_key, load_dotenv
 from allora_sdk.v2.api_client import AlloraAPIClient, ChainSlug, SignatureFormat
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, CachePolicy, is_successful_result
+from src.helpers.shared_state import get_shared_store
 import os
 import asyncio
 import json
@@ -11,6 +12,9 @@ import uuid
 
 logger = logging.getLogger("connections.allora_connection")
 
+# Shared store key of the feedback document when several server workers write it
+FEEDBACK_STORE_KEY = "allora:feedback_store"
+
 class AlloraConnectionError(Exception):
     """Base exception for Allora connection errors"""
     pass
@@ -59,11 +63,22 @@ class AlloraConnection(BaseConnection):
     def _save_local_storage(self):
         """Save feedback data to local storage"""
         try:
-            with open(self.local_storage_path, 'w') as f:
+            # Write then rename, so a reader never sees a half-written file
+            tmp_path = f"{self.local_storage_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
                 json.dump(self.feedback_store, f, indent=2)
+            os.replace(tmp_path, self.local_storage_path)
         except Exception as e:
             logger.error(f"Error saving to local storage: {str(e)}")
 
+    def _refresh_feedback_store(self) -> None:
+        """Pick up feedback other worker processes wrote to the shared store"""
+        store = get_shared_store()
+        if store is not None:
+            document = store.get(FEEDBACK_STORE_KEY)
+            if document is not None:
+                self.feedback_store = document
+
     @property
     def is_llm_provider(self) -> bool:
         return False
@@ -88,12 +103,14 @@ class AlloraConnection(BaseConnection):
                 parameters=[
                     ActionParameter("topic_id", True, int, "Topic ID to get inference for")
                 ],
-                description="Get inference from Allora Network for a specific topic"
+                description="Get inference from Allora Network for a specific topic",
+                read_only=True
             ),
             Action(
                 name="list-topics",
                 parameters=[],
-                description="List all available Allora Network topics"
+                description="List all available Allora Network topics",
+                cache=CachePolicy(ttl=600, accept=is_successful_result)
             ),
             Action(
                 name="submit-habit-feedback",
@@ -109,7 +126,8 @@ class AlloraConnection(BaseConnection):
             Action(
                 name="get-collective-insights",
                 parameters=[],
-                description="Get collective insights about habit effectiveness from the network"
+                description="Get collective insights about habit effectiveness from the network",
+                read_only=True
             )
         ]
         self.actions = {action.name: action for action in actions}
@@ -131,6 +149,15 @@ class AlloraConnection(BaseConnection):
         except Exception as e:
             raise AlloraAPIError(f"API request failed: {str(e)}")
 
+    async def _amake_request(self, method_name: str, *args, **kwargs) -> Any:
+        """Await an API request on the caller's event loop"""
+        try:
+            client = self._get_client()
+            method = getattr(client, method_name)
+            return await method(*args, **kwargs)
+        except Exception as e:
+            raise AlloraAPIError(f"API request failed: {str(e)}")
+
     def get_inference(self, topic_id: int) -> Dict[str, Any]:
         """Get inference from Allora Network for a specific topic"""
         try:
@@ -142,6 +169,17 @@ class AlloraConnection(BaseConnection):
         except Exception as e:
             raise AlloraAPIError(f"Failed to get inference: {str(e)}")
 
+    async def aget_inference(self, topic_id: int) -> Dict[str, Any]:
+        """Async version of get_inference"""
+        try:
+            response = await self._amake_request('get_inference_by_topic_id', topic_id)
+            return {
+                "topic_id": topic_id,
+                "inference": response.inference_data.network_inference_normalized
+            }
+        except Exception as e:
+            raise AlloraAPIError(f"Failed to get inference: {str(e)}")
+
     def list_topics(self) -> List[Dict[str, Any]]:
         """List all available Allora Network topics"""
         try:
@@ -149,6 +187,13 @@ class AlloraConnection(BaseConnection):
         except Exception as e:
             raise AlloraAPIError(f"Failed to list topics: {str(e)}")
 
+    async def alist_topics(self) -> List[Dict[str, Any]]:
+        """Async version of list_topics"""
+        try:
+            return await self._amake_request('get_all_topics')
+        except Exception as e:
+            raise AlloraAPIError(f"Failed to list topics: {str(e)}")
+
     def submit_habit_feedback(self, habit_id: str, patient_id: str, effectiveness: int, 
                             feedback: str = "", implementation_duration: int = 0) -> Dict[str, Any]:
         """Submit feedback about a habit's effectiveness"""
@@ -170,9 +215,19 @@ class AlloraConnection(BaseConnection):
             }
             
             logger.info(f"Adding feedback to local storage: {feedback_entry}")
-            self.feedback_store["feedbacks"].append(feedback_entry)
-            
-            self._update_insights()
+            store = get_shared_store()
+            if store is not None:
+                # Read-modify-write in the shared store, so concurrent workers never drop a row
+                def append(document):
+                    document = document or self.feedback_store
+                    document["feedbacks"].append(feedback_entry)
+                    self._update_insights(document)
+                    return document
+
+                self.feedback_store = store.update(FEEDBACK_STORE_KEY, append)
+            else:
+                self.feedback_store["feedbacks"].append(feedback_entry)
+                self._update_insights()
             self._save_local_storage()
             
             logger.info("Feedback submitted successfully")
@@ -189,9 +244,10 @@ class AlloraConnection(BaseConnection):
                 "message": f"Failed to submit feedback: {str(e)}"
             }
 
-    def _update_insights(self):
+    def _update_insights(self, feedback_store: Dict[str, Any] = None):
         """Update insights based on feedback data"""
-        feedbacks = self.feedback_store["feedbacks"]
+        feedback_store = feedback_store if feedback_store is not None else self.feedback_store
+        feedbacks = feedback_store["feedbacks"]
         if not feedbacks:
             return
         
@@ -217,7 +273,7 @@ class AlloraConnection(BaseConnection):
             reverse=True
         )
         
-        self.feedback_store["insights"] = {
+        feedback_store["insights"] = {
             "averageEffectiveness": round(avg_effectiveness, 2),
             "topHabits": sorted_habits[:5],  # Top 5 habits
             "totalFeedbackCount": len(feedbacks),
@@ -227,6 +283,7 @@ class AlloraConnection(BaseConnection):
     def get_collective_insights(self) -> Dict[str, Any]:
         """Get collective insights about habit effectiveness"""
         try:
+            self._refresh_feedback_store()
             # For hackathon: Return locally stored insights
             if not self.feedback_store.get("insights"):
                 return self._get_default_insights()
@@ -252,6 +309,34 @@ class AlloraConnection(BaseConnection):
             logger.error(f"Failed to get collective insights: {str(e)}")
             return self._get_default_insights()
 
+    async def aget_collective_insights(self) -> Dict[str, Any]:
+        """Async version of get_collective_insights"""
+        try:
+            # The shared store read blocks, so it runs off the event loop
+            await asyncio.to_thread(self._refresh_feedback_store)
+            if not self.feedback_store.get("insights"):
+                return self._get_default_insights()
+
+            try:
+                inference = await self._amake_request(
+                    'get_inference_by_topic_id',
+                    self.topic_id,
+                    SignatureFormat.ETHEREUM_SEPOLIA
+                )
+                allora_data = inference.inference_data.network_inference_normalized
+            except Exception as e:
+                logger.warning(f"Could not get Allora inference: {str(e)}")
+                allora_data = "Not available"
+
+            return {
+                **self.feedback_store["insights"],
+                "allora_inference": allora_data
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to get collective insights: {str(e)}")
+            return self._get_default_insights()
+
     def _get_default_insights(self) -> Dict[str, Any]:
         """Get default insights when no data is available"""
         return {
@@ -319,20 +404,10 @@ class AlloraConnection(BaseConnection):
 
             action = self.actions[action_name]
             
-            logger.info(f"Performing action {action_name} with params: {kwargs}")
+            logger.debug(f"Performing action {action_name} with params: {kwargs}")
             
             if not isinstance(kwargs, dict):
-                logger.warning(f"kwargs is not a dictionary: {type(kwargs)}")
-                if isinstance(kwargs, list):
-                    param_names = [p.name for p in action.parameters]
-                    kwargs_dict = {}
-                    for i, value in enumerate(kwargs):
-                        if i < len(param_names):
-                            kwargs_dict[param_names[i]] = value
-                    kwargs = kwargs_dict
-                    logger.info(f"Converted kwargs to dictionary: {kwargs}")
-                else:
-                    kwargs = {}
+                kwargs = action.bind_params(kwargs) if isinstance(kwargs, list) else {}
             
             errors = action.validate_params(kwargs)
             if errors:
@@ -340,11 +415,10 @@ class AlloraConnection(BaseConnection):
                 logger.error(error_msg)
                 raise ValueError(error_msg)
 
-            method_name = action_name.replace('-', '_')
-            method = getattr(self, method_name)
+            method = self.get_handler(action_name)
             
             result = method(**kwargs)
-            logger.info(f"Action {action_name} completed successfully")
+            logger.debug(f"Action {action_name} completed successfully")
             return result
             
         except Exception as e:
@@ -352,4 +426,23 @@ class AlloraConnection(BaseConnection):
             return {
                 "status": "error",
                 "message": str(e)
-            }
\ No newline at end of file
+            }
+
+    async def aperform_action(self, action_name: str, kwargs) -> Any:
+        """Async version of perform_action, with the same error reporting"""
+        if action_name not in self.actions or self.get_async_handler(action_name) is None:
+            # Runs perform_action on the executor, which already logs and wraps errors
+            return await super().aperform_action(action_name, kwargs)
+
+        try:
+            logger.debug(f"Performing action {action_name} with params: {kwargs}")
+            result = await super().aperform_action(action_name, kwargs)
+            logger.debug(f"Action {action_name} completed successfully")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in perform_action: {str(e)}")
+            return {
+                "status": "error",
+                "message": str(e)
+            }
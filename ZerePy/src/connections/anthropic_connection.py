@@ -2,8 +2,8 @@ import logging
 import os
 from typing import Dict, Any
 from dotenv import load_dotenv, set_key
-from anthropic import Anthropic, NotFoundError
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from anthropic import Anthropic, AsyncAnthropic, NotFoundError
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, CachePolicy
 
 logger = logging.getLogger("connections.anthropic_connection")
 
@@ -23,6 +23,7 @@ class AnthropicConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        self._async_client = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -58,7 +59,8 @@ class AnthropicConnection(BaseConnection):
                 parameters=[
                     ActionParameter("model", True, str, "Model name to check availability")
                 ],
-                description="Check if a specific model is available"
+                description="Check if a specific model is available",
+                cache=CachePolicy(ttl=3600)
             ),
             "list-models": Action(
                 name="list-models",
@@ -76,6 +78,15 @@ class AnthropicConnection(BaseConnection):
             self._client = Anthropic(api_key=api_key)
         return self._client
 
+    def _get_async_client(self) -> AsyncAnthropic:
+        """Get or create async Anthropic client"""
+        if not self._async_client:
+            api_key = os.getenv("ANTHROPIC_API_KEY")
+            if not api_key:
+                raise AnthropicConfigurationError("Anthropic API key not found in environment")
+            self._async_client = AsyncAnthropic(api_key=api_key)
+        return self._async_client
+
     def configure(self) -> bool:
         """Sets up Anthropic API authentication"""
         logger.info("\n🤖 ANTHROPIC API SETUP")
@@ -159,6 +170,37 @@ class AnthropicConnection(BaseConnection):
         except Exception as e:
             raise AnthropicAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
+        """Generate text using Anthropic models without blocking the event loop"""
+        try:
+            client = self._get_async_client()
+
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            message = await client.messages.create(
+                model=model,
+                max_tokens=1000,
+                temperature=0,
+                system=system_prompt,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": prompt
+                            }
+                        ]
+                    }
+                ]
+            )
+            return message.content[0].text
+
+        except Exception as e:
+            raise AnthropicAPIError(f"Text generation failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
@@ -175,6 +217,22 @@ class AnthropicConnection(BaseConnection):
         except Exception as e:
             raise AnthropicAPIError(f"Model check failed: {e}")
 
+    async def acheck_model(self, model: str, **kwargs) -> bool:
+        """Check if a specific model is available without blocking the event loop"""
+        try:
+            client = self._get_async_client()
+            try:
+                await client.models.retrieve(model_id=model)
+                return True
+            except NotFoundError:
+                logging.error("Model not found.")
+                return False
+            except Exception as e:
+                raise AnthropicAPIError(f"Model check failed: {e}")
+
+        except Exception as e:
+            raise AnthropicAPIError(f"Model check failed: {e}")
+
     def list_models(self, **kwargs) -> None:
         """List all available Anthropic models"""
         try:
@@ -200,6 +258,5 @@ class AnthropicConnection(BaseConnection):
             raise ValueError(f"Invalid parameters: {', '.join(errors)}")
 
         # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         return method(**kwargs)
\ No newline at end of file
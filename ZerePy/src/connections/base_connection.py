@@ -1,7 +1,16 @@
+import asyncio
+import inspect
 import logging
+import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Callable
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Hashable, List, Callable, Optional, Tuple
+from dataclasses import dataclass, field
+from src.helpers.cache import normalize_params
+from src.helpers.rate_limit import RateLimiter, RateLimitExceeded
+from src.helpers.resilience import ResiliencePolicy
 
 @dataclass
 class ActionParameter:
@@ -10,25 +19,126 @@ class ActionParameter:
     type: type
     description: str
 
+def is_successful_result(result: Any) -> bool:
+    """
+    False for None and for the {"status": "error", ...} dict that some
+    connections' perform_action returns instead of raising
+    """
+    if isinstance(result, dict) and result.get("status") == "error":
+        return False
+    return result is not None
+
+
+@dataclass
+class CachePolicy:
+    """
+    Declares that an action's results can be served from the response cache.
+
+    ttl: seconds an entry stays valid
+    max_entries: LRU size for this action
+    key: maps the action kwargs to a cache key; returning None skips the cache
+        for that call. Defaults to the normalized kwargs.
+    accept: decides whether a result is worth storing; defaults to rejecting
+        None and empty containers, which usually mean "not found (yet)"
+    """
+    ttl: float
+    max_entries: int = 256
+    key: Optional[Callable[[Dict[str, Any]], Optional[Hashable]]] = None
+    accept: Optional[Callable[[Any], bool]] = None
+
+    def cache_key(self, params: Dict[str, Any]) -> Optional[Hashable]:
+        if self.key is not None:
+            return self.key(params)
+        return normalize_params(params)
+
+    def should_store(self, result: Any) -> bool:
+        if self.accept is not None:
+            return self.accept(result)
+        if result is None:
+            return False
+        if isinstance(result, (list, dict, tuple, str)) and not result:
+            return False
+        return True
+
 @dataclass
 class Action:
     name: str
     parameters: List[ActionParameter]
     description: str
-    
+    cache: Optional[CachePolicy] = None
+    # Pure reads: identical concurrent calls may share one in-flight execution.
+    # Actions with a cache policy are treated as reads as well.
+    read_only: bool = False
+    # Yields chunks as they arrive; run through astream_action rather than perform_action
+    streaming: bool = False
+
+    # Precomputed at construction so per-call binding and validation avoid
+    # re-walking the ActionParameter list
+    _param_names: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _required_names: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _checks: Tuple[Tuple[str, bool, type], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._param_names = tuple(param.name for param in self.parameters)
+        self._required_names = tuple(param.name for param in self.parameters if param.required)
+        self._checks = tuple((param.name, param.required, param.type) for param in self.parameters)
+
+    @property
+    def coalescable(self) -> bool:
+        return self.read_only or self.cache is not None
+
+    def bind_params(self, params: List[Any]) -> Dict[str, Any]:
+        """Map positional params onto parameter names in declaration order; extras are dropped"""
+        return dict(zip(self._param_names, params))
+
+    def missing_params(self, params: Dict[str, Any]) -> List[str]:
+        return [name for name in self._required_names if name not in params]
+
     def validate_params(self, params: Dict[str, Any]) -> List[str]:
         errors = []
-        for param in self.parameters:
-            if param.required and param.name not in params:
-                errors.append(f"Missing required parameter: {param.name}")
-            elif param.name in params:
+        for name, required, expected in self._checks:
+            if name in params:
+                value = params[name]
+                if type(value) is expected:
+                    continue
                 try:
-                    params[param.name] = param.type(params[param.name])
+                    params[name] = expected(value)
                 except ValueError:
-                    errors.append(f"Invalid type for {param.name}. Expected {param.type.__name__}")
+                    errors.append(f"Invalid type for {name}. Expected {expected.__name__}")
+            elif required:
+                errors.append(f"Missing required parameter: {name}")
         return errors
 
+_action_executor: Optional[ThreadPoolExecutor] = None
+_action_executor_lock = threading.Lock()
+
+def get_action_executor() -> ThreadPoolExecutor:
+    """Shared executor for connections that have no native async action path"""
+    global _action_executor
+    if _action_executor is None:
+        with _action_executor_lock:
+            if _action_executor is None:
+                _action_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("ZEREPY_ACTION_WORKERS", "32")),
+                    thread_name_prefix="zerepy-action"
+                )
+    return _action_executor
+
 class BaseConnection(ABC):
+    # Seconds a positive is_configured() result is trusted before re-checking
+    readiness_ttl: float = 300.0
+    # Seconds a negative result is trusted, so a fresh configure is picked up quickly
+    readiness_failure_ttl: float = 5.0
+
+    # (ready, checked_at) from the last is_configured() run, None until first check
+    _readiness: Optional[Tuple[bool, float]] = None
+    _readiness_stop: Optional[threading.Event] = None
+    _rate_limiter: Optional[RateLimiter] = None
+    _resilience: Optional[ResiliencePolicy] = None
+    # action name -> bound sync handler / async handler (None when there is none)
+    _handlers: Optional[Dict[str, Optional[Callable]]] = None
+    _async_handlers: Optional[Dict[str, Optional[Callable]]] = None
+
     def __init__(self, config):
         try:
             # Dictionary to store action name -> handler method mapping
@@ -37,6 +147,7 @@ class BaseConnection(ABC):
             self.config = self.validate_config(config) 
             # Register actions during initialization
             self.register_actions()
+            self.compile_actions()
         except Exception as e:
             logging.error("Could not initialize the connection")
             raise e
@@ -84,6 +195,122 @@ class BaseConnection(ABC):
         """
         pass
 
+    def is_ready(self) -> bool:
+        """
+        Cached readiness check for the action hot path.
+
+        Returns the last is_configured() result while it is within its TTL and
+        only falls back to the (possibly network-bound) check once it expires.
+        """
+        ready = self.cached_readiness()
+        if ready is None:
+            return self.refresh_readiness()
+        return ready
+
+    def cached_readiness(self) -> Optional[bool]:
+        """Return the cached readiness if still within its TTL, None if stale or unknown"""
+        readiness = self._readiness
+        if readiness is None:
+            return None
+        ready, checked_at = readiness
+        ttl = self.readiness_ttl if ready else self.readiness_failure_ttl
+        if time.monotonic() - checked_at < ttl:
+            return ready
+        return None
+
+    def refresh_readiness(self, verbose: bool = False) -> bool:
+        """Run is_configured() now and store the result in the readiness cache"""
+        try:
+            ready = bool(self.is_configured(verbose=verbose))
+        except Exception as e:
+            logging.debug(f"Readiness check failed for {type(self).__name__}: {e}")
+            ready = False
+        self._readiness = (ready, time.monotonic())
+        return ready
+
+    def invalidate_readiness(self) -> None:
+        """Drop the cached readiness so the next is_ready() re-checks"""
+        self._readiness = None
+
+    def start_readiness_revalidator(self, interval: Optional[float] = None) -> None:
+        """
+        Refresh the readiness cache from a daemon thread so is_ready() never
+        has to run is_configured() inline.
+
+        Args:
+            interval: Seconds between refreshes, defaults to half of readiness_ttl
+        """
+        if self._readiness_stop is not None:
+            return
+
+        interval = interval or self.readiness_ttl / 2
+        stop_event = threading.Event()
+        self._readiness_stop = stop_event
+
+        def _revalidate():
+            while not stop_event.is_set():
+                self.refresh_readiness()
+                stop_event.wait(timeout=interval)
+
+        threading.Thread(
+            target=_revalidate,
+            name=f"{type(self).__name__}-readiness",
+            daemon=True
+        ).start()
+
+    def stop_readiness_revalidator(self) -> None:
+        """Stop the background readiness refresh, if running"""
+        if self._readiness_stop is not None:
+            self._readiness_stop.set()
+            self._readiness_stop = None
+
+    def close(self) -> None:
+        """
+        Stop the connection's background work (threads, pollers) before it is
+        discarded, e.g. when its agent is replaced. Connections that start
+        their own threads extend this.
+        """
+        self.stop_readiness_revalidator()
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """
+        Token-bucket limiter for this connection, built from the optional
+        "rate_limit" block of its config. Unconfigured connections get an
+        unlimited limiter that still backs off on 429/Retry-After feedback.
+        """
+        if self._rate_limiter is None:
+            config = getattr(self, "config", None) or {}
+            self._rate_limiter = RateLimiter.from_config(config.get("rate_limit"))
+        return self._rate_limiter
+
+    @property
+    def resilience(self) -> ResiliencePolicy:
+        """
+        Retry/backoff policy and circuit breaker for this connection's upstream,
+        built from the optional "retry" and "circuit_breaker" config blocks
+        """
+        if self._resilience is None:
+            config = getattr(self, "config", None) or {}
+            name = type(self).__name__.replace("Connection", "").lower()
+            self._resilience = ResiliencePolicy.from_config(name, config)
+        return self._resilience
+
+    def check_rate_limit(self, response, endpoint: Optional[str] = None) -> None:
+        """
+        Feed an HTTP response's rate-limit headers back into the limiter
+
+        Raises:
+            RateLimitExceeded: If the response is a 429, so the caller can re-queue
+                the action instead of sleeping on a worker thread
+        """
+        headers = getattr(response, "headers", None) or {}
+        retry_after = self.rate_limiter.update_from_headers(headers, endpoint)
+        if getattr(response, "status_code", None) == 429:
+            if retry_after is None:
+                self.rate_limiter.penalize(None, endpoint)
+            raise RateLimitExceeded(f"{type(self).__name__} rate limited", retry_after)
+
     @abstractmethod
     def register_actions(self) -> None:
         """
@@ -92,6 +319,50 @@ class BaseConnection(ABC):
         """
         pass
 
+    def compile_actions(self) -> None:
+        """
+        Resolve each registered action to its bound handler methods once, so
+        dispatch is a dict lookup instead of a name rewrite plus getattr per call
+        """
+        self._handlers = {}
+        self._async_handlers = {}
+        for action_name in self.actions:
+            self._resolve_handlers(action_name)
+
+    def _resolve_handlers(self, action_name: str) -> None:
+        if self._handlers is None:
+            self._handlers, self._async_handlers = {}, {}
+        method_name = action_name.replace('-', '_')
+        self._handlers[action_name] = getattr(self, method_name, None)
+        async_method = getattr(self, "a" + method_name, None)
+        if async_method is not None and not (
+            asyncio.iscoroutinefunction(async_method) or inspect.isasyncgenfunction(async_method)
+        ):
+            async_method = None
+        self._async_handlers[action_name] = async_method
+
+    def get_handler(self, action_name: str) -> Callable:
+        """
+        Bound method implementing an action (e.g. post_tweet for post-tweet)
+
+        Raises:
+            NotImplementedError: If the connection has no such method
+        """
+        handlers = self._handlers
+        if handlers is None or action_name not in handlers:
+            self._resolve_handlers(action_name)
+            handlers = self._handlers
+        handler = handlers[action_name]
+        if handler is None:
+            raise NotImplementedError(f"The action '{action_name}' is not implemented.")
+        return handler
+
+    def get_async_handler(self, action_name: str) -> Optional[Callable]:
+        """Native coroutine (or async generator) for an action ("a" + handler name), None if there is none"""
+        if self._async_handlers is None or action_name not in self._async_handlers:
+            self._resolve_handlers(action_name)
+        return self._async_handlers[action_name]
+
     def perform_action(self, action_name: str, **kwargs) -> Any:
         """
         Perform a registered action with the given parameters.
@@ -110,5 +381,62 @@ class BaseConnection(ABC):
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
             
-        handler = self.actions[action_name]
-        return handler(**kwargs)
+        return self.get_handler(action_name)(**kwargs)
+
+    def check_action(self, action_name: str, kwargs: Dict[str, Any]) -> None:
+        """
+        Guards run before a native async handler is called, so the async path
+        rejects the same calls perform_action would. Connections with extra
+        preconditions (e.g. a readiness check) override this and call super().
+
+        Raises:
+            ValueError: If the action parameters are invalid
+        """
+        errors = self.actions[action_name].validate_params(kwargs)
+        if errors:
+            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
+
+    async def aperform_action(self, action_name: str, kwargs) -> Any:
+        """
+        Async counterpart of perform_action.
+
+        If the connection defines a coroutine named after the action with an
+        "a" prefix (e.g. agenerate_text for generate-text) it is awaited
+        directly; otherwise perform_action runs on the shared action executor.
+
+        Raises:
+            KeyError: If the action is not registered
+            ValueError: If the action parameters are invalid
+        """
+        if action_name not in self.actions:
+            raise KeyError(f"Unknown action: {action_name}")
+
+        method = self.get_async_handler(action_name)
+        if method is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                get_action_executor(), self.perform_action, action_name, kwargs
+            )
+
+        self.check_action(action_name, kwargs)
+        return await method(**kwargs)
+
+    def astream_action(self, action_name: str, kwargs) -> AsyncIterator[Any]:
+        """
+        Chunks of a streaming action, from its async generator ("a" + handler
+        name, e.g. astream_text for stream-text)
+
+        Raises:
+            KeyError: If the action is not registered
+            ValueError: If the action parameters are invalid
+            NotImplementedError: If the connection has no async generator for it
+        """
+        if action_name not in self.actions:
+            raise KeyError(f"Unknown action: {action_name}")
+
+        method = self.get_async_handler(action_name)
+        if method is None or not inspect.isasyncgenfunction(method):
+            raise NotImplementedError(f"The action '{action_name}' cannot be streamed.")
+
+        self.check_action(action_name, kwargs)
+        return method(**kwargs)
@@ -4,7 +4,7 @@ from typing import Dict, Any
 from dotenv import set_key, load_dotenv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.helpers import print_h_bar
-import requests
+from src.helpers.transport import http
 import json
 
 logger = logging.getLogger("connections.discord_connection")
@@ -244,8 +244,7 @@ class DiscordConnection(BaseConnection):
                 kwargs["server_id"] = self.config["server_id"]
 
         # Call the appropriate method based on action name
-        method_name = action_name.replace("-", "_")
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         return method(**kwargs)
 
     def list_channels(self, server_id: str, **kwargs) -> dict:
@@ -390,7 +389,8 @@ class DiscordConnection(BaseConnection):
             "Accept": "application/json",
             "Authorization": self._get_request_auth_token(),
         }
-        response = requests.request("PUT", url, headers=headers, data={})
+        response = http.request("PUT", url, headers=headers, data={})
+        self.check_rate_limit(response)
         if response.status_code != 204:
             raise DiscordAPIError(
                 f"Failed to called PUT to Discord: {response.status_code} - {response.text}"
@@ -405,7 +405,8 @@ class DiscordConnection(BaseConnection):
             "Accept": "application/json",
             "Authorization": self._get_request_auth_token(),
         }
-        response = requests.request("POST", url, headers=headers, data=payload)
+        response = http.request("POST", url, headers=headers, data=payload)
+        self.check_rate_limit(response)
         if response.status_code != 200:
             raise DiscordAPIError(
                 f"Failed to call POST to Discord: {response.status_code} - {response.text}"
@@ -420,7 +421,8 @@ class DiscordConnection(BaseConnection):
             "Authorization": self._get_request_auth_token(),
         }
         print(headers)
-        response = requests.request("GET", url, headers=headers, data={})
+        response = http.request("GET", url, headers=headers, data={})
+        self.check_rate_limit(response)
         if response.status_code != 200:
             raise DiscordAPIError(
                 f"Failed to call GET to Discord: {response.status_code} - {response.text}"
@@ -435,7 +437,7 @@ class DiscordConnection(BaseConnection):
         try:
             url = f"{self.base_url}/users/@me"
             headers = {"Accept": "application/json", "Authorization": f"Bot {api_key}"}
-            response = requests.request("GET", url, headers=headers, data={})
+            response = http.request("GET", url, headers=headers, data={})
             if response.status_code != 200:
                 raise DiscordAPIError(
                     f"Failed to call GET to Discord: {response.status_code} - {response.text}"
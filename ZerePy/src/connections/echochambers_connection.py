@@ -4,8 +4,10 @@ from typing import Dict, Any, List
 from collections import deque
 
 import requests
+from src.helpers.transport import http
+from src.helpers.rate_limit import RateLimitExceeded
 from dotenv import load_dotenv
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, CachePolicy
 
 logger = logging.getLogger("connections.echochambers_connection")
 
@@ -85,12 +87,14 @@ class EchochambersConnection(BaseConnection):
             Action(
                 name="get-room-info",
                 description="Get information about the current room including topic and tags",
-                parameters=[]
+                parameters=[],
+                cache=CachePolicy(ttl=60)
             ),
             Action(
                 name="get-room-history",
                 description="Get message history from the Echochambers room",
-                parameters=[]
+                parameters=[],
+                read_only=True
             ),
             Action(
                 name="send-message",
@@ -202,31 +206,25 @@ class EchochambersConnection(BaseConnection):
             raise
 
     def _make_request(self, method: str, url: str, **kwargs) -> Any:
-        """Make HTTP request with retries and error handling"""
+        """
+        Make a single HTTP request. Retries, backoff and fail-fast are applied
+        around the whole action by the connection's resilience policy.
+        """
         headers = {
             "Content-Type": "application/json",
             "x-api-key": self.api_key
         }
         kwargs['headers'] = headers
 
-        for attempt in range(3):
-            try:
-                response = requests.request(method, url, timeout=10, **kwargs)
-                if response.status_code == 429:  # Rate limit
-                    retry_after = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f"Rate limit hit, waiting {retry_after}s")
-                    time.sleep(retry_after)
-                    continue
-                response.raise_for_status()
-                return response.json()
-            except requests.Timeout:
-                logger.error(f"Timeout on attempt {attempt + 1}")
-                time.sleep(2 ** attempt)  # Exponential backoff
-            except requests.RequestException as e:
-                if attempt == 2:
-                    raise EchochambersAPIError(f"Failed after 3 attempts: {str(e)}")
-                logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
-                time.sleep(2 ** attempt)
+        try:
+            response = http.request(method, url, timeout=10, **kwargs)
+            # A 429 raises RateLimitExceeded so the action is re-queued behind
+            # the limiter instead of sleeping here
+            self.check_rate_limit(response)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            raise EchochambersAPIError(f"Request to {url} failed: {str(e)}")
 
     def _handle_error(self, message: str, error: Exception) -> None:
         """Handle and log errors"""
@@ -294,9 +292,4 @@ class EchochambersConnection(BaseConnection):
         if errors:
             raise ValueError(f"Invalid parameters: {', '.join(errors)}")
 
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name, None)
-        if method:
-            return method(**kwargs)
-        else:
-            raise NotImplementedError(f"The action '{action_name}' is not implemented.")
\ No newline at end of file
+        return self.get_handler(action_name)(**kwargs)
\ No newline at end of file
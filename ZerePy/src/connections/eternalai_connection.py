@@ -1,18 +1,18 @@
 import logging
 import os
 import json
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict, Iterator
 from dotenv import load_dotenv, set_key
-from openai import OpenAI
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
-from web3 import Web3
-import requests
+from openai import AsyncOpenAI, OpenAI
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, CachePolicy
+from src.helpers.transport import http
 from src.prompts import ANALYZE_AND_SUGGEST_PROMPT
 
 logger = logging.getLogger("connections.eternalai_connection")
 IPFS = "ipfs://"
 LIGHTHOUSE_IPFS = "https://gateway.lighthouse.storage/ipfs/"
 GCS_ETERNAL_AI_BASE_URL = "https://cdn.eternalai.org/upload/"
+HABITS_SYSTEM_PROMPT = "You are a health and wellness expert, focused on helping people develop healthy and sustainable habits. Your suggestions are practical, evidence-based, and tailored to individual needs."
 AGENT_CONTRACT_ABI = [{"inputs": [{"internalType": "uint256","name": "_agentId","type": "uint256"}],"name": "getAgentSystemPrompt","outputs": [{"internalType": "bytes[]","name": "","type": "bytes[]"}],"stateMutability": "view","type": "function"}]
 
 class EternalAIConnectionError(Exception):
@@ -34,6 +34,7 @@ class EternalAIConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        self._async_client = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -60,7 +61,8 @@ class EternalAIConnection(BaseConnection):
                 parameters=[
                     ActionParameter("model", True, str, "Model name to check availability")
                 ],
-                description="Check if a specific model is available"
+                description="Check if a specific model is available",
+                cache=CachePolicy(ttl=3600)
             ),
             "list-models": Action(
                 name="list-models",
@@ -73,6 +75,23 @@ class EternalAIConnection(BaseConnection):
                     ActionParameter("health_metrics", True, str, "Health metrics in JSON format")
                 ],
                 description="Analyze health metrics and suggest personalized daily habits"
+            ),
+            "stream-daily-habits": Action(
+                name="stream-daily-habits",
+                parameters=[
+                    ActionParameter("health_metrics", True, str, "Health metrics in JSON format")
+                ],
+                description="Stream the suggest-daily-habits analysis as it is generated",
+                streaming=True
+            ),
+            "stream-text": Action(
+                name="stream-text",
+                parameters=[
+                    ActionParameter("prompt", True, str, "Text prompt for generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt for generation")
+                ],
+                description="Stream generated text as it is produced",
+                streaming=True
             )
         }
 
@@ -86,6 +105,16 @@ class EternalAIConnection(BaseConnection):
             self._client = OpenAI(api_key=api_key, base_url=api_url)
         return self._client
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get or create async EternalAI client"""
+        if not self._async_client:
+            api_key = os.getenv("EternalAI_API_KEY")
+            api_url = os.getenv("EternalAI_API_URL")
+            if not api_key or not api_url:
+                raise EternalAIConfigurationError("EternalAI credentials not found in environment")
+            self._async_client = AsyncOpenAI(api_key=api_key, base_url=api_url)
+        return self._async_client
+
     def configure(self) -> bool:
         """Sets up EternalAI API authentication"""
         logger.info("\n🤖 EternalAI API SETUP")
@@ -146,12 +175,12 @@ class EternalAIConnection(BaseConnection):
     def get_on_chain_system_prompt_content(on_chain_data: str) -> str:
         if IPFS in on_chain_data:
             light_house = on_chain_data.replace(IPFS, LIGHTHOUSE_IPFS)
-            response = requests.get(light_house)
+            response = http.get(light_house)
             if response.status_code == 200:
                 return response.text
             else:
                 gcs = on_chain_data.replace(IPFS, GCS_ETERNAL_AI_BASE_URL)
-                response = requests.get(gcs)
+                response = http.get(gcs)
                 if response.status_code == 200:
                     return response.text
                 else:
@@ -162,30 +191,56 @@ class EternalAIConnection(BaseConnection):
             else:
                 raise Exception(f"invalid on-chain system prompt")
 
+    def _completion_args(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None) -> Dict[str, Any]:
+        """Build the chat completion arguments shared by the sync and async paths"""
+        model = model or self.config["model"]
+        logger.info(f"model {model}")
+
+        chain_id = chain_id or self.config["chain_id"]
+        if not chain_id or chain_id == "":
+            chain_id = "45762"
+        logger.info(f"chain_id {chain_id}")
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt},
+        ]
+        logger.info(f"Sending to API - Messages: {messages}")
+
+        return {
+            "model": model,
+            "messages": messages,
+            "extra_body": {"chain_id": chain_id},
+            "timeout": 180.0
+        }
+
+    @staticmethod
+    def _deltas(completion) -> Iterator[str]:
+        """Text deltas of a streamed chat completion"""
+        for chunk in completion:
+            if chunk.choices:
+                delta = chunk.choices[0].delta
+                if delta is not None and delta.content:
+                    yield delta.content
+
+    @staticmethod
+    async def _adeltas(completion) -> AsyncIterator[str]:
+        """Text deltas of an async streamed chat completion"""
+        async for chunk in completion:
+            if chunk.choices:
+                delta = chunk.choices[0].delta
+                if delta is not None and delta.content:
+                    yield delta.content
+
     def generate_text(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None, **kwargs) -> str:
         """Generate text using EternalAI models"""
         try:
             client = self._get_client()
-            model = model or self.config["model"]
-            logger.info(f"model {model}")
-
-            chain_id = chain_id or self.config["chain_id"]
-            if not chain_id or chain_id == "":
-                chain_id = "45762"
-            logger.info(f"chain_id {chain_id}")
-
             stream = self.config.get("stream", False)
-            logger.info(f"Sending to API - Messages: {[{'role': 'system', 'content': system_prompt}, {'role': 'user', 'content': prompt}]}")
 
             completion = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt},
-                ],
-                extra_body={"chain_id": chain_id},
-                stream=stream,
-                timeout=180.0
+                **self._completion_args(prompt, system_prompt, model, chain_id),
+                stream=stream
             )
 
             if not stream:
@@ -193,13 +248,45 @@ class EternalAIConnection(BaseConnection):
                     raise EternalAIAPIError("Text generation failed: no choices in response")
                 return completion.choices[0].message.content
             else:
-                content = ""
-                for chunk in completion:
-                    if chunk.choices is not None:
-                        delta = chunk.choices[0].delta
-                        if delta is not None and delta.content is not None:
-                            content += delta.content
-                return content
+                return "".join(self._deltas(completion))
+
+        except Exception as e:
+            raise EternalAIAPIError(f"Text generation failed: {e}")
+
+    async def agenerate_text(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None,
+                             stream: bool = None, **kwargs) -> str:
+        """Generate text using EternalAI models without blocking the event loop"""
+        try:
+            client = self._get_async_client()
+            if stream is None:
+                stream = self.config.get("stream", False)
+
+            completion = await client.chat.completions.create(
+                **self._completion_args(prompt, system_prompt, model, chain_id),
+                stream=stream
+            )
+
+            if not stream:
+                if completion.choices is None:
+                    raise EternalAIAPIError("Text generation failed: no choices in response")
+                return completion.choices[0].message.content
+            else:
+                return "".join([content async for content in self._adeltas(completion)])
+
+        except Exception as e:
+            raise EternalAIAPIError(f"Text generation failed: {e}")
+
+    async def astream_text(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None,
+                           **kwargs) -> AsyncIterator[str]:
+        """Yield generated text deltas as EternalAI streams them"""
+        try:
+            client = self._get_async_client()
+            completion = await client.chat.completions.create(
+                **self._completion_args(prompt, system_prompt, model, chain_id),
+                stream=True
+            )
+            async for content in self._adeltas(completion):
+                yield content
 
         except Exception as e:
             raise EternalAIAPIError(f"Text generation failed: {e}")
@@ -246,27 +333,43 @@ class EternalAIConnection(BaseConnection):
         if errors:
             raise ValueError(f"Invalid parameters: {', '.join(errors)}")
 
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         return method(**kwargs)
 
+    @staticmethod
+    def _build_habits_prompt(health_metrics: str) -> str:
+        """Format the health metrics JSON into the analysis prompt"""
+        # Log received data
+        logger.info(f"Received health_metrics: {health_metrics}")
+
+        # Format health data
+        metrics = json.loads(health_metrics)
+        prompt = ANALYZE_AND_SUGGEST_PROMPT.format(
+            behavior=metrics.get('Current Behavior'),
+            antecedent=metrics.get('Trigger Situations'),
+            consequence=metrics.get('Consequences'),
+            previous_attempts=metrics.get('Previous Attempts')
+        )
+
+        # Log formatted prompt
+        logger.info(f"Formatted prompt: {prompt}")
+        return prompt
+
+    @staticmethod
+    def _clean_habits_result(result: str) -> str:
+        """Strip the model response, rejecting empty output"""
+        if result:
+            result = result.strip()
+            if result:
+                return result
+
+        logger.error("Empty response from API")
+        raise EternalAIAPIError("Empty response from API")
+
     def suggest_daily_habits(self, health_metrics: str) -> str:
         """Analyze health metrics and suggest personalized daily habits"""
         try:
-            # Log received data
-            logger.info(f"Received health_metrics: {health_metrics}")
-
-            # Format health data
-            metrics = json.loads(health_metrics)
-            prompt = ANALYZE_AND_SUGGEST_PROMPT.format(
-                behavior=metrics.get('Current Behavior'),
-                antecedent=metrics.get('Trigger Situations'),
-                consequence=metrics.get('Consequences'),
-                previous_attempts=metrics.get('Previous Attempts')
-            )
-
-            # Log formatted prompt
-            logger.info(f"Formatted prompt: {prompt}")
+            prompt = self._build_habits_prompt(health_metrics)
 
             # Temporarily save and modify stream configuration
             original_stream = self.config.get("stream", True)
@@ -276,19 +379,11 @@ class EternalAIConnection(BaseConnection):
                 # Call generate_text with specific system prompt
                 result = self.generate_text(
                     prompt=prompt,
-                    system_prompt="You are a health and wellness expert, focused on helping people develop healthy and sustainable habits. Your suggestions are practical, evidence-based, and tailored to individual needs.",
+                    system_prompt=HABITS_SYSTEM_PROMPT,
                     model=self.config.get("model"),
                     chain_id=self.config.get("chain_id", "45762")
                 )
-
-                # Verify and clean response
-                if result:
-                    result = result.strip()
-                    if result:
-                        return result
-                    
-                logger.error("Empty response from API")
-                raise EternalAIAPIError("Empty response from API")
+                return self._clean_habits_result(result)
 
             finally:
                 # Restore original stream configuration
@@ -298,3 +393,32 @@ class EternalAIConnection(BaseConnection):
             logger.error(f"Error in suggest_daily_habits: {str(e)}")
             logger.error(f"Full exception: {repr(e)}")
             raise EternalAIAPIError(f"Failed to generate suggestions: {str(e)}")
+
+    async def asuggest_daily_habits(self, health_metrics: str) -> str:
+        """Async version of suggest_daily_habits"""
+        try:
+            prompt = self._build_habits_prompt(health_metrics)
+            result = await self.agenerate_text(
+                prompt=prompt,
+                system_prompt=HABITS_SYSTEM_PROMPT,
+                model=self.config.get("model"),
+                chain_id=self.config.get("chain_id", "45762"),
+                stream=False
+            )
+            return self._clean_habits_result(result)
+
+        except Exception as e:
+            logger.error(f"Error in suggest_daily_habits: {str(e)}")
+            logger.error(f"Full exception: {repr(e)}")
+            raise EternalAIAPIError(f"Failed to generate suggestions: {str(e)}")
+
+    async def astream_daily_habits(self, health_metrics: str) -> AsyncIterator[str]:
+        """Streaming version of suggest_daily_habits, yielding the analysis as it is generated"""
+        prompt = self._build_habits_prompt(health_metrics)
+        async for content in self.astream_text(
+            prompt=prompt,
+            system_prompt=HABITS_SYSTEM_PROMPT,
+            model=self.config.get("model"),
+            chain_id=self.config.get("chain_id", "45762")
+        ):
+            yield content
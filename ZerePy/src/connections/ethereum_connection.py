@@ -1,14 +1,17 @@
 import logging
 import os
 import time
-import requests
+from src.helpers.transport import http
 from typing import Dict, Any, Optional, Union
 from dotenv import load_dotenv, set_key
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 from src.constants.networks import EVM_NETWORKS
 from src.constants.abi import ERC20_ABI
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, CachePolicy
+from src.helpers.receipts import get_receipt_tracker
+from src.helpers.fees import get_fee_oracle
+from src.helpers.rpc_pool import PooledHTTPProvider, RPCPool, network_rpc_urls
 
 logger = logging.getLogger("connections.ethereum_connection")
 
@@ -24,15 +27,17 @@ class EthereumConnection(BaseConnection):
         
         # Get network configuration
         self.network = "ethereum"  # Default to ethereum mainnet
-        self.rpc_url = config.get("rpc")  # Get RPC from config
-        if not self.rpc_url:
-            self.rpc_url = EVM_NETWORKS[self.network]["rpc_url"]
+        self.rpc_urls = network_rpc_urls(EVM_NETWORKS[self.network], config)
+        self.rpc_url = self.rpc_urls[0]
+        self.rpc_pool = RPCPool.from_config(self.rpc_urls, config.get("rpc_pool"))
             
         self.scanner_url = EVM_NETWORKS[self.network]["scanner_url"]
         self.chain_id = EVM_NETWORKS[self.network]["chain_id"]
         
         super().__init__(config)
         self._initialize_web3()
+        self.receipts = get_receipt_tracker(self.rpc_url, self.config.get("receipts"), pool=self.rpc_pool)
+        self.fees = get_fee_oracle(self.rpc_url, self._web3, self.config.get("fees"))
         
         # Kyberswap aggregator API for best swap routes
         self.aggregator_api = f"https://aggregator-api.kyberswap.com/{self.network}/api/v1"
@@ -42,28 +47,26 @@ class EthereumConnection(BaseConnection):
         return f"https://{self.scanner_url}/tx/{tx_hash}"
 
     def _initialize_web3(self) -> None:
-        """Initialize Web3 connection with retry logic"""
+        """Initialize Web3 connection, retrying with backoff through the connection's policy"""
         if not self._web3:
-            for attempt in range(3):
-                try:
-                    self._web3 = Web3(Web3.HTTPProvider(self.rpc_url))
-                    self._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
-                    
-                    if not self._web3.is_connected():
-                        raise EthereumConnectionError("Failed to connect to Ethereum network")
-                    
-                    chain_id = self._web3.eth.chain_id
-                    if chain_id != self.chain_id:
-                        raise EthereumConnectionError(f"Connected to wrong chain. Expected {self.chain_id}, got {chain_id}")
-                        
-                    logger.info(f"Connected to Ethereum network with chain ID: {chain_id}")
-                    break
-                    
-                except Exception as e:
-                    if attempt == 2:
-                        raise EthereumConnectionError(f"Failed to initialize Web3 after 3 attempts: {str(e)}")
-                    logger.warning(f"Web3 initialization attempt {attempt + 1} failed: {str(e)}")
-                    time.sleep(1)
+            try:
+                self._web3 = self.resilience.call(self._connect_web3)
+            except Exception as e:
+                raise EthereumConnectionError(f"Failed to initialize Web3: {str(e)}")
+
+    def _connect_web3(self) -> Web3:
+        web3 = Web3(PooledHTTPProvider(self.rpc_pool))
+        web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+
+        if not web3.is_connected():
+            raise EthereumConnectionError("Failed to connect to Ethereum network")
+
+        chain_id = web3.eth.chain_id
+        if chain_id != self.chain_id:
+            raise EthereumConnectionError(f"Connected to wrong chain. Expected {self.chain_id}, got {chain_id}")
+
+        logger.info(f"Connected to Ethereum network with chain ID: {chain_id}")
+        return web3
 
     @property
     def is_llm_provider(self) -> bool:
@@ -83,7 +86,8 @@ class EthereumConnection(BaseConnection):
                 parameters=[
                     ActionParameter("ticker", True, str, "Token ticker symbol to look up")
                 ],
-                description="Get token address by ticker symbol"
+                description="Get token address by ticker symbol",
+                cache=CachePolicy(ttl=3600)
             ),
             "get-balance": Action(
                 name="get-balance",
@@ -91,7 +95,8 @@ class EthereumConnection(BaseConnection):
                     ActionParameter("address", False, str, "Address to check balance for (optional)"),
                     ActionParameter("token_address", False, str, "Token address (optional, native token if not provided)")
                 ],
-                description="Get ETH or token balance"
+                description="Get ETH or token balance",
+                read_only=True
             ),
             "transfer": Action(
                 name="transfer", 
@@ -202,7 +207,7 @@ class EthereumConnection(BaseConnection):
     def _get_token_address(self, ticker: str) -> Optional[str]:
         """Helper function to get token address from DEXScreener"""
         try:
-            response = requests.get(
+            response = http.get(
                 f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
             )
             response.raise_for_status()
@@ -308,7 +313,7 @@ class EthereumConnection(BaseConnection):
             # Try to get ETH value using Kyberswap price API
             try:
                 kyber_url = f"{self.aggregator_api}/tokens/rates"
-                response = requests.get(kyber_url, params={
+                response = http.get(kyber_url, params={
                     "tokenIn": token_address, 
                     "tokenOut": self.NATIVE_TOKEN, 
                     "amount": str(raw_balance) 
@@ -341,7 +346,7 @@ class EthereumConnection(BaseConnection):
             
             # Get latest nonce and gas price
             nonce = self._web3.eth.get_transaction_count(account.address)
-            gas_price = self._web3.eth.gas_price
+            fee_params = self.fees.fee_params()
             
             if token_address and token_address.lower() != self.NATIVE_TOKEN.lower():
                 # Prepare ERC20 transfer
@@ -358,7 +363,7 @@ class EthereumConnection(BaseConnection):
                 ).build_transaction({
                     'from': account.address,
                     'nonce': nonce,
-                    'gasPrice': gas_price,
+                    **fee_params,
                     'chainId': self.chain_id
                 })
             else:
@@ -368,7 +373,7 @@ class EthereumConnection(BaseConnection):
                     'to': Web3.to_checksum_address(to_address),
                     'value': self._web3.to_wei(amount, 'ether'),
                     'gas': 21000,  # Standard ETH transfer gas
-                    'gasPrice': gas_price,
+                    **fee_params,
                     'chainId': self.chain_id
                 }
             
@@ -441,7 +446,7 @@ class EthereumConnection(BaseConnection):
                 "gasInclude": "true"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http.get(url, headers=headers, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -479,7 +484,7 @@ class EthereumConnection(BaseConnection):
                 "source": "zerepy"
             }
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = http.post(url, headers=headers, json=payload)
             response.raise_for_status()
             
             data = response.json()
@@ -493,7 +498,7 @@ class EthereumConnection(BaseConnection):
                 'data': data["data"]["data"],
                 'value': self._web3.to_wei(amount, 'ether') if token_in.lower() == self.NATIVE_TOKEN.lower() else 0,
                 'nonce': self._web3.eth.get_transaction_count(account.address),
-                'gasPrice': self._web3.eth.gas_price,
+                **self.fees.fee_params(),
                 'chainId': self.chain_id
             }
             
@@ -511,64 +516,64 @@ class EthereumConnection(BaseConnection):
             logger.error(f"Failed to build swap transaction: {str(e)}")
             raise
 
-        def _handle_token_approval(
-            self,
-            token_address: str,
-            spender_address: str,
-            amount: int
-        ) -> Optional[str]:
-            """Handle token approval for spender, returns tx hash if approval needed"""
-            try:
-                private_key = os.getenv('ETH_PRIVATE_KEY')
-                account = self._web3.eth.account.from_key(private_key)
+    def _handle_token_approval(
+        self,
+        token_address: str,
+        spender_address: str,
+        amount: int
+    ) -> Optional[str]:
+        """Handle token approval for spender, returns tx hash if approval needed"""
+        try:
+            private_key = os.getenv('ETH_PRIVATE_KEY')
+            account = self._web3.eth.account.from_key(private_key)
+            
+            token_contract = self._web3.eth.contract(
+                address=Web3.to_checksum_address(token_address),
+                abi=ERC20_ABI
+            )
+            
+            # Check current allowance
+            current_allowance = token_contract.functions.allowance(
+                account.address,
+                spender_address
+            ).call()
+            
+            if current_allowance < amount:
+                # Prepare approval transaction
+                approve_tx = token_contract.functions.approve(
+                    spender_address,
+                    amount
+                ).build_transaction({
+                    'from': account.address,
+                    'nonce': self._web3.eth.get_transaction_count(account.address),
+                    **self.fees.fee_params(),
+                    'chainId': self.chain_id
+                })
                 
-                token_contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_address),
-                    abi=ERC20_ABI
-                )
+                # Estimate gas for approval
+                try:
+                    gas_estimate = self._web3.eth.estimate_gas(approve_tx)
+                    approve_tx['gas'] = int(gas_estimate * 1.1)  # Add 10% buffer
+                except Exception as e:
+                    logger.warning(f"Approval gas estimation failed: {e}, using default")
+                    approve_tx['gas'] = 100000  # Default gas for approvals
                 
-                # Check current allowance
-                current_allowance = token_contract.functions.allowance(
-                    account.address,
-                    spender_address
-                ).call()
+                # Sign and send approval transaction
+                signed_approve = account.sign_transaction(approve_tx)
+                tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
                 
-                if current_allowance < amount:
-                    # Prepare approval transaction
-                    approve_tx = token_contract.functions.approve(
-                        spender_address,
-                        amount
-                    ).build_transaction({
-                        'from': account.address,
-                        'nonce': self._web3.eth.get_transaction_count(account.address),
-                        'gasPrice': self._web3.eth.gas_price,
-                        'chainId': self.chain_id
-                    })
-                    
-                    # Estimate gas for approval
-                    try:
-                        gas_estimate = self._web3.eth.estimate_gas(approve_tx)
-                        approve_tx['gas'] = int(gas_estimate * 1.1)  # Add 10% buffer
-                    except Exception as e:
-                        logger.warning(f"Approval gas estimation failed: {e}, using default")
-                        approve_tx['gas'] = 100000  # Default gas for approvals
-                    
-                    # Sign and send approval transaction
-                    signed_approve = account.sign_transaction(approve_tx)
-                    tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
-                    
-                    # Wait for approval to be mined
-                    receipt = self._web3.eth.wait_for_transaction_receipt(tx_hash)
-                    if receipt['status'] != 1:
-                        raise ValueError("Token approval failed")
-                    
-                    return tx_hash.hex()
-                    
-                return None
+                # Wait for approval to be mined; the shared tracker polls all pending hashes in one batch
+                receipt = self.receipts.wait(tx_hash)
+                if receipt['status'] != 1:
+                    raise ValueError("Token approval failed")
+                
+                return tx_hash.hex()
+                
+            return None
 
-            except Exception as e:
-                logger.error(f"Token approval failed: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Token approval failed: {str(e)}")
+            raise
 
     def swap(
         self,
@@ -633,9 +638,7 @@ class EthereumConnection(BaseConnection):
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        load_dotenv()
-        
-        if not self.is_configured(verbose=True):
+        if not self.is_ready():
             raise EthereumConnectionError("Ethereum connection is not properly configured")
 
         action = self.actions[action_name]
@@ -643,6 +646,5 @@ class EthereumConnection(BaseConnection):
         if errors:
             raise ValueError(f"Invalid parameters: {', '.join(errors)}")
 
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         return method(**kwargs)
\ No newline at end of file
@@ -1,14 +1,17 @@
 import logging
 import os
 import time
-import requests
+from src.helpers.transport import http
 from typing import Dict, Any, Optional, Union
 from dotenv import load_dotenv, set_key
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 from src.constants.networks import EVM_NETWORKS
 from src.constants.abi import ERC20_ABI
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, CachePolicy
+from src.helpers.receipts import get_receipt_tracker
+from src.helpers.fees import get_fee_oracle
+from src.helpers.rpc_pool import PooledHTTPProvider, RPCPool, network_rpc_urls
 
 logger = logging.getLogger("connections.evm_connection")
 
@@ -33,12 +36,16 @@ class EVMConnection(BaseConnection):
         network_config = EVM_NETWORKS[self.network]
         
         # Get RPC URL: either from the config override or from the network defaults
-        self.rpc_url = config.get("rpc") or network_config["rpc_url"]
+        self.rpc_urls = network_rpc_urls(network_config, config)
+        self.rpc_url = self.rpc_urls[0]
+        self.rpc_pool = RPCPool.from_config(self.rpc_urls, config.get("rpc_pool"))
         self.scanner_url = network_config["scanner_url"]
         self.chain_id = network_config["chain_id"]
         
         super().__init__(config)
         self._initialize_web3()
+        self.receipts = get_receipt_tracker(self.rpc_url, self.config.get("receipts"), pool=self.rpc_pool)
+        self.fees = get_fee_oracle(self.rpc_url, self._web3, self.config.get("fees"))
         
         # Kyberswap aggregator API for best swap routes
         self.aggregator_api = f"https://aggregator-api.kyberswap.com/{self.network}/api/v1"
@@ -48,28 +55,26 @@ class EVMConnection(BaseConnection):
         return f"https://{self.scanner_url}/tx/{tx_hash}"
 
     def _initialize_web3(self) -> None:
-        """Initialize Web3 connection with retry logic"""
+        """Initialize Web3 connection, retrying with backoff through the connection's policy"""
         if not self._web3:
-            for attempt in range(3):
-                try:
-                    self._web3 = Web3(Web3.HTTPProvider(self.rpc_url))
-                    self._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
-                    
-                    if not self._web3.is_connected():
-                        raise EthereumConnectionError("Failed to connect to Ethereum network")
-                    
-                    chain_id = self._web3.eth.chain_id
-                    if chain_id != self.chain_id:
-                        raise EthereumConnectionError(f"Connected to wrong chain. Expected {self.chain_id}, got {chain_id}")
-                        
-                    logger.info(f"Connected to {self.network} network with chain ID: {chain_id}")
-                    break
-                    
-                except Exception as e:
-                    if attempt == 2:
-                        raise EthereumConnectionError(f"Failed to initialize Web3 after 3 attempts: {str(e)}")
-                    logger.warning(f"Web3 initialization attempt {attempt + 1} failed: {str(e)}")
-                    time.sleep(1)
+            try:
+                self._web3 = self.resilience.call(self._connect_web3)
+            except Exception as e:
+                raise EthereumConnectionError(f"Failed to initialize Web3: {str(e)}")
+
+    def _connect_web3(self) -> Web3:
+        web3 = Web3(PooledHTTPProvider(self.rpc_pool))
+        web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+
+        if not web3.is_connected():
+            raise EthereumConnectionError("Failed to connect to Ethereum network")
+
+        chain_id = web3.eth.chain_id
+        if chain_id != self.chain_id:
+            raise EthereumConnectionError(f"Connected to wrong chain. Expected {self.chain_id}, got {chain_id}")
+
+        logger.info(f"Connected to {self.network} network with chain ID: {chain_id}")
+        return web3
 
     @property
     def is_llm_provider(self) -> bool:
@@ -91,14 +96,16 @@ class EVMConnection(BaseConnection):
                 parameters=[
                     ActionParameter("ticker", True, str, "Token ticker symbol to look up")
                 ],
-                description="Get token address by ticker symbol"
+                description="Get token address by ticker symbol",
+                cache=CachePolicy(ttl=3600)
             ),
             "get-balance": Action(
                 name="get-balance",
                 parameters=[
                     ActionParameter("token_address", False, str, "Token address (optional, native token if not provided)")
                 ],
-                description="Get ETH or token balance"
+                description="Get ETH or token balance",
+                read_only=True
             ),
             "transfer": Action(
                 name="transfer", 
@@ -205,7 +212,7 @@ class EVMConnection(BaseConnection):
     def _get_token_address(self, ticker: str) -> Optional[str]:
         """Helper function to get token address from DEXScreener"""
         try:
-            response = requests.get(f"https://api.dexscreener.com/latest/dex/search?q={ticker}")
+            response = http.get(f"https://api.dexscreener.com/latest/dex/search?q={ticker}")
             response.raise_for_status()
             data = response.json()
             if not data.get('pairs'):
@@ -294,7 +301,7 @@ class EVMConnection(BaseConnection):
             private_key = os.getenv('EVM_PRIVATE_KEY') or os.getenv('ETH_PRIVATE_KEY')
             account = self._web3.eth.account.from_key(private_key)
             nonce = self._web3.eth.get_transaction_count(account.address)
-            gas_price = self._web3.eth.gas_price
+            fee_params = self.fees.fee_params()
             
             if token_address and token_address.lower() != self.NATIVE_TOKEN.lower():
                 contract = self._web3.eth.contract(
@@ -309,7 +316,7 @@ class EVMConnection(BaseConnection):
                 ).build_transaction({
                     'from': account.address,
                     'nonce': nonce,
-                    'gasPrice': gas_price,
+                    **fee_params,
                     'chainId': self.chain_id
                 })
             else:
@@ -318,7 +325,7 @@ class EVMConnection(BaseConnection):
                     'to': Web3.to_checksum_address(to_address),
                     'value': self._web3.to_wei(amount, 'ether'),
                     'gas': 21000,
-                    'gasPrice': gas_price,
+                    **fee_params,
                     'chainId': self.chain_id
                 }
             return tx
@@ -367,7 +374,7 @@ class EVMConnection(BaseConnection):
                 "to": sender,
                 "gasInclude": "true"
             }
-            response = requests.get(url, headers=headers, params=params)
+            response = http.get(url, headers=headers, params=params)
             response.raise_for_status()
             data = response.json()
             if data.get("code") != 0:
@@ -393,7 +400,7 @@ class EVMConnection(BaseConnection):
                 "deadline": int(time.time() + 1200),
                 "source": "zerepy"
             }
-            response = requests.post(url, headers=headers, json=payload)
+            response = http.post(url, headers=headers, json=payload)
             response.raise_for_status()
             data = response.json()
             if data.get("code") != 0:
@@ -404,7 +411,7 @@ class EVMConnection(BaseConnection):
                 'data': data["data"]["data"],
                 'value': self._web3.to_wei(amount, 'ether') if token_in.lower() == self.NATIVE_TOKEN.lower() else 0,
                 'nonce': self._web3.eth.get_transaction_count(account.address),
-                'gasPrice': self._web3.eth.gas_price,
+                **self.fees.fee_params(),
                 'chainId': self.chain_id
             }
             try:
@@ -436,7 +443,7 @@ class EVMConnection(BaseConnection):
                 ).build_transaction({
                     'from': account.address,
                     'nonce': self._web3.eth.get_transaction_count(account.address),
-                    'gasPrice': self._web3.eth.gas_price,
+                    **self.fees.fee_params(),
                     'chainId': self.chain_id
                 })
                 try:
@@ -447,7 +454,7 @@ class EVMConnection(BaseConnection):
                     approve_tx['gas'] = 100000
                 signed_approve = account.sign_transaction(approve_tx)
                 tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
-                receipt = self._web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = self.receipts.wait(tx_hash)
                 if receipt['status'] != 1:
                     raise ValueError("Token approval failed")
                 return tx_hash.hex()
@@ -495,13 +502,12 @@ class EVMConnection(BaseConnection):
         """Execute an Ethereum action with validation"""
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
-        load_dotenv()
-        if not self.is_configured(verbose=True):
+
+        if not self.is_ready():
             raise EthereumConnectionError("Ethereum connection is not properly configured")
         action = self.actions[action_name]
         errors = action.validate_params(kwargs)
         if errors:
             raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         return method(**kwargs)
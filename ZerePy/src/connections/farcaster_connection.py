@@ -209,8 +209,7 @@ class FarcasterConnection(BaseConnection):
             kwargs["count"] = self.config["timeline_read_count"]
 
         # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         return method(**kwargs)
     
     def get_latest_casts(self, fid: int, cursor: Optional[int] = None, limit: Optional[int] = 25) -> IterableCastsResult:
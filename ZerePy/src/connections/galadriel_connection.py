@@ -2,7 +2,7 @@ import logging
 import os
 from typing import Dict, Any
 
-import requests
+from src.helpers.transport import http
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
@@ -127,7 +127,7 @@ class GaladrielConnection(BaseConnection):
             return False
 
     def _is_api_key_valid(self, api_key):
-        response = requests.get(
+        response = http.get(
             f"{API_BASE_URL}/chat/completions",
             headers={
                 "Authorization": f"Bearer {api_key}"
@@ -169,6 +169,5 @@ class GaladrielConnection(BaseConnection):
             raise ValueError(f"Invalid parameters: {', '.join(errors)}")
 
         # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         return method(**kwargs)
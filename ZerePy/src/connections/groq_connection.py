@@ -3,7 +3,7 @@ import os
 from typing import Dict, Any
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, CachePolicy
 
 logger = logging.getLogger("connections.groq_connection")
 
@@ -59,7 +59,8 @@ class GroqConnection(BaseConnection):
                 parameters=[
                     ActionParameter("model", True, str, "Model name to check availability")
                 ],
-                description="Check if a specific model is available"
+                description="Check if a specific model is available",
+                cache=CachePolicy(ttl=3600)
             ),
             "list-models": Action(
                 name="list-models",
@@ -196,10 +197,7 @@ class GroqConnection(BaseConnection):
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        # Explicitly reload environment variables
-        load_dotenv()
-        
-        if not self.is_configured(verbose=True):
+        if not self.is_ready():
             raise GroqConfigurationError("Groq is not properly configured")
 
         action = self.actions[action_name]
@@ -208,6 +206,5 @@ class GroqConnection(BaseConnection):
             raise ValueError(f"Invalid parameters: {', '.join(errors)}")
 
         # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         return method(**kwargs)
\ No newline at end of file
@@ -3,7 +3,7 @@ import os
 from typing import Dict, Any
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, CachePolicy
 
 logger = logging.getLogger("connections.hyperbolic_connection")
 
@@ -60,7 +60,8 @@ class HyperbolicConnection(BaseConnection):
                 parameters=[
                     ActionParameter("model", True, str, "Model name to check availability")
                 ],
-                description="Check if a specific model is available"
+                description="Check if a specific model is available",
+                cache=CachePolicy(ttl=3600)
             ),
             "list-models": Action(
                 name="list-models",
@@ -199,10 +200,7 @@ class HyperbolicConnection(BaseConnection):
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        # Explicitly reload environment variables
-        load_dotenv()
-        
-        if not self.is_configured(verbose=True):
+        if not self.is_ready():
             raise HyperbolicConfigurationError("Hyperbolic is not properly configured")
 
         action = self.actions[action_name]
@@ -211,6 +209,5 @@ class HyperbolicConnection(BaseConnection):
             raise ValueError(f"Invalid parameters: {', '.join(errors)}")
 
         # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         return method(**kwargs)
\ No newline at end of file
@@ -1,7 +1,6 @@
 import logging
 import os
-import time
-import requests
+from src.helpers.transport import http
 from typing import Dict, Any, Optional, Union
 from dotenv import load_dotenv, set_key
 from web3 import Web3
@@ -9,6 +8,8 @@ from web3.middleware import geth_poa_middleware
 from src.constants.networks import EVM_NETWORKS
 from src.constants.abi import ERC20_ABI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.receipts import get_receipt_tracker
+from src.helpers.rpc_pool import PooledHTTPProvider, RPCPool, network_rpc_urls
 
 logger = logging.getLogger("connections.monad_connection")
 
@@ -29,43 +30,44 @@ class MonadConnection(BaseConnection):
         self.NATIVE_TOKEN = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
         
         # Get network configuration
-        self.rpc_url = config.get("rpc")
-        if not self.rpc_url:
+        self.rpc_urls = network_rpc_urls({}, config)
+        if not self.rpc_urls:
             raise ValueError("RPC URL must be provided in config")
+        self.rpc_url = self.rpc_urls[0]
+        self.rpc_pool = RPCPool.from_config(self.rpc_urls, config.get("rpc_pool"))
             
         self.scanner_url = MONAD_SCANNER_URL
         self.chain_id = MONAD_CHAIN_ID
         
         super().__init__(config)
         self._initialize_web3()
+        self.receipts = get_receipt_tracker(self.rpc_url, self.config.get("receipts"), pool=self.rpc_pool)
 
     def _get_explorer_link(self, tx_hash: str) -> str:
         """Generate block explorer link for transaction"""
         return f"https://{self.scanner_url}/tx/{tx_hash}"
 
     def _initialize_web3(self) -> None:
-        """Initialize Web3 connection with retry logic"""
+        """Initialize Web3 connection, retrying with backoff through the connection's policy"""
         if not self._web3:
-            for attempt in range(3):
-                try:
-                    self._web3 = Web3(Web3.HTTPProvider(self.rpc_url))
-                    self._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
-                    
-                    if not self._web3.is_connected():
-                        raise MonadConnectionError("Failed to connect to Monad network")
-                    
-                    chain_id = self._web3.eth.chain_id
-                    if chain_id != self.chain_id:
-                        raise MonadConnectionError(f"Connected to wrong chain. Expected {self.chain_id}, got {chain_id}")
-                        
-                    logger.info(f"Connected to Monad network with chain ID: {chain_id}")
-                    break
-                    
-                except Exception as e:
-                    if attempt == 2:
-                        raise MonadConnectionError(f"Failed to initialize Web3 after 3 attempts: {str(e)}")
-                    logger.warning(f"Web3 initialization attempt {attempt + 1} failed: {str(e)}")
-                    time.sleep(1)
+            try:
+                self._web3 = self.resilience.call(self._connect_web3)
+            except Exception as e:
+                raise MonadConnectionError(f"Failed to initialize Web3: {str(e)}")
+
+    def _connect_web3(self) -> Web3:
+        web3 = Web3(PooledHTTPProvider(self.rpc_pool))
+        web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+
+        if not web3.is_connected():
+            raise MonadConnectionError("Failed to connect to Monad network")
+
+        chain_id = web3.eth.chain_id
+        if chain_id != self.chain_id:
+            raise MonadConnectionError(f"Connected to wrong chain. Expected {self.chain_id}, got {chain_id}")
+
+        logger.info(f"Connected to Monad network with chain ID: {chain_id}")
+        return web3
 
     @property
     def is_llm_provider(self) -> bool:
@@ -73,7 +75,7 @@ class MonadConnection(BaseConnection):
 
     def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Validate Monad configuration from JSON"""
-        if "rpc" not in config:
+        if "rpc" not in config and not config.get("rpc_urls"):
             raise ValueError("RPC URL must be provided in config")
         return config
 
@@ -85,7 +87,8 @@ class MonadConnection(BaseConnection):
                 parameters=[
                     ActionParameter("token_address", False, str, "Token address (optional, native token if not provided)")
                 ],
-                description="Get native or token balance"
+                description="Get native or token balance",
+                read_only=True
             ),
             "transfer": Action(
                 name="transfer", 
@@ -346,7 +349,7 @@ class MonadConnection(BaseConnection):
             logger.debug(params)
             logger.debug("\nURL ")
             logger.debug(url)
-            response = requests.get(
+            response = http.get(
                 url,
                 headers=headers,
                 params=params
@@ -371,6 +374,59 @@ class MonadConnection(BaseConnection):
             logger.error(f"Failed to get swap quote: {str(e)}")
             raise
 
+    def _handle_token_approval(
+        self,
+        token_address: str,
+        spender_address: str,
+        amount: int
+    ) -> Optional[str]:
+        """Handle token approval for spender, returns tx hash if approval needed"""
+        try:
+            account = self._get_current_account()
+            
+            token_contract = self._web3.eth.contract(
+                address=Web3.to_checksum_address(token_address),
+                abi=ERC20_ABI
+            )
+            
+            # Check current allowance
+            current_allowance = token_contract.functions.allowance(
+                account.address,
+                spender_address
+            ).call()
+            
+            if current_allowance < amount:
+                # Prepare approval transaction with fixed gas price
+                approve_tx = token_contract.functions.approve(
+                    spender_address,
+                    amount
+                ).build_transaction({
+                    'from': account.address,
+                    'nonce': self._web3.eth.get_transaction_count(account.address),
+                    'gasPrice': Web3.to_wei(MONAD_BASE_GAS_PRICE, 'gwei'),
+                    'chainId': self.chain_id
+                })
+                
+                # Set fixed gas for approval on Monad
+                approve_tx['gas'] = 100000  # Standard approval gas
+                
+                # Sign and send approval transaction
+                signed_approve = account.sign_transaction(approve_tx)
+                tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
+                
+                # Wait for approval to be mined; the shared tracker polls all pending hashes in one batch
+                receipt = self.receipts.wait(tx_hash)
+                if receipt['status'] != 1:
+                    raise ValueError("Token approval failed")
+                
+                return tx_hash.hex()
+                
+            return None
+
+        except Exception as e:
+            logger.error(f"Token approval failed: {str(e)}")
+            raise
+
     def swap(self, token_in: str, token_out: str, amount: float, slippage: float = 0.5) -> str:
         """Execute token swap using 0x API with Monad-specific handling"""
         try:
@@ -415,9 +471,8 @@ class MonadConnection(BaseConnection):
                 if spender_address:  # Only attempt approval if we have a spender address
                     approval_hash = self._handle_token_approval(token_in, spender_address, amount_raw)
                     if approval_hash:
+                        # Already confirmed by _handle_token_approval
                         logger.info(f"Token approval transaction: {self._get_explorer_link(approval_hash)}")
-                        # Wait for approval confirmation
-                        self._web3.eth.wait_for_transaction_receipt(approval_hash)
             
             # Prepare swap transaction using quote data
             tx = {
@@ -448,67 +503,12 @@ class MonadConnection(BaseConnection):
             logger.error(f"Swap failed: {str(e)}")
             raise
 
-        def _handle_token_approval(
-            self,
-            token_address: str,
-            spender_address: str,
-            amount: int
-        ) -> Optional[str]:
-            """Handle token approval for spender, returns tx hash if approval needed"""
-            try:
-                account = self._get_current_account()
-                
-                token_contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_address),
-                    abi=ERC20_ABI
-                )
-                
-                # Check current allowance
-                current_allowance = token_contract.functions.allowance(
-                    account.address,
-                    spender_address
-                ).call()
-                
-                if current_allowance < amount:
-                    # Prepare approval transaction with fixed gas price
-                    approve_tx = token_contract.functions.approve(
-                        spender_address,
-                        amount
-                    ).build_transaction({
-                        'from': account.address,
-                        'nonce': self._web3.eth.get_transaction_count(account.address),
-                        'gasPrice': Web3.to_wei(MONAD_BASE_GAS_PRICE, 'gwei'),
-                        'chainId': self.chain_id
-                    })
-                    
-                    # Set fixed gas for approval on Monad
-                    approve_tx['gas'] = 100000  # Standard approval gas
-                    
-                    # Sign and send approval transaction
-                    signed_approve = account.sign_transaction(approve_tx)
-                    tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
-                    
-                    # Wait for approval to be mined
-                    receipt = self._web3.eth.wait_for_transaction_receipt(tx_hash)
-                    if receipt['status'] != 1:
-                        raise ValueError("Token approval failed")
-                    
-                    return tx_hash.hex()
-                    
-                return None
-
-            except Exception as e:
-                logger.error(f"Token approval failed: {str(e)}")
-                raise
-
     def perform_action(self, action_name: str, kwargs: Dict[str, Any]) -> Any:
         """Execute a Monad action with validation"""
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        load_dotenv()
-        
-        if not self.is_configured(verbose=True):
+        if not self.is_ready():
             raise MonadConnectionError("Monad connection is not properly configured")
 
         action = self.actions[action_name]
@@ -516,8 +516,7 @@ class MonadConnection(BaseConnection):
         if errors:
             raise ValueError(f"Invalid parameters: {', '.join(errors)}")
 
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         
         try:
             return method(**kwargs)
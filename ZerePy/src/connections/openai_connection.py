@@ -2,8 +2,8 @@ import logging
 import os
 from typing import Dict, Any
 from dotenv import load_dotenv, set_key
-from openai import OpenAI
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from openai import AsyncOpenAI, OpenAI
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, CachePolicy
 
 logger = logging.getLogger("connections.openai_connection")
 
@@ -23,6 +23,7 @@ class OpenAIConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        self._async_client = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -59,7 +60,8 @@ class OpenAIConnection(BaseConnection):
                 parameters=[
                     ActionParameter("model", True, str, "Model name to check availability")
                 ],
-                description="Check if a specific model is available"
+                description="Check if a specific model is available",
+                cache=CachePolicy(ttl=3600)
             ),
             "list-models": Action(
                 name="list-models",
@@ -77,6 +79,15 @@ class OpenAIConnection(BaseConnection):
             self._client = OpenAI(api_key=api_key)
         return self._client
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get or create async OpenAI client"""
+        if not self._async_client:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise OpenAIConfigurationError("OpenAI API key not found in environment")
+            self._async_client = AsyncOpenAI(api_key=api_key)
+        return self._async_client
+
     def configure(self) -> bool:
         """Sets up OpenAI API authentication"""
         logger.info("\n🤖 OPENAI API SETUP")
@@ -152,6 +163,28 @@ class OpenAIConnection(BaseConnection):
         except Exception as e:
             raise OpenAIAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
+        """Generate text using OpenAI models without blocking the event loop"""
+        try:
+            client = self._get_async_client()
+
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            completion = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+            )
+
+            return completion.choices[0].message.content
+
+        except Exception as e:
+            raise OpenAIAPIError(f"Text generation failed: {e}")
+
     def check_model(self, model, **kwargs):
         try:
             client = self._get_client()
@@ -164,6 +197,17 @@ class OpenAIConnection(BaseConnection):
         except Exception as e:
             raise OpenAIAPIError(e)
 
+    async def acheck_model(self, model, **kwargs):
+        try:
+            client = self._get_async_client()
+            try:
+                await client.models.retrieve(model=model)
+                return True
+            except Exception:
+                return False
+        except Exception as e:
+            raise OpenAIAPIError(e)
+
     def list_models(self, **kwargs) -> None:
         """List all available OpenAI models"""
         try:
@@ -201,6 +245,5 @@ class OpenAIConnection(BaseConnection):
             raise ValueError(f"Invalid parameters: {', '.join(errors)}")
 
         # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         return method(**kwargs)
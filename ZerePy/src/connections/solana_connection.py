@@ -4,7 +4,7 @@ import requests
 import asyncio
 from typing import Dict, Any, Optional
 
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, CachePolicy
 from src.types import JupiterTokenData
 from src.constants import LAMPORTS_PER_SOL, SPL_TOKENS
 from src.helpers.solana.pumpfun import PumpfunTokenManager
@@ -154,6 +154,7 @@ class SolanaConnection(BaseConnection):
                     )
                 ],
                 description="Check SOL or token balance",
+                read_only=True,
             ),
             "stake": Action(
                 name="stake",
@@ -189,9 +190,13 @@ class SolanaConnection(BaseConnection):
                     )
                 ],
                 description="Get token price",
+                read_only=True,
             ),
             "get-tps": Action(
-                name="get-tps", parameters=[], description="Get current Solana TPS"
+                name="get-tps",
+                parameters=[],
+                description="Get current Solana TPS",
+                read_only=True,
             ),
             "get-token-by-ticker": Action(
                 name="get-token-by-ticker",
@@ -199,11 +204,13 @@ class SolanaConnection(BaseConnection):
                     ActionParameter("ticker", True, str, "Token ticker symbol")
                 ],
                 description="Get token data by ticker symbol",
+                cache=CachePolicy(ttl=3600),
             ),
             "get-token-by-address": Action(
                 name="get-token-by-address",
                 parameters=[ActionParameter("mint", True, str, "Token mint address")],
                 description="Get token data by mint address",
+                cache=CachePolicy(ttl=3600),
             ),
             "launch-pump-token": Action(
                 name="launch-pump-token",
@@ -286,14 +293,18 @@ class SolanaConnection(BaseConnection):
     def transfer(
         self, to_address: str, amount: float, token_mint: Optional[str] = None
     ) -> str:
-        res = SolanaTransferHelper.transfer(
+        return asyncio.run(self.atransfer(to_address, amount, token_mint))
+
+    async def atransfer(
+        self, to_address: str, amount: float, token_mint: Optional[str] = None
+    ) -> str:
+        res = await SolanaTransferHelper.transfer(
             self._get_connection_async(),
             self._get_wallet(),
             to_address,
             amount,
             token_mint,
         )
-        res = asyncio.run(res)
         logger.debug(f"Transferred {amount} to {to_address}\nTransaction ID: {res}")
         return res
 
@@ -304,12 +315,23 @@ class SolanaConnection(BaseConnection):
         input_amount: float,
         input_mint: Optional[str] = SPL_TOKENS["USDC"],
         slippage_bps: int = 100,
+    ) -> str:
+        return asyncio.run(
+            self.atrade(output_mint, input_amount, input_mint, slippage_bps)
+        )
+
+    async def atrade(
+        self,
+        output_mint: str,
+        input_amount: float,
+        input_mint: Optional[str] = SPL_TOKENS["USDC"],
+        slippage_bps: int = 100,
     ) -> str:
         logger.info(f"Swapping {input_amount} for {output_mint}")
         wallet = self._get_wallet()
         async_client = self._get_connection_async()
         jupiter = self._get_jupiter(wallet, async_client)
-        res = TradeManager.trade(
+        return await TradeManager.trade(
             async_client,
             wallet,
             jupiter,
@@ -318,26 +340,27 @@ class SolanaConnection(BaseConnection):
             input_mint,
             slippage_bps,
         )
-        res = asyncio.run(res)
-        return res
 
     def get_balance(self, token_address: str = None) -> float:
+        return asyncio.run(self.aget_balance(token_address))
+
+    async def aget_balance(self, token_address: str = None) -> float:
         if not token_address:
             logger.info("Getting SOL balance")
         else:
             logger.info(f"Getting balance for {token_address}")
-        res = SolanaReadHelper.get_balance(
+        return await SolanaReadHelper.get_balance(
             self._get_connection_async(), self._get_wallet(), token_address
         )
-        res = asyncio.run(res)
-        return res
 
     def stake(self, amount: float) -> str:
+        return asyncio.run(self.astake(amount))
+
+    async def astake(self, amount: float) -> str:
         logger.info(f"Staking {amount} SOL")
-        res = StakeManager.stake_with_jup(
+        res = await StakeManager.stake_with_jup(
             self._get_connection_async(), self._get_wallet(), amount
         )
-        res = asyncio.run(res)
         logger.debug(f"Staked {amount} SOL\nTransaction ID: {res}")
         return res
 
@@ -353,9 +376,11 @@ class SolanaConnection(BaseConnection):
         # return res
 
     def request_faucet(self) -> str:
+        return asyncio.run(self.arequest_faucet())
+
+    async def arequest_faucet(self) -> str:
         logger.info("Requesting faucet funds")
-        res = FaucetManager.request_faucet_funds(self)
-        res = asyncio.run(res)
+        res = await FaucetManager.request_faucet_funds(self)
         logger.debug(f"Requested faucet funds\nTransaction ID: {res}")
         return res
 
@@ -376,9 +401,12 @@ class SolanaConnection(BaseConnection):
 
     # todo: test on mainnet
     def get_tps(self) -> int:
-        res = SolanaPerformanceTracker.fetch_current_tps(self._get_connection_async())
-        res = asyncio.run(res)
-        return res
+        return asyncio.run(self.aget_tps())
+
+    async def aget_tps(self) -> int:
+        return await SolanaPerformanceTracker.fetch_current_tps(
+            self._get_connection_async()
+        )
 
     def get_token_by_ticker(self, ticker: str) -> str:
         ticker = ticker.upper()
@@ -425,6 +453,5 @@ class SolanaConnection(BaseConnection):
         if errors:
             raise ValueError(f"Invalid parameters: {', '.join(errors)}")
 
-        method_name = action_name.replace("-", "_")
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         return method(**kwargs)
@@ -1,18 +1,54 @@
 import logging
 import os
-import requests
+import socket
+from src.helpers.transport import http
 import time
 import json
-from typing import Dict, Any, Optional
+import asyncio
+import concurrent.futures
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional
 from dotenv import load_dotenv, set_key
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 from src.constants.abi import ERC20_ABI
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, CachePolicy, get_action_executor
+from src.helpers.cache import normalize_params
+from src.helpers.shared_state import get_shared_store
+from src.helpers.sonic.nonce import NonceManager, get_nonce_manager
+from src.helpers.sonic.batcher import BatchReceipt, WriteBatcher, merkle_root_and_proofs, verify_proof
+from src.helpers.sonic.envelope import EnvelopeCodec, decode_payload, iter_records
+from src.helpers.sonic.indexer import DEFAULT_POLL_INTERVAL, DEFAULT_REORG_DEPTH, RecordIndex, StoreIndexer
+from src.helpers.sonic.wallets import LEAST_PENDING, WalletPool, load_sender_accounts
+from src.helpers.sonic.blobs import BlobAnchors, hash_user_id, is_anchor
+from src.helpers.sonic.tx_cache import CachedTx, TxCache, normalize_tx_hash
+from src.helpers.sonic.backfill import DEFAULT_CHUNK_SIZE, DEFAULT_WORKERS, Backfill
+from src.helpers.jsonrpc import JsonRpcBatchClient
+from src.helpers.receipts import get_receipt_tracker
+from src.helpers.fees import get_fee_oracle
+from src.helpers.rpc_pool import PooledHTTPProvider, RPCPool, network_rpc_urls
 from src.constants.networks import SONIC_NETWORKS
 
 logger = logging.getLogger("connections.sonic_connection")
 
+# "type" of a transaction payload carrying several store-data records
+BATCH_DATA_TYPE = "batch"
+# Seconds a finalized block number is reused before asking the node again
+FINALIZED_BLOCK_TTL = 5.0
+
+
+def _stored_data_cache_key(params: Dict[str, Any]) -> Optional[str]:
+    """Only lookups pinned to a tx hash are stable enough to cache"""
+    if not params.get("tx_hash"):
+        return None
+    return normalize_params(params)
+
+
+def _is_mined_result(records: List[Dict[str, Any]]) -> bool:
+    """Don't cache lookups of transactions that have not landed in a block yet"""
+    return bool(records) and all(record.get("block_number") is not None for record in records)
+
 
 class SonicConnectionError(Exception):
     """Base exception for Sonic connection errors"""
@@ -23,6 +59,15 @@ class SonicConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Sonic connection...")
         self._web3 = None
+        self._nonce_lock = threading.Lock()
+        self._write_batcher: Optional[WriteBatcher] = None
+        self._indexer: Optional[StoreIndexer] = None
+        self._index_lock = threading.Lock()
+        # (private key, account) of SONIC_PRIVATE_KEY, derived once per key
+        self._account = None
+        self._wallet_pool: Optional[WalletPool] = None
+        # (finalized block number, monotonic time it was read)
+        self._finalized: Optional[tuple] = None
         
         # Get network configuration
         network = config.get("network", "mainnet")
@@ -30,11 +75,42 @@ class SonicConnection(BaseConnection):
             raise ValueError(f"Invalid network '{network}'. Must be one of: {', '.join(SONIC_NETWORKS.keys())}")
             
         network_config = SONIC_NETWORKS[network]
+        self.network = network
         self.explorer = network_config["scanner_url"]
-        self.rpc_url = network_config["rpc_url"]
+        # Primary endpoint first; it also keys the shared receipt tracker and fee oracle
+        self.rpc_urls = network_rpc_urls(network_config, config)
+        self.rpc_url = self.rpc_urls[0]
+        self.rpc_pool = RPCPool.from_config(self.rpc_urls, config.get("rpc_pool"))
         
         super().__init__(config)
         self._initialize_web3()
+        self.receipts = get_receipt_tracker(self.rpc_url, self.config.get("receipts"), pool=self.rpc_pool)
+        # Binary envelope for store-data calldata; "envelope": false keeps legacy JSON text
+        envelope_config = self.config.get("envelope", {})
+        self._envelope: Optional[EnvelopeCodec] = (
+            EnvelopeCodec.from_config(envelope_config if isinstance(envelope_config, dict) else {})
+            if envelope_config is not False else None
+        )
+        self._tx_cache = self._open_tx_cache()
+        # Off-chain store for large payloads; only their hash is anchored on chain
+        blob_config = self.config.get("blob_store")
+        self._blobs: Optional[BlobAnchors] = (
+            BlobAnchors.from_config(
+                blob_config if isinstance(blob_config, dict) else {},
+                Path.home() / ".zerepy" / f"sonic_blobs_{self.network}"
+            )
+            if blob_config else None
+        )
+        if self.config.get("wallet_pool"):
+            try:
+                self._get_wallet_pool()
+            except Exception as e:
+                logger.warning(f"Could not start sender wallet pool: {e}")
+        if self.config.get("index") not in (None, False):
+            try:
+                self._get_indexer()
+            except Exception as e:
+                logger.warning(f"Could not start stored-data indexer: {e}")
         self.ERC20_ABI = ERC20_ABI
         self.NATIVE_TOKEN = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
         self.aggregator_api = "https://aggregator-api.kyberswap.com/sonic/api/v1"
@@ -46,17 +122,170 @@ class SonicConnection(BaseConnection):
     def _initialize_web3(self):
         """Initialize Web3 connection"""
         if not self._web3:
-            self._web3 = Web3(Web3.HTTPProvider(self.rpc_url))
+            # Reads go to the fastest healthy endpoint, writes stay pinned to one
+            self._web3 = Web3(PooledHTTPProvider(self.rpc_pool))
             self._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
             if not self._web3.is_connected():
                 raise SonicConnectionError("Failed to connect to Sonic network")
+            self.fees = get_fee_oracle(self.rpc_url, self._web3, self.config.get("fees"))
             
             try:
-                chain_id = self._web3.eth.chain_id
+                chain_id = self.fees.chain_id
                 logger.info(f"Connected to network with chain ID: {chain_id}")
             except Exception as e:
                 logger.warning(f"Could not get chain ID: {e}")
 
+    def _open_tx_cache(self) -> Optional[TxCache]:
+        """Decoded-transaction cache; "tx_cache": false disables it"""
+        cache_config = self.config.get("tx_cache", {})
+        if cache_config is False:
+            return None
+        cache_config = cache_config if isinstance(cache_config, dict) else {}
+        path = cache_config.get("path") or Path.home() / ".zerepy" / f"sonic_txcache_{self.network}.sqlite"
+        try:
+            return TxCache(path)
+        except Exception as e:
+            logger.warning(f"Transaction cache unavailable at {path}: {e}")
+            return None
+
+    def _finalized_block(self, block_number: Optional[int] = None) -> int:
+        """
+        Highest block that can no longer be reorged
+
+        The number only grows, so a recent reading is reused for FINALIZED_BLOCK_TTL
+        seconds, and for good whenever it already covers block_number.
+        """
+        cached = self._finalized
+        if cached is not None and (
+            (block_number is not None and block_number <= cached[0])
+            or time.monotonic() - cached[1] < FINALIZED_BLOCK_TTL
+        ):
+            return cached[0]
+
+        try:
+            finalized = self._web3.eth.get_block("finalized")["number"]
+        except Exception:
+            # Nodes without the "finalized" tag: fall back to a confirmation depth
+            cache_config = self.config.get("tx_cache")
+            confirmations = DEFAULT_REORG_DEPTH
+            if isinstance(cache_config, dict):
+                confirmations = cache_config.get("confirmations", DEFAULT_REORG_DEPTH)
+            finalized = self._web3.eth.block_number - confirmations
+        self._finalized = (finalized, time.monotonic())
+        return finalized
+
+    def _get_account(self):
+        """Account of SONIC_PRIVATE_KEY, derived once rather than on every call"""
+        private_key = os.getenv('SONIC_PRIVATE_KEY')
+        cached = self._account
+        if cached is None or cached[0] != private_key:
+            cached = (private_key, self._web3.eth.account.from_key(private_key))
+            self._account = cached
+        return cached[1]
+
+    def _get_wallet_pool(self) -> Optional[WalletPool]:
+        """
+        Sender pool for store-data, when the "wallet_pool" config block enables it, e.g.
+        {"size": 4, "strategy": "least_pending", "top_up": {"min_balance": 1, "target_balance": 5}}
+        (balances in S). Signers come from SONIC_WALLET_MNEMONIC or SONIC_WALLET_KEYS.
+        """
+        pool_config = self.config.get("wallet_pool")
+        if not pool_config:
+            return None
+        pool_config = pool_config if isinstance(pool_config, dict) else {}
+
+        with self._nonce_lock:
+            if self._wallet_pool is None:
+                accounts = load_sender_accounts(self._web3.eth.account, pool_config.get("size", 4))
+                if not accounts:
+                    logger.warning("wallet_pool is enabled but no SONIC_WALLET_MNEMONIC or SONIC_WALLET_KEYS is set")
+                    return None
+                self._wallet_pool = WalletPool(accounts, pool_config.get("strategy", LEAST_PENDING))
+                logger.info(f"Sender wallet pool ready with {len(accounts)} lanes")
+
+                top_up = pool_config.get("top_up")
+                if top_up:
+                    interval = top_up.get("interval", 300)
+                    store = get_shared_store()
+                    claim = None
+                    if store is not None:
+                        # One worker process funds the lanes per interval
+                        claim = lambda: store.add(f"sonic:{self.network}:top_up", os.getpid(), ttl=interval * 0.9)
+                    self._wallet_pool.start_top_up(
+                        self._web3.eth.get_balance,
+                        self._fund_sender,
+                        min_balance=self._web3.to_wei(top_up.get("min_balance", 1), 'ether'),
+                        target_balance=self._web3.to_wei(top_up.get("target_balance", 5), 'ether'),
+                        interval=interval,
+                        claim=claim
+                    )
+            return self._wallet_pool
+
+    def _fund_sender(self, address: str, amount: int):
+        """Top-up callback: transfer amount wei from the main account, returning the receipt future"""
+        def build_tx(nonce: int) -> Dict[str, Any]:
+            return {
+                'nonce': nonce,
+                'to': address,
+                'value': amount,
+                'gas': 21000,
+                **self.fees.fee_params(),
+                'chainId': self.fees.chain_id
+            }
+
+        tx_hash = self._send_transaction(self._get_account(), build_tx)
+        return self.receipts.track(tx_hash)
+
+    def _send_stored(self, payload: Dict[str, Any]) -> str:
+        """Send a store-data payload from a wallet pool lane, or from the main account without a pool"""
+        pool = self._get_wallet_pool()
+        if pool is None:
+            return self._send_data(self._get_account(), payload)
+
+        lane = pool.acquire()
+        try:
+            tx_hash = self._send_data(lane.account, payload)
+        except Exception:
+            pool.release(lane)
+            raise
+        # The lane counts as busy until its transaction is confirmed
+        self.receipts.track(tx_hash).add_done_callback(lambda _: pool.release(lane))
+        return tx_hash
+
+    def _get_nonce_manager(self, address: str) -> NonceManager:
+        # Process-wide per endpoint and address, so it outlives agent reloads; with
+        # several server workers the lane itself lives in the shared store
+        return get_nonce_manager(
+            self.rpc_url, self._web3, address,
+            store=get_shared_store(), store_key=f"sonic:{self.network}:nonce:{address}"
+        )
+
+    def _send_transaction(self, account, build_tx: Callable[[int], Dict[str, Any]]):
+        """
+        Sign and send the transaction build_tx(nonce) returns, using a nonce
+        from the account's local allocator instead of a per-send RPC lookup
+        """
+        def _send(nonce: int):
+            signed = account.sign_transaction(build_tx(nonce))
+            return self._web3.eth.send_raw_transaction(signed.rawTransaction)
+
+        def _fill_gap(nonce: int):
+            # Zero-value self-transfer so transactions queued behind this nonce can be mined
+            signed = account.sign_transaction({
+                'nonce': nonce,
+                'to': account.address,
+                'value': 0,
+                'gas': 21000,
+                **self.fees.fee_params(),
+                'chainId': self.fees.chain_id
+            })
+            return self._web3.eth.send_raw_transaction(signed.rawTransaction)
+
+        tx_hash = self._get_nonce_manager(account.address).send(_send, fill_gap=_fill_gap)
+        # Confirmation is tracked in the background; see get-transaction-status
+        self.receipts.track(tx_hash)
+        return tx_hash
+
     @property
     def is_llm_provider(self) -> bool:
         return False
@@ -79,7 +308,7 @@ class SonicConnection(BaseConnection):
             if ticker.lower() in ["s", "S"]:
                 return "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
                 
-            response = requests.get(
+            response = http.get(
                 f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
             )
             response.raise_for_status()
@@ -114,7 +343,8 @@ class SonicConnection(BaseConnection):
                 parameters=[
                     ActionParameter("ticker", True, str, "Token ticker symbol to look up")
                 ],
-                description="Get token address by ticker symbol"
+                description="Get token address by ticker symbol",
+                cache=CachePolicy(ttl=3600)
             ),
             "get-balance": Action(
                 name="get-balance",
@@ -122,7 +352,8 @@ class SonicConnection(BaseConnection):
                     ActionParameter("address", False, str, "Address to check balance for"),
                     ActionParameter("token_address", False, str, "Optional token address")
                 ],
-                description="Get $S or token balance"
+                description="Get $S or token balance",
+                read_only=True
             ),
             "transfer": Action(
                 name="transfer",
@@ -159,7 +390,28 @@ class SonicConnection(BaseConnection):
                     ActionParameter("data_type", False, str, "Optional type of data to fetch"),
                     ActionParameter("tx_hash", False, str, "Optional transaction hash to fetch data for")
                 ],
-                description="Retrieve stored data from Sonic blockchain"
+                description="Retrieve stored data from Sonic blockchain",
+                cache=CachePolicy(ttl=86400, max_entries=1024, key=_stored_data_cache_key,
+                                  accept=_is_mined_result),
+                read_only=True
+            ),
+            "get-transaction-status": Action(
+                name="get-transaction-status",
+                parameters=[
+                    ActionParameter("tx_hash", True, str, "Transaction hash"),
+                    ActionParameter("wait", False, float, "Seconds to wait for confirmation")
+                ],
+                description="Confirmation status of a transaction",
+                read_only=True
+            ),
+            "backfill-stored-data": Action(
+                name="backfill-stored-data",
+                parameters=[
+                    ActionParameter("start_block", True, int, "First block to index"),
+                    ActionParameter("end_block", False, int, "Last block to index, defaults to the block the live index has reached"),
+                    ActionParameter("workers", False, int, "Parallel batch requests")
+                ],
+                description="Index historical stored data for a block range"
             )
         }
 
@@ -215,11 +467,9 @@ class SonicConnection(BaseConnection):
         """Get balance for an address or the configured wallet"""
         try:
             if not address:
-                private_key = os.getenv('SONIC_PRIVATE_KEY')
-                if not private_key:
+                if not os.getenv('SONIC_PRIVATE_KEY'):
                     raise SonicConnectionError("No wallet configured")
-                account = self._web3.eth.account.from_key(private_key)
-                address = account.address
+                address = self._get_account().address
 
             if token_address:
                 contract = self._web3.eth.contract(
@@ -240,9 +490,8 @@ class SonicConnection(BaseConnection):
     def transfer(self, to_address: str, amount: float, token_address: Optional[str] = None, data: Optional[str] = None) -> str:
         """Transfer $S or tokens to an address with optional data"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
-            chain_id = self._web3.eth.chain_id
+            account = self._get_account()
+            chain_id = self.fees.chain_id
             
             if token_address:
                 contract = self._web3.eth.contract(
@@ -251,34 +500,36 @@ class SonicConnection(BaseConnection):
                 )
                 decimals = contract.functions.decimals().call()
                 amount_raw = int(amount * (10 ** decimals))
-                
-                tx = contract.functions.transfer(
-                    Web3.to_checksum_address(to_address),
-                    amount_raw
-                ).build_transaction({
-                    'from': account.address,
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
-                    'gasPrice': self._web3.eth.gas_price,
-                    'chainId': chain_id,
-                    'data': self._web3.to_hex(text=data) if data else None
-                })
-            else:
-                tx = {
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
-                    'to': Web3.to_checksum_address(to_address),
-                    'value': self._web3.to_wei(amount, 'ether'),
-                    'gas': 21000,
-                    'gasPrice': self._web3.eth.gas_price,
-                    'chainId': chain_id,
-                    'data': self._web3.to_hex(text=data) if data else None
-                }
 
-            # Ajustar o gás se houver dados adicionais
-            if data:
-                tx['gas'] = 100000  # Valor maior para acomodar os dados
+            def build_tx(nonce: int) -> Dict[str, Any]:
+                if token_address:
+                    tx = contract.functions.transfer(
+                        Web3.to_checksum_address(to_address),
+                        amount_raw
+                    ).build_transaction({
+                        'from': account.address,
+                        'nonce': nonce,
+                        **self.fees.fee_params(),
+                        'chainId': chain_id,
+                        'data': self._web3.to_hex(text=data) if data else None
+                    })
+                else:
+                    tx = {
+                        'nonce': nonce,
+                        'to': Web3.to_checksum_address(to_address),
+                        'value': self._web3.to_wei(amount, 'ether'),
+                        'gas': 21000,
+                        **self.fees.fee_params(),
+                        'chainId': chain_id,
+                        'data': self._web3.to_hex(text=data) if data else None
+                    }
+
+                # Ajustar o gás se houver dados adicionais
+                if data:
+                    tx['gas'] = 100000  # Valor maior para acomodar os dados
+                return tx
 
-            signed = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed.rawTransaction)
+            tx_hash = self._send_transaction(account, build_tx)
 
             # Log and return explorer link immediately
             tx_link = self._get_explorer_link(tx_hash.hex())
@@ -314,7 +565,7 @@ class SonicConnection(BaseConnection):
                 "gasInclude": "true"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http.get(url, headers=headers, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -330,8 +581,7 @@ class SonicConnection(BaseConnection):
     def _get_encoded_swap_data(self, route_summary: Dict, slippage: float = 0.5) -> str:
         """Get encoded swap data from Kyberswap API"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             
             url = f"{self.aggregator_api}/route/build"
             headers = {"x-client-id": "zerepy"}
@@ -345,7 +595,7 @@ class SonicConnection(BaseConnection):
                 "source": "ZerePyBot"
             }
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = http.post(url, headers=headers, json=payload)
             response.raise_for_status()
             
             data = response.json()
@@ -361,8 +611,7 @@ class SonicConnection(BaseConnection):
     def _handle_token_approval(self, token_address: str, spender_address: str, amount: int) -> None:
         """Handle token approval for spender"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             
             token_contract = self._web3.eth.contract(
                 address=Web3.to_checksum_address(token_address),
@@ -376,22 +625,24 @@ class SonicConnection(BaseConnection):
             ).call()
             
             if current_allowance < amount:
-                approve_tx = token_contract.functions.approve(
-                    spender_address,
-                    amount
-                ).build_transaction({
-                    'from': account.address,
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
-                    'gasPrice': self._web3.eth.gas_price,
-                    'chainId': self._web3.eth.chain_id
-                })
-                
-                signed_approve = account.sign_transaction(approve_tx)
-                tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
+                tx_hash = self._send_transaction(
+                    account,
+                    lambda nonce: token_contract.functions.approve(
+                        spender_address,
+                        amount
+                    ).build_transaction({
+                        'from': account.address,
+                        'nonce': nonce,
+                        **self.fees.fee_params(),
+                        'chainId': self.fees.chain_id
+                    })
+                )
                 logger.info(f"Approval transaction sent: {self._get_explorer_link(tx_hash.hex())}")
                 
-                # Wait for approval to be mined
-                self._web3.eth.wait_for_transaction_receipt(tx_hash)
+                # The swap needs the allowance, so wait for the tracker to see the approval mined
+                receipt = self.receipts.wait(tx_hash)
+                if receipt['status'] != 1:
+                    raise ValueError("Token approval failed")
                 
         except Exception as e:
             logger.error(f"Approval failed: {e}")
@@ -400,8 +651,7 @@ class SonicConnection(BaseConnection):
     def swap(self, token_in: str, token_out: str, amount: float, slippage: float = 0.5) -> str:
         """Execute a token swap using the KyberSwap router"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
 
             # Check token balance before proceeding
             current_balance = self.get_balance(
@@ -434,27 +684,27 @@ class SonicConnection(BaseConnection):
                     amount_raw = int(amount * (10 ** decimals))
                 self._handle_token_approval(token_in, router_address, amount_raw)
             
-            # Prepare transaction
-            tx = {
-                'from': account.address,
-                'to': Web3.to_checksum_address(router_address),
-                'data': encoded_data,
-                'nonce': self._web3.eth.get_transaction_count(account.address),
-                'gasPrice': self._web3.eth.gas_price,
-                'chainId': self._web3.eth.chain_id,
-                'value': self._web3.to_wei(amount, 'ether') if token_in.lower() == self.NATIVE_TOKEN.lower() else 0
-            }
-            
-            # Estimate gas
-            try:
-                tx['gas'] = self._web3.eth.estimate_gas(tx)
-            except Exception as e:
-                logger.warning(f"Gas estimation failed: {e}, using default gas limit")
-                tx['gas'] = 500000  # Default gas limit
-            
+            def build_tx(nonce: int) -> Dict[str, Any]:
+                tx = {
+                    'from': account.address,
+                    'to': Web3.to_checksum_address(router_address),
+                    'data': encoded_data,
+                    'nonce': nonce,
+                    **self.fees.fee_params(),
+                    'chainId': self.fees.chain_id,
+                    'value': self._web3.to_wei(amount, 'ether') if token_in.lower() == self.NATIVE_TOKEN.lower() else 0
+                }
+
+                # Estimate gas
+                try:
+                    tx['gas'] = self._web3.eth.estimate_gas(tx)
+                except Exception as e:
+                    logger.warning(f"Gas estimation failed: {e}, using default gas limit")
+                    tx['gas'] = 500000  # Default gas limit
+                return tx
+
             # Sign and send transaction
-            signed_tx = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            tx_hash = self._send_transaction(account, build_tx)
             
             # Log and return explorer link immediately
             tx_link = self._get_explorer_link(tx_hash.hex())
@@ -464,90 +714,358 @@ class SonicConnection(BaseConnection):
             logger.error(f"Swap failed: {e}")
             raise
 
+    def _send_data(self, account, payload: Dict[str, Any]) -> str:
+        """Send payload as calldata of a self-transaction and return the tx hash"""
+        # Convert to hex string
+        if self._envelope is not None:
+            hex_data = self._web3.to_hex(self._envelope.encode(payload))
+        else:
+            hex_data = self._web3.to_hex(text=json.dumps(payload))
+
+        def build_tx(nonce: int) -> Dict[str, Any]:
+            tx = {
+                'nonce': nonce,
+                # Always the main account, whichever lane signs, so the indexer sees every record
+                'to': self._get_account().address,
+                'value': 0,
+                **self.fees.fee_params(),
+                'chainId': self.fees.chain_id,
+                'data': hex_data
+            }
+
+            try:
+                # Same target and code path every time, so one estimate per calldata size bucket
+                tx['gas'] = self.fees.estimate_gas(tx, shape="store-data")
+            except Exception as e:
+                logger.warning(f"Gas estimation failed: {e}, using default gas limit")
+                tx['gas'] = 1000000
+            return tx
+
+        # Sign and send transaction
+        tx_hash = self._send_transaction(account, build_tx).hex()
+        if self._tx_cache is not None:
+            self._tx_cache.put_pending(tx_hash, payload)
+        return tx_hash
+
+    def _send_batch(self, records: List[Dict[str, Any]], root: str) -> str:
+        """WriteBatcher callback: write all records in one transaction"""
+        return self._send_stored({"type": BATCH_DATA_TYPE, "root": root, "records": records})
+
+    def _get_write_batcher(self) -> Optional[WriteBatcher]:
+        """Batcher for store-data, when the "batch_writes" config block enables it"""
+        batch_config = self.config.get("batch_writes")
+        if not batch_config:
+            return None
+        with self._nonce_lock:
+            if self._write_batcher is None:
+                self._write_batcher = WriteBatcher.from_config(
+                    self._send_batch, batch_config if isinstance(batch_config, dict) else {}
+                )
+            return self._write_batcher
+
+    def _get_indexer(self) -> Optional[StoreIndexer]:
+        """
+        Indexer of this account's store-data records, when the "index" config
+        block enables it, e.g. {"start_block": 1000000, "reorg_depth": 64}
+        """
+        index_config = self.config.get("index")
+        if index_config is None or index_config is False:
+            return None
+        index_config = index_config if isinstance(index_config, dict) else {}
+
+        with self._index_lock:
+            if self._indexer is None:
+                if not os.getenv('SONIC_PRIVATE_KEY'):
+                    return None
+                account = self._get_account()
+                path = index_config.get("path") or Path.home() / ".zerepy" / f"sonic_index_{self.network}.sqlite"
+                # Store-data is only trusted from the main account and its wallet pool lanes
+                pool = self._get_wallet_pool()
+                self._indexer = StoreIndexer(
+                    self._web3,
+                    account.address,
+                    RecordIndex(path),
+                    decode=lambda raw: decode_payload(raw, self._envelope),
+                    reorg_depth=index_config.get("reorg_depth", DEFAULT_REORG_DEPTH),
+                    start_block=index_config.get("start_block"),
+                    senders=[lane.address for lane in pool.lanes] if pool is not None else (),
+                    rpc=JsonRpcBatchClient(self.rpc_url, pool=self.rpc_pool)
+                )
+                interval = index_config.get("poll_interval", DEFAULT_POLL_INTERVAL)
+                self._indexer.start(interval, claim=self._indexer_lease(interval * 3))
+            return self._indexer
+
+    def _indexer_lease(self, lease: float) -> Optional[Callable[[], bool]]:
+        """
+        With a shared state store, a claim that elects one worker process as
+        the index writer. The holder renews the lease on every poll; if it
+        stops or dies, another worker takes over once `lease` seconds pass.
+        """
+        store = get_shared_store()
+        if store is None:
+            return None
+        key = f"sonic:{self.network}:indexer"
+        owner = f"{socket.gethostname()}:{os.getpid()}"
+
+        def take(current):
+            now = time.time()
+            if current is None or current["owner"] == owner or current["expires_at"] <= now:
+                return {"owner": owner, "expires_at": now + lease}
+            return current
+
+        return lambda: store.update(key, take)["owner"] == owner
+
+    def close(self) -> None:
+        super().close()
+        with self._index_lock:
+            if self._indexer is not None:
+                self._indexer.stop()
+                self._indexer = None
+        with self._nonce_lock:
+            if self._wallet_pool is not None:
+                self._wallet_pool.stop()
+                self._wallet_pool = None
+
+    def _format_stored(self, tx_hash: str, receipt: Optional[BatchReceipt] = None) -> str:
+        tx_link = self._get_explorer_link(tx_hash)
+        if receipt is None:
+            return f"📝 Data stored on chain: {tx_link}"
+        return f"📝 Data stored on chain: {tx_link} (batch index {receipt.index} of {receipt.batch_size})"
+
     def store_data(self, data: str, data_type: str) -> str:
         """Store data on Sonic blockchain"""
+        if data_type == BATCH_DATA_TYPE:
+            raise ValueError(f"data_type '{BATCH_DATA_TYPE}' is reserved for batched writes")
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
-            
+            if self._blobs is not None:
+                data = self._blobs.anchor(data)
+
             # Prepare the data
             storage_data = {
                 "type": data_type,
                 "data": data,
                 "timestamp": int(time.time())
             }
-            
-            # Convert to hex string
-            hex_data = self._web3.to_hex(text=json.dumps(storage_data))
-            
-            # Prepare transaction
-            tx = {
-                'nonce': self._web3.eth.get_transaction_count(account.address),
-                'to': account.address,  # Store in own address for now
-                'value': 0,
-                'gasPrice': self._web3.eth.gas_price,
-                'chainId': self._web3.eth.chain_id,
-                'data': hex_data
-            }
 
-            try:
-                tx['gas'] = self._web3.eth.estimate_gas(tx)
-            except Exception as e:
-                logger.warning(f"Gas estimation failed: {e}, using default gas limit")
-                tx['gas'] = 1000000  
-            
-            # Sign and send transaction
-            signed = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed.rawTransaction)
+            batcher = self._get_write_batcher()
+            if batcher is not None:
+                try:
+                    receipt = batcher.submit(storage_data).result(timeout=batcher.submit_timeout)
+                except concurrent.futures.TimeoutError:
+                    raise SonicConnectionError(
+                        f"Batched write was not sent within {batcher.submit_timeout:.0f}s; it may still land"
+                    )
+                return self._format_stored(receipt.tx_hash, receipt)
+
+            tx_hash = self._send_stored(storage_data)
             
             # Return explorer link
-            tx_link = self._get_explorer_link(tx_hash.hex())
-            return f"📝 Data stored on chain: {tx_link}"
+            return self._format_stored(tx_hash)
             
         except Exception as e:
             logger.error(f"Failed to store data: {e}")
             raise
 
+    async def astore_data(self, data: str, data_type: str) -> str:
+        """Async store_data: waits for its batch without holding an executor thread"""
+        if data_type == BATCH_DATA_TYPE:
+            raise ValueError(f"data_type '{BATCH_DATA_TYPE}' is reserved for batched writes")
+        batcher = self._get_write_batcher()
+        if batcher is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(get_action_executor(), self.store_data, data, data_type)
+
+        if self._blobs is not None:
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(get_action_executor(), self._blobs.anchor, data)
+        storage_data = {
+            "type": data_type,
+            "data": data,
+            "timestamp": int(time.time())
+        }
+        try:
+            receipt = await asyncio.wait_for(
+                asyncio.wrap_future(batcher.submit(storage_data)), timeout=batcher.submit_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Failed to store data: batch not sent within {batcher.submit_timeout:.0f}s")
+            raise SonicConnectionError(
+                f"Batched write was not sent within {batcher.submit_timeout:.0f}s; it may still land"
+            )
+        except Exception as e:
+            logger.error(f"Failed to store data: {e}")
+            raise
+        return self._format_stored(receipt.tx_hash, receipt)
+
+    def get_transaction_status(self, tx_hash: str, wait: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Receipt tracker status of a transaction, waiting up to `wait` seconds
+        for it to finish. Transactions this process did not send get a single
+        receipt lookup instead and are never tracked.
+        """
+        if self.receipts.status(tx_hash) is None:
+            return self.receipts.fetch_status(tx_hash).to_dict()
+        future = self.receipts.track(tx_hash)
+        if wait:
+            try:
+                future.result(timeout=wait)
+            except Exception:
+                # Still pending, timed out or failed: the status says which
+                pass
+        return self.receipts.status(tx_hash).to_dict()
+
+    async def aget_transaction_status(self, tx_hash: str, wait: Optional[float] = None) -> Dict[str, Any]:
+        """Async get_transaction_status: waits without holding an executor thread"""
+        if self.receipts.status(tx_hash) is None:
+            status = await asyncio.to_thread(self.receipts.fetch_status, tx_hash)
+            return status.to_dict()
+        future = self.receipts.track(tx_hash)
+        if wait:
+            try:
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=wait)
+            except Exception:
+                pass
+        return self.receipts.status(tx_hash).to_dict()
+
+    def backfill_stored_data(self, start_block: int, end_block: Optional[int] = None,
+                             workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Index store-data records from past blocks; re-running resumes where it stopped.
+        end_block defaults to the live index's checkpoint (or the chain head
+        before its first pass); re-indexing blocks the live index already
+        covered is harmless.
+        """
+        indexer = self._get_indexer()
+        if indexer is None:
+            raise ValueError("The stored-data index is not enabled")
+        index_config = self.config.get("index")
+        index_config = index_config if isinstance(index_config, dict) else {}
+
+        if end_block is None:
+            checkpoint = indexer.index.get_checkpoint()
+            end_block = checkpoint if checkpoint is not None else self._web3.eth.block_number
+
+        backfill = Backfill(
+            JsonRpcBatchClient(self.rpc_url, pool=self.rpc_pool),
+            indexer.address,
+            indexer.index,
+            decode=indexer.decode,
+            chunk_size=index_config.get("backfill_chunk_size", DEFAULT_CHUNK_SIZE),
+            workers=workers or index_config.get("backfill_workers", DEFAULT_WORKERS),
+            senders=indexer.senders
+        )
+        return backfill.run(start_block, end_block).to_dict()
+
+    def _load_stored_tx(self, tx_hash: str) -> Optional[CachedTx]:
+        """
+        Decoded payload of a store-data transaction. Finalized transactions
+        are served from the tx cache without any RPC call; everything else is
+        fetched, and cached once its block is final.
+        """
+        cached = self._tx_cache.get(tx_hash) if self._tx_cache is not None else None
+        if cached is not None and cached.block_number is not None:
+            return cached
+
+        tx = self._web3.eth.get_transaction(tx_hash)
+        if not tx or tx.input in ('0x', b''):
+            return None
+
+        if cached is not None:
+            # Our own write: the payload is known, only the block was missing
+            payload = cached.payload
+        else:
+            raw_data = self._web3.to_bytes(hexstr=tx.input) if isinstance(tx.input, str) else bytes(tx.input)
+            logger.info(f"Found transaction data for hash {tx_hash}")
+            payload = decode_payload(raw_data, self._envelope)
+
+        block_hash = self._web3.to_hex(tx.blockHash) if tx.blockHash else None
+        stored = CachedTx(normalize_tx_hash(tx.hash), payload, tx.blockNumber, block_hash)
+        if (self._tx_cache is not None and tx.blockNumber is not None
+                and tx.blockNumber <= self._finalized_block(tx.blockNumber)):
+            self._tx_cache.put_finalized(stored.tx_hash, payload, tx.blockNumber, block_hash)
+        return stored
+
+    def _resolve_data(self, data: Any) -> Any:
+        """Swap a blob anchor for its payload, verified against the anchored hash"""
+        if not is_anchor(data):
+            return data
+        if self._blobs is None:
+            raise SonicConnectionError(f"Record is anchored to blob {data['blob']} but no blob_store is configured")
+        return self._blobs.resolve(data)
+
+    @staticmethod
+    def _batch_proofs(stored: CachedTx) -> Optional[List[List[str]]]:
+        """
+        Inclusion proof of each record in a batch payload, checked against the
+        root written with it; None for single records or a root that does not match
+        """
+        payload = stored.payload
+        if payload.get("type") != BATCH_DATA_TYPE:
+            return None
+        records = payload.get("records", [])
+        _, proofs = merkle_root_and_proofs(records)
+        if not all(verify_proof(record, proof, payload.get("root")) for record, proof in zip(records, proofs)):
+            logger.warning(f"Batch {stored.tx_hash} does not match its Merkle root; serving it without proofs")
+            return None
+        return proofs
+
     def get_stored_data(self, user_id: str, data_type: Optional[str] = None, tx_hash: str = None) -> list:
         """Retrieve stored data from Sonic blockchain"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
             stored_data = []
             
             if not tx_hash:
-                raise ValueError("Transaction hash is required")
+                indexer = self._get_indexer()
+                if indexer is None:
+                    raise ValueError("Transaction hash is required unless the stored-data index is enabled")
+                records = []
+                for record in indexer.index.records_for(user_id, data_type):
+                    try:
+                        record["data"] = self._resolve_data(record["data"])
+                    except Exception as e:
+                        logger.warning(f"Skipping record in {record['tx_hash']}: {e}")
+                        continue
+                    records.append(record)
+                return records
             
             try:
-                tx = self._web3.eth.get_transaction(tx_hash)
-                if tx and tx.input != '0x':
-                    try:
-                        hex_data = tx.input
-                        text_data = self._web3.to_text(hex_data)
-                        logger.info(f"Found transaction data for hash {tx_hash}")
-                        
-                        decoded_data = json.loads(text_data)
-                        inner_data = json.loads(decoded_data.get("data", "{}"))
-                        
+                stored = self._load_stored_tx(tx_hash)
+                if stored is not None:
+                    proofs = self._batch_proofs(stored)
+                    for index, entry in iter_records(stored.payload):
+                        inner_data = json.loads(entry.get("data", "{}"))
+
                         # Verificar tipo e user_id
-                        current_type = decoded_data.get("type")
+                        current_type = entry.get("type")
                         current_user = inner_data.get("user_id")
-                        
+                        if current_user is None and inner_data.get("user_id_hash") == hash_user_id(user_id):
+                            current_user = user_id
+
                         if (not data_type or current_type == data_type) and current_user == user_id:
-                            stored_data.append({
-                                "tx_hash": tx.hash.hex(),
-                                "block_number": tx.blockNumber,
-                                "timestamp": decoded_data.get("timestamp"),
+                            try:
+                                inner_data = self._resolve_data(inner_data)
+                            except Exception as e:
+                                logger.warning(f"Skipping record in {tx_hash}: {e}")
+                                continue
+                            record = {
+                                "tx_hash": stored.tx_hash,
+                                "block_number": stored.block_number,
+                                "timestamp": entry.get("timestamp"),
+                                "type": current_type,
                                 "data": inner_data
-                            })
+                            }
+                            if index is not None:
+                                record["batch_index"] = index
+                                if proofs is not None:
+                                    record["batch_root"] = stored.payload["root"]
+                                    record["batch_proof"] = proofs[index]
+                            stored_data.append(record)
                             logger.info(f"Added data from transaction {tx_hash}")
-                    except Exception as e:
-                        logger.warning(f"Error processing transaction {tx_hash}: {str(e)}")
                 else:
                     logger.warning(f"Transaction {tx_hash} not found or has no data")
-                
+
             except Exception as e:
-                logger.warning(f"Could not fetch transaction {tx_hash}: {str(e)}")
+                logger.warning(f"Could not read transaction {tx_hash}: {str(e)}")
             
             logger.info(f"Search complete. Found {len(stored_data)} transactions with data")
             return stored_data
@@ -561,16 +1079,11 @@ class SonicConnection(BaseConnection):
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        load_dotenv()
-        
-        if not self.is_configured(verbose=True):
-            raise SonicConnectionError("Sonic is not properly configured")
+        self.check_action(action_name, kwargs)
+        method = self.get_handler(action_name)
+        return method(**kwargs)
 
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
\ No newline at end of file
+    def check_action(self, action_name: str, kwargs: Dict[str, Any]) -> None:
+        if not self.is_ready():
+            raise SonicConnectionError("Sonic is not properly configured")
+        super().check_action(action_name, kwargs)
\ No newline at end of file
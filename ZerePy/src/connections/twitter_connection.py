@@ -5,7 +5,9 @@ from requests_oauthlib import OAuth1Session
 from dotenv import set_key, load_dotenv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.helpers import print_h_bar
-import json,requests
+import json
+from src.helpers.transport import http
+from src.helpers.rate_limit import RateLimitExceeded
 
 logger = logging.getLogger("connections.twitter_connection")
 
@@ -153,7 +155,7 @@ class TwitterConnection(BaseConnection):
             full_url = f"https://api.twitter.com/2/{endpoint.lstrip('/')}"
 
             if use_bearer:
-                response = requests.request(
+                response = http.request(
                     method=method.lower(),
                     url=full_url,
                     auth=self._bearer_oauth,
@@ -164,6 +166,8 @@ class TwitterConnection(BaseConnection):
                 oauth = self._get_oauth()
                 response = getattr(oauth, method.lower())(full_url, **kwargs)
 
+            self.check_rate_limit(response)
+
             if not stream and response.status_code not in [200, 201]:
                 logger.error(
                     f"Request failed: {response.status_code} - {response.text}"
@@ -179,6 +183,8 @@ class TwitterConnection(BaseConnection):
         
             return response.json()
 
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             raise TwitterAPIError(f"API request failed: {str(e)}")
 
@@ -389,8 +395,7 @@ class TwitterConnection(BaseConnection):
             kwargs["count"] = self.config["timeline_read_count"]
 
         # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
+        method = self.get_handler(action_name)
         return method(**kwargs)
 
     def read_timeline(self, count: int = None, **kwargs) -> list:
@@ -1,17 +1,3 @@
-from solders.pubkey import Pubkey  # type: ignore
-
-# Common token addresses used across the toolkit
-SPL_TOKENS = {
-    "USDC": Pubkey.from_string("EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"),
-    "USDT": Pubkey.from_string("Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB"),
-    "USDS": Pubkey.from_string("USDSwr9ApdHk5bvJKMjzff41FfuX8bSxdKcR81vTwcA"),
-    "SOL": Pubkey.from_string("So11111111111111111111111111111111111111112"),
-    "JITOSOL": Pubkey.from_string("J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn"),
-    "BSOL": Pubkey.from_string("bSo13r4TkiE4KumL71LsHTPpL2euBYLFx6h9HP3piy1"),
-    "MSOL": Pubkey.from_string("mSoLzYCxHdYgdzU16g5QSh3i5K3z3KZK7ytfqcJm7So"),
-    "BONK": Pubkey.from_string("DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263"),
-}
-
 DEFAULT_OPTIONS = {
     "SLIPPAGE_BPS": 300,  # Default slippage tolerance in basis points (300 = 3%)
     "TOKEN_DECIMALS": 9,  # Default number of decimals for new tokens
@@ -21,3 +7,30 @@ JUP_API = "https://quote-api.jup.ag/v6"
 
 LAMPORTS_PER_SOL = 1_000_000_000
 SOL_FEES = 100_000_000
+
+# Common token addresses used across the toolkit
+_SPL_TOKEN_ADDRESSES = {
+    "USDC": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+    "USDT": "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB",
+    "USDS": "USDSwr9ApdHk5bvJKMjzff41FfuX8bSxdKcR81vTwcA",
+    "SOL": "So11111111111111111111111111111111111111112",
+    "JITOSOL": "J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn",
+    "BSOL": "bSo13r4TkiE4KumL71LsHTPpL2euBYLFx6h9HP3piy1",
+    "MSOL": "mSoLzYCxHdYgdzU16g5QSh3i5K3z3KZK7ytfqcJm7So",
+    "BONK": "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263",
+}
+
+
+def __getattr__(name):
+    # SPL_TOKENS needs solders; build it on first access so that importing
+    # src.constants (e.g. via src.constants.abi) does not pull in the Solana SDK.
+    if name == "SPL_TOKENS":
+        from solders.pubkey import Pubkey  # type: ignore
+
+        tokens = {
+            ticker: Pubkey.from_string(address)
+            for ticker, address in _SPL_TOKEN_ADDRESSES.items()
+        }
+        globals()["SPL_TOKENS"] = tokens
+        return tokens
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,79 @@
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Sentinel so a cached falsy value is distinguishable from a miss
+MISS = object()
+
+
+def normalize_params(params: Dict[str, Any]) -> str:
+    """Stable string form of action kwargs, used as the default cache key"""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class ResponseCache:
+    """
+    In-memory LRU of action results with per-action TTL and size limits.
+
+    Values are deep-copied on the way in and out, so a caller that mutates
+    a result it got back cannot change what later callers are served.
+    """
+
+    def __init__(self):
+        # (connection, action) -> OrderedDict[key, (value, expires_at)]
+        self._entries: Dict[Tuple[str, str], "OrderedDict[Hashable, Tuple[Any, float]]"] = {}
+        self._stats: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, slot: Tuple[str, str], counter: str) -> None:
+        stats = self._stats.setdefault(slot, {"hits": 0, "misses": 0})
+        stats[counter] += 1
+
+    def get(self, connection_name: str, action_name: str, key: Hashable, policy) -> Any:
+        """Return the cached value or MISS"""
+        slot = (connection_name, action_name)
+        now = time.monotonic()
+        value = MISS
+        with self._lock:
+            entries = self._entries.get(slot)
+            if entries is not None and key in entries:
+                cached, expires_at = entries[key]
+                if expires_at > now:
+                    entries.move_to_end(key)
+                    value = cached
+                else:
+                    del entries[key]
+            self._count(slot, "hits" if value is not MISS else "misses")
+        # Copied outside the lock; entries are never mutated in place
+        return copy.deepcopy(value) if value is not MISS else MISS
+
+    def set(self, connection_name: str, action_name: str, key: Hashable, value: Any, policy) -> None:
+        slot = (connection_name, action_name)
+        value = copy.deepcopy(value)
+        with self._lock:
+            entries = self._entries.setdefault(slot, OrderedDict())
+            entries[key] = (value, time.monotonic() + policy.ttl)
+            entries.move_to_end(key)
+            while len(entries) > policy.max_entries:
+                entries.popitem(last=False)
+
+    def invalidate(self, connection_name: Optional[str] = None, action_name: Optional[str] = None) -> None:
+        """Drop in-memory entries, optionally limited to one connection/action"""
+        with self._lock:
+            for slot in list(self._entries):
+                if connection_name and slot[0] != connection_name:
+                    continue
+                if action_name and slot[1] != action_name:
+                    continue
+                del self._entries[slot]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters and current size per connection:action"""
+        with self._lock:
+            return {
+                f"{slot[0]}:{slot[1]}": {**counters, "size": len(self._entries.get(slot, ()))}
+                for slot, counters in self._stats.items()
+            }
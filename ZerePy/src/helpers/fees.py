@@ -0,0 +1,137 @@
+import logging
+import statistics
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger("helpers.fees")
+
+DEFAULT_REFRESH_INTERVAL = 3.0
+DEFAULT_HISTORY_BLOCKS = 5
+DEFAULT_REWARD_PERCENTILE = 50
+DEFAULT_BUCKET_SIZE = 256
+# Gas per non-zero calldata byte; headroom so one estimate covers its whole size bucket
+CALLDATA_GAS_PER_BYTE = 16
+MAX_MEMOIZED_ESTIMATES = 256
+
+
+def _calldata_size(data) -> int:
+    if not data:
+        return 0
+    if isinstance(data, str):
+        return (len(data) - 2) // 2 if data.startswith("0x") else len(data) // 2
+    return len(data)
+
+
+class FeeOracle:
+    """
+    Fee and gas data for transaction builds on one chain.
+
+    chain_id is fetched once and kept. Base and priority fees come from
+    eth_feeHistory and are refreshed at most every refresh_interval seconds;
+    chains without a base fee fall back to eth_gasPrice on the same
+    schedule. Gas estimates for fixed-shape transactions are memoized per
+    calldata size bucket.
+    """
+
+    def __init__(self, web3, refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+                 history_blocks: int = DEFAULT_HISTORY_BLOCKS,
+                 reward_percentile: float = DEFAULT_REWARD_PERCENTILE,
+                 bucket_size: int = DEFAULT_BUCKET_SIZE):
+        self._web3 = web3
+        self.refresh_interval = refresh_interval
+        self.history_blocks = history_blocks
+        self.reward_percentile = reward_percentile
+        self.bucket_size = bucket_size
+        self._chain_id: Optional[int] = None
+        self._fees: Optional[Dict[str, int]] = None
+        self._fees_at = 0.0
+        # Set once the node reports no base fee; a failed eth_feeHistory call does not set it
+        self._legacy = False
+        self._estimates: "OrderedDict[Tuple[Hashable, int], int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def chain_id(self) -> int:
+        if self._chain_id is None:
+            self._chain_id = self._web3.eth.chain_id
+        return self._chain_id
+
+    def _fetch_fees(self) -> Dict[str, int]:
+        if not self._legacy:
+            try:
+                history = self._web3.eth.fee_history(self.history_blocks, "latest", [self.reward_percentile])
+            except Exception as e:
+                # Possibly transient: use eth_gasPrice for this refresh only
+                logger.info(f"eth_feeHistory failed, using eth_gasPrice for now: {e}")
+                return {"gasPrice": int(self._web3.eth.gas_price)}
+            # The last entry is the base fee of the next block
+            base_fees = history.get("baseFeePerGas") or []
+            base_fee = int(base_fees[-1]) if base_fees else 0
+            if base_fee:
+                rewards = [int(block[0]) for block in history.get("reward") or [] if block]
+                tip = int(statistics.median(rewards)) if rewards else 0
+                return {
+                    # Room for the base fee to double before the transaction stops being includable
+                    "maxFeePerGas": 2 * base_fee + tip,
+                    "maxPriorityFeePerGas": tip,
+                }
+            logger.info("Chain reports no base fee, using eth_gasPrice")
+            self._legacy = True
+        return {"gasPrice": int(self._web3.eth.gas_price)}
+
+    def fee_params(self) -> Dict[str, int]:
+        """Fee fields for a transaction dict: EIP-1559 fields when the chain has a base fee, else gasPrice"""
+        with self._lock:
+            if self._fees is None or time.monotonic() - self._fees_at >= self.refresh_interval:
+                self._fees = self._fetch_fees()
+                self._fees_at = time.monotonic()
+            return dict(self._fees)
+
+    def estimate_gas(self, tx: Dict[str, Any], shape: Hashable) -> int:
+        """
+        Gas limit for a transaction of a fixed shape (same target and code
+        path, only calldata length varies), estimated once per size bucket
+
+        Raises:
+            Whatever eth_estimateGas raises on a cache miss
+        """
+        bucket = _calldata_size(tx.get("data")) // self.bucket_size
+        key = (shape, bucket)
+        with self._lock:
+            if key in self._estimates:
+                self._estimates.move_to_end(key)
+                return self._estimates[key]
+
+        estimate = self._web3.eth.estimate_gas(tx) + CALLDATA_GAS_PER_BYTE * self.bucket_size
+        with self._lock:
+            self._estimates[key] = estimate
+            while len(self._estimates) > MAX_MEMOIZED_ESTIMATES:
+                self._estimates.popitem(last=False)
+        return estimate
+
+
+_oracles: Dict[str, FeeOracle] = {}
+_oracles_lock = threading.Lock()
+
+
+def get_fee_oracle(rpc_url: str, web3, config: Optional[Dict[str, Any]] = None) -> FeeOracle:
+    """
+    Shared oracle per RPC endpoint. config is the connection's "fees" block,
+    e.g. {"refresh_interval": 3, "reward_percentile": 50}, and only applies
+    when the oracle is first created.
+    """
+    config = config or {}
+    with _oracles_lock:
+        oracle = _oracles.get(rpc_url)
+        if oracle is None:
+            oracle = FeeOracle(
+                web3,
+                refresh_interval=config.get("refresh_interval", DEFAULT_REFRESH_INTERVAL),
+                history_blocks=config.get("history_blocks", DEFAULT_HISTORY_BLOCKS),
+                reward_percentile=config.get("reward_percentile", DEFAULT_REWARD_PERCENTILE),
+                bucket_size=config.get("bucket_size", DEFAULT_BUCKET_SIZE)
+            )
+            _oracles[rpc_url] = oracle
+        return oracle
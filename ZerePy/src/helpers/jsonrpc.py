@@ -0,0 +1,102 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+from src.helpers.transport import http
+
+logger = logging.getLogger("helpers.jsonrpc")
+
+
+class JsonRpcError(Exception):
+    """Raised when a JSON-RPC call returns an error object"""
+
+    def __init__(self, method: str, error: Any):
+        message = error.get("message") if isinstance(error, dict) else error
+        super().__init__(f"{method} failed: {message}")
+        self.method = method
+        self.error = error
+
+
+class JsonRpcBatchClient:
+    """
+    Minimal JSON-RPC client that sends many calls in one HTTP POST over the
+    pooled transport, for bulk reads web3's one-call-per-request provider
+    makes slow (block backfills, receipt polling). Given an RPCPool, each
+    batch goes to the pool's best read endpoint and fails over like web3 reads.
+    """
+
+    def __init__(self, rpc_url: str, max_batch_size: int = 100, pool=None):
+        self.rpc_url = rpc_url
+        self.max_batch_size = max_batch_size
+        self.pool = pool
+        self._ids = itertools.count(1)
+        self._id_lock = threading.Lock()
+
+    def _next_id(self) -> int:
+        with self._id_lock:
+            return next(self._ids)
+
+    def call(self, method: str, params: Sequence[Any] = ()) -> Any:
+        return self.batch([(method, params)])[0]
+
+    def batch(self, calls: Sequence[Tuple[str, Sequence[Any]]], raise_errors: bool = True) -> List[Any]:
+        """
+        Run calls as JSON-RPC batches of up to max_batch_size each
+
+        Returns:
+            Results in call order. With raise_errors=False, failed calls yield a
+            JsonRpcError instance instead of raising.
+        """
+        results: List[Any] = []
+        for offset in range(0, len(calls), self.max_batch_size):
+            results.extend(self._send(calls[offset:offset + self.max_batch_size], raise_errors))
+        return results
+
+    def _post(self, requests: List[dict]) -> Any:
+        if self.pool is None:
+            response = http.post(self.rpc_url, json=requests)
+            response.raise_for_status()
+            return response.json()
+
+        last_error: Optional[Exception] = None
+        for endpoint in self.pool.read_order():
+            started = time.monotonic()
+            try:
+                response = http.post(endpoint.url, json=requests)
+                response.raise_for_status()
+                payload = response.json()
+            except Exception as e:
+                endpoint.record(time.monotonic() - started, ok=False, error=e)
+                logger.warning(f"JSON-RPC batch failed on {endpoint.url}: {e}")
+                last_error = e
+                continue
+            endpoint.record(time.monotonic() - started, ok=True)
+            return payload
+        if last_error is None:
+            raise ConnectionError("No RPC endpoints to send the JSON-RPC batch to")
+        raise last_error
+
+    def _send(self, calls: Sequence[Tuple[str, Sequence[Any]]], raise_errors: bool) -> List[Any]:
+        requests = []
+        for method, params in calls:
+            requests.append({"jsonrpc": "2.0", "id": self._next_id(), "method": method, "params": list(params)})
+
+        payload = self._post(requests)
+        if isinstance(payload, dict):
+            # Some nodes answer a rejected batch with a single error object
+            raise JsonRpcError("batch", payload.get("error", payload))
+
+        by_id = {item.get("id"): item for item in payload}
+        results = []
+        for request in requests:
+            item = by_id.get(request["id"])
+            if item is None or "error" in item:
+                error = JsonRpcError(request["method"], item.get("error") if item else "missing response")
+                if raise_errors:
+                    raise error
+                results.append(error)
+            else:
+                results.append(item.get("result"))
+        return results
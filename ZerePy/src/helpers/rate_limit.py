@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger("helpers.rate_limit")
+
+# Pace requests from headers once the upstream quota drops below this share of
+# the window's limit, or below LOW_QUOTA_REMAINING when the limit is not reported
+LOW_QUOTA_FRACTION = 0.2
+LOW_QUOTA_REMAINING = 10
+
+
+class RateLimitExceeded(Exception):
+    """Raised by a connection when the upstream answered 429, so the caller can re-queue"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse "12", "1.5", "850ms", "6m0s" or "1h2m3s" into seconds"""
+    value = value.strip().lower()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    if value.endswith("ms"):
+        try:
+            return float(value[:-2]) / 1000
+        except ValueError:
+            return None
+
+    total, number = 0.0, ""
+    for char in value:
+        if char.isdigit() or char == ".":
+            number += char
+        elif char in "hms" and number:
+            total += float(number) * {"h": 3600, "m": 60, "s": 1}[char]
+            number = ""
+        else:
+            return None
+    return total if not number else None
+
+
+def _retry_after_seconds(value: str) -> Optional[float]:
+    seconds = _parse_duration(value)
+    if seconds is not None:
+        return seconds
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of blocking: each call
+    takes a token (the balance may go negative) and gets back how long it has
+    to wait, which gives FIFO queueing when the bucket is drained.
+
+    rate=None means unlimited, but the bucket can still be paused by
+    Retry-After style feedback from the upstream.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate or 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # Rate learned from x-rate-limit headers, applied until learned_until
+        self._learned_rate: Optional[float] = None
+        self._learned_until = 0.0
+        self._lock = threading.Lock()
+
+    def _effective_rate(self, now: float) -> Optional[float]:
+        if self._learned_rate is not None and now < self._learned_until:
+            if self.rate is None:
+                return self._learned_rate
+            return min(self.rate, self._learned_rate)
+        return self.rate
+
+    def reserve(self) -> float:
+        """Take a token and return the delay in seconds before the caller may proceed"""
+        with self._lock:
+            now = time.monotonic()
+            pause = max(0.0, self._paused_until - now)
+            rate = self._effective_rate(now)
+            if rate is None:
+                return pause
+
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / rate
+            return max(wait, pause)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out immediate tokens for the given number of seconds"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def learn(self, remaining: int, reset_in: float) -> None:
+        """Spread the remaining upstream quota over the time left in the window"""
+        if reset_in <= 0:
+            return
+        if remaining <= 0:
+            self.pause(reset_in)
+            return
+        with self._lock:
+            self._learned_rate = remaining / reset_in
+            self._learned_until = time.monotonic() + reset_in
+
+
+class RateLimiter:
+    """
+    Per-connection limiter: a connection-wide bucket plus optional per-action
+    buckets, configured from the "rate_limit" block of the agent config:
+
+        "rate_limit": {
+            "rate": 5, "burst": 10,
+            "endpoints": {"post-tweet": {"rate": 0.02, "burst": 1}}
+        }
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None,
+                 endpoints: Optional[Dict[str, Dict[str, float]]] = None):
+        self.default = TokenBucket(rate, burst)
+        self.endpoints = {
+            name: TokenBucket(limits.get("rate"), limits.get("burst"))
+            for name, limits in (endpoints or {}).items()
+        }
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "RateLimiter":
+        config = config or {}
+        return cls(config.get("rate"), config.get("burst"), config.get("endpoints"))
+
+    def reserve(self, endpoint: Optional[str] = None) -> float:
+        delay = self.default.reserve()
+        bucket = self.endpoints.get(endpoint)
+        if bucket is not None:
+            delay = max(delay, bucket.reserve())
+        return delay
+
+    def acquire(self, endpoint: Optional[str] = None) -> None:
+        """Blocking acquire for sync callers"""
+        delay = self.reserve(endpoint)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self, endpoint: Optional[str] = None) -> None:
+        """Wait for a slot without holding a worker thread"""
+        delay = self.reserve(endpoint)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def penalize(self, retry_after: Optional[float], endpoint: Optional[str] = None) -> None:
+        """Back off after a 429; defaults to a short pause when no Retry-After was given"""
+        seconds = retry_after if retry_after is not None else 1.0
+        bucket = self.endpoints.get(endpoint, self.default)
+        bucket.pause(seconds)
+        logger.warning(f"Rate limited{f' on {endpoint}' if endpoint else ''}, pausing {seconds:.1f}s")
+
+    def update_from_headers(self, headers: Mapping[str, str], endpoint: Optional[str] = None) -> Optional[float]:
+        """
+        Learn limits from an HTTP response's headers.
+
+        Understands Retry-After, Twitter's x-rate-limit-*, Discord's
+        x-ratelimit-*-after and OpenAI-style x-ratelimit-*-requests.
+
+        Returns:
+            The Retry-After delay in seconds, if the response carried one
+        """
+        lowered = {k.lower(): v for k, v in headers.items()}
+        bucket = self.endpoints.get(endpoint, self.default)
+
+        retry_after = None
+        if "retry-after" in lowered:
+            retry_after = _retry_after_seconds(lowered["retry-after"])
+            if retry_after is not None:
+                bucket.pause(retry_after)
+
+        remaining = (
+            lowered.get("x-rate-limit-remaining")
+            or lowered.get("x-ratelimit-remaining")
+            or lowered.get("x-ratelimit-remaining-requests")
+        )
+        reset_in = None
+        if "x-ratelimit-reset-after" in lowered:
+            reset_in = _parse_duration(lowered["x-ratelimit-reset-after"])
+        elif "x-ratelimit-reset-requests" in lowered:
+            reset_in = _parse_duration(lowered["x-ratelimit-reset-requests"])
+        elif "x-rate-limit-reset" in lowered:
+            try:
+                reset_in = float(lowered["x-rate-limit-reset"]) - time.time()
+            except ValueError:
+                reset_in = None
+
+        if remaining is not None and reset_in is not None:
+            try:
+                remaining = int(float(remaining))
+            except ValueError:
+                return retry_after
+            limit = (
+                lowered.get("x-rate-limit-limit")
+                or lowered.get("x-ratelimit-limit")
+                or lowered.get("x-ratelimit-limit-requests")
+            )
+            try:
+                low_watermark = float(limit) * LOW_QUOTA_FRACTION if limit else LOW_QUOTA_REMAINING
+            except ValueError:
+                low_watermark = LOW_QUOTA_REMAINING
+            # Only start pacing once the window is nearly used up, so bursts stay fast
+            if remaining <= low_watermark:
+                bucket.learn(remaining, reset_in)
+
+        return retry_after
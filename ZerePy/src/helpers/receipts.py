@@ -0,0 +1,229 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.helpers.jsonrpc import JsonRpcBatchClient
+
+logger = logging.getLogger("helpers.receipts")
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_TIMEOUT = 120.0
+# Finished transactions kept around for status lookups
+DEFAULT_HISTORY = 4096
+
+PENDING = "pending"
+CONFIRMED = "confirmed"
+FAILED = "failed"
+TIMED_OUT = "timeout"
+# No receipt for a hash this process is not tracking: pending, dropped or never sent
+UNKNOWN = "unknown"
+
+_QUANTITY_FIELDS = ("status", "blockNumber", "gasUsed", "cumulativeGasUsed",
+                    "effectiveGasPrice", "transactionIndex", "type")
+
+
+class ReceiptTimeout(Exception):
+    """Raised when a tracked transaction has no receipt within the timeout"""
+
+    def __init__(self, tx_hash: str, timeout: float):
+        super().__init__(f"Transaction {tx_hash} has no receipt after {timeout:.0f}s")
+        self.tx_hash = tx_hash
+
+
+def _normalize_hash(tx_hash) -> str:
+    if not isinstance(tx_hash, str):
+        tx_hash = bytes(tx_hash).hex()
+    tx_hash = tx_hash.lower()
+    return tx_hash if tx_hash.startswith("0x") else "0x" + tx_hash
+
+
+def _normalize_receipt(receipt: Dict[str, Any]) -> Dict[str, Any]:
+    """Raw JSON-RPC receipt with hex quantities turned into ints"""
+    normalized = dict(receipt)
+    for key in _QUANTITY_FIELDS:
+        if isinstance(normalized.get(key), str):
+            normalized[key] = int(normalized[key], 16)
+    return normalized
+
+
+@dataclass
+class TxStatus:
+    tx_hash: str
+    state: str = PENDING
+    submitted_at: Optional[float] = field(default_factory=time.time)
+    block_number: Optional[int] = None
+    gas_used: Optional[int] = None
+    confirmed_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tx_hash": self.tx_hash,
+            "state": self.state,
+            "submitted_at": self.submitted_at,
+            "block_number": self.block_number,
+            "gas_used": self.gas_used,
+            "confirmed_at": self.confirmed_at,
+        }
+
+
+def _apply_receipt(status: TxStatus, receipt: Dict[str, Any], now: float) -> None:
+    status.state = CONFIRMED if receipt.get("status") == 1 else FAILED
+    status.block_number = receipt.get("blockNumber")
+    status.gas_used = receipt.get("gasUsed")
+    status.confirmed_at = now
+
+
+class ReceiptTracker:
+    """
+    Waits for transaction receipts on a single background thread.
+
+    Every poll_interval (about one block) all pending hashes are checked
+    with one batched eth_getTransactionReceipt request. track() returns a
+    Future that resolves to the receipt (failed transactions included,
+    check receipt["status"]) or fails with ReceiptTimeout.
+    """
+
+    def __init__(self, rpc: JsonRpcBatchClient, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 timeout: float = DEFAULT_TIMEOUT, history: int = DEFAULT_HISTORY):
+        self.rpc = rpc
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.history = history
+        self._pending: Dict[str, Tuple[TxStatus, Future]] = {}
+        self._finished: "OrderedDict[str, Tuple[TxStatus, Future]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, tx_hash, callback: Optional[Callable[[TxStatus], None]] = None) -> Future:
+        """
+        Start watching tx_hash (a no-op if it already is)
+
+        callback, if given, is called with the final TxStatus on the poller
+        thread once the transaction is confirmed, failed or timed out.
+        """
+        tx_hash = _normalize_hash(tx_hash)
+        with self._lock:
+            entry = self._pending.get(tx_hash) or self._finished.get(tx_hash)
+            if entry is None:
+                entry = (TxStatus(tx_hash), Future())
+                self._pending[tx_hash] = entry
+                self._ensure_thread()
+            self._wakeup.set()
+
+        status, future = entry
+        if callback is not None:
+            future.add_done_callback(lambda _: callback(status))
+        return future
+
+    def wait(self, tx_hash, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Block until the receipt is available and return it"""
+        return self.track(tx_hash).result(timeout=timeout)
+
+    def status(self, tx_hash) -> Optional[TxStatus]:
+        tx_hash = _normalize_hash(tx_hash)
+        with self._lock:
+            entry = self._pending.get(tx_hash) or self._finished.get(tx_hash)
+        return entry[0] if entry else None
+
+    def fetch_status(self, tx_hash) -> TxStatus:
+        """
+        Status of a transaction this tracker is not watching, from a single
+        receipt lookup. The hash is not tracked, so status queries for
+        arbitrary hashes never grow the pending set.
+        """
+        tx_hash = _normalize_hash(tx_hash)
+        status = TxStatus(tx_hash, state=UNKNOWN, submitted_at=None)
+        result = self.rpc.call("eth_getTransactionReceipt", [tx_hash])
+        if result is not None:
+            _apply_receipt(status, _normalize_receipt(result), time.time())
+        return status
+
+    def _ensure_thread(self) -> None:
+        """Start the poller; caller holds the lock"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="receipt-tracker", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            try:
+                self.poll()
+            except Exception as e:
+                logger.warning(f"Receipt poll failed: {e}")
+            with self._lock:
+                if not self._pending:
+                    self._wakeup.clear()
+            time.sleep(self.poll_interval)
+
+    def poll(self) -> int:
+        """
+        Check every pending transaction once
+
+        Returns:
+            Number of transactions that finished
+        """
+        with self._lock:
+            hashes = list(self._pending)
+        if not hashes:
+            return 0
+
+        results = self.rpc.batch(
+            [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in hashes], raise_errors=False
+        )
+        now = time.time()
+        finished = []
+        for tx_hash, result in zip(hashes, results):
+            if isinstance(result, Exception):
+                logger.debug(f"Receipt lookup for {tx_hash} failed: {result}")
+                continue
+            status, _ = self._pending[tx_hash]
+            if result is not None:
+                receipt = _normalize_receipt(result)
+                _apply_receipt(status, receipt, now)
+                finished.append((tx_hash, receipt, None))
+            elif now - status.submitted_at > self.timeout:
+                status.state = TIMED_OUT
+                finished.append((tx_hash, None, ReceiptTimeout(tx_hash, self.timeout)))
+
+        for tx_hash, receipt, error in finished:
+            with self._lock:
+                entry = self._pending.pop(tx_hash)
+                self._finished[tx_hash] = entry
+                while len(self._finished) > self.history:
+                    self._finished.popitem(last=False)
+            if error is not None:
+                entry[1].set_exception(error)
+            else:
+                entry[1].set_result(receipt)
+        return len(finished)
+
+
+_trackers: Dict[str, ReceiptTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_receipt_tracker(rpc_url: str, config: Optional[Dict[str, Any]] = None, pool=None) -> ReceiptTracker:
+    """
+    Shared tracker per RPC endpoint, so all connections on a chain poll together.
+    config is the connection's "receipts" block, e.g. {"poll_interval": 1, "timeout": 120},
+    and only applies when the tracker is first created. pool, an RPCPool
+    for the chain, spreads polling over its endpoints.
+    """
+    config = config or {}
+    with _trackers_lock:
+        tracker = _trackers.get(rpc_url)
+        if tracker is None:
+            tracker = ReceiptTracker(
+                JsonRpcBatchClient(rpc_url, pool=pool),
+                poll_interval=config.get("poll_interval", DEFAULT_POLL_INTERVAL),
+                timeout=config.get("timeout", DEFAULT_TIMEOUT)
+            )
+            _trackers[rpc_url] = tracker
+        return tracker
+
@@ -0,0 +1,306 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+from src.helpers.rate_limit import RateLimitExceeded
+
+logger = logging.getLogger("helpers.resilience")
+
+# Caller mistakes: retrying them cannot help and they say nothing about upstream health
+NON_RETRYABLE: Tuple[Type[BaseException], ...] = (ValueError, KeyError, TypeError, NotImplementedError)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} is unavailable (circuit open, retry in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Exponential backoff with equal jitter: attempt n waits between half and
+    all of min(max_delay, base_delay * multiplier ** n).
+
+    max_attempts: total attempts, including the first one
+    timeout: per-attempt timeout for async calls, None for no limit
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    timeout: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "RetryPolicy":
+        fields = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in (config or {}).items() if k in fields})
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @staticmethod
+    def is_retryable(error: BaseException) -> bool:
+        return not isinstance(error, NON_RETRYABLE + (RateLimitExceeded, CircuitOpenError))
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of recent calls so a struggling upstream is not
+    hit with a multiple of its normal load: within the sliding window, retries
+    may not exceed ratio * calls + min_retries.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 3, window: float = 10.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._calls: deque = deque()
+        self._retries: deque = deque()
+        self._lock = threading.Lock()
+
+    def _trim(self, now: float) -> None:
+        for events in (self._calls, self._retries):
+            while events and now - events[0] > self.window:
+                events.popleft()
+
+    def record_call(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            self._calls.append(now)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget, False if it is exhausted"""
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            if len(self._retries) >= self.ratio * len(self._calls) + self.min_retries:
+                return False
+            self._retries.append(now)
+            return True
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open breaker. After failure_threshold
+    consecutive failures the circuit opens and calls fail fast for
+    reset_timeout seconds; then a single probe call is let through and its
+    outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def retry_in(self) -> float:
+        """Seconds until the breaker will let a probe through, 0 if it already would"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now; claims the probe slot when half-open"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def check(self) -> None:
+        """Raise CircuitOpenError unless a call may proceed"""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_in())
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """
+        Give back the probe slot of a call that ended without a verdict
+        (cancelled or interrupted), so the next call can probe instead
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if error is not None:
+                self._last_error = str(error)
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Circuit for {self.name} opened after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self._failures,
+            "retry_in": round(self.retry_in(), 1) if state == self.OPEN else 0.0,
+            "last_error": self._last_error,
+        }
+
+
+class ResiliencePolicy:
+    """
+    Retry policy, retry budget and circuit breaker for one upstream, built from
+    the optional "retry" and "circuit_breaker" blocks of a connection config:
+
+        "retry": {"max_attempts": 3, "base_delay": 0.5, "timeout": 60},
+        "circuit_breaker": {"failure_threshold": 5, "reset_timeout": 30}
+    """
+
+    def __init__(self, name: str, retry: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None, budget: Optional[RetryBudget] = None):
+        self.name = name
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker(name)
+        self.budget = budget or RetryBudget()
+
+    @classmethod
+    def from_config(cls, name: str, config: Optional[Dict[str, Any]]) -> "ResiliencePolicy":
+        config = config or {}
+        breaker_config = config.get("circuit_breaker") or {}
+        return cls(
+            name,
+            retry=RetryPolicy.from_config(config.get("retry")),
+            breaker=CircuitBreaker(
+                name,
+                failure_threshold=breaker_config.get("failure_threshold", 5),
+                reset_timeout=breaker_config.get("reset_timeout", 30.0)
+            )
+        )
+
+    def _record_error(self, error: BaseException) -> bool:
+        """Update the breaker for a failed attempt and return whether to retry"""
+        if not RetryPolicy.is_retryable(error):
+            # A caller error still proves the upstream answered
+            if not isinstance(error, (RateLimitExceeded, CircuitOpenError)):
+                self.breaker.record_success()
+            return False
+        self.breaker.record_failure(error)
+        return True
+
+    def _should_retry(self, attempt: int, attempts: int) -> bool:
+        if attempt + 1 >= attempts or self.breaker.state == CircuitBreaker.OPEN:
+            return False
+        if not self.budget.try_spend():
+            logger.warning(f"Retry budget for {self.name} exhausted")
+            return False
+        return True
+
+    def call(self, fn: Callable[[], Any], retry: bool = True) -> Any:
+        """
+        Run fn behind the breaker, retrying retryable failures with backoff
+
+        Args:
+            fn: Zero-argument callable doing the upstream call
+            retry: False for non-idempotent calls, which get breaker
+                protection but only a single attempt
+        """
+        attempts = self.retry.max_attempts if retry else 1
+        self.budget.record_call()
+        for attempt in range(attempts):
+            self.breaker.check()
+            try:
+                result = fn()
+            except Exception as e:
+                if not self._record_error(e) or not self._should_retry(attempt, attempts):
+                    raise
+                delay = self.retry.backoff(attempt)
+                logger.warning(f"{self.name} attempt {attempt + 1} failed: {e}; retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    async def acall(self, coro_fn: Callable[[], Awaitable[Any]], retry: bool = True) -> Any:
+        """Async call(); each attempt is bounded by retry.timeout when set"""
+        attempts = self.retry.max_attempts if retry else 1
+        self.budget.record_call()
+        for attempt in range(attempts):
+            self.breaker.check()
+            try:
+                if self.retry.timeout is not None:
+                    result = await asyncio.wait_for(coro_fn(), timeout=self.retry.timeout)
+                else:
+                    result = await coro_fn()
+            except Exception as e:
+                if not self._record_error(e) or not self._should_retry(attempt, attempts):
+                    raise
+                delay = self.retry.backoff(attempt)
+                logger.warning(f"{self.name} attempt {attempt + 1} failed: {e}; retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # CancelledError: the call never finished, so it says nothing about the upstream
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    async def astream(self, stream_fn: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Pass an async stream through behind the breaker. Streams get a single
+        attempt: chunks already handed to the caller cannot be taken back.
+        """
+        self.budget.record_call()
+        self.breaker.check()
+        try:
+            async for chunk in stream_fn():
+                yield chunk
+        except Exception as e:
+            self._record_error(e)
+            raise
+        except BaseException:
+            # Cancelled, or the caller stopped reading early
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
@@ -0,0 +1,201 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from web3 import Web3
+from web3.providers import HTTPProvider
+from web3.providers.base import JSONBaseProvider
+
+from src.helpers.resilience import CircuitBreaker
+
+logger = logging.getLogger("helpers.rpc_pool")
+
+# Methods that must go to the same node: sends, and the pending nonce they are built on
+WRITE_METHODS = frozenset({
+    "eth_sendRawTransaction",
+    "eth_sendTransaction",
+    "eth_getTransactionCount",
+})
+
+# Smoothing factor for the latency and error-rate moving averages
+EWMA_ALPHA = 0.2
+# An endpoint without a sample for this long gets the next read, so its latency stays current
+PROBE_INTERVAL = 30.0
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RESET_TIMEOUT = 30.0
+
+
+def network_rpc_urls(network_config: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    RPC endpoints for a network, primary first: the connection's "rpc_urls"
+    or "rpc" override if set, else the network's rpc_urls / rpc_url
+    """
+    config = config or {}
+    if config.get("rpc_urls"):
+        return list(config["rpc_urls"])
+    if config.get("rpc"):
+        return [config["rpc"]]
+    if network_config.get("rpc_urls"):
+        return list(network_config["rpc_urls"])
+    return [network_config["rpc_url"]] if network_config.get("rpc_url") else []
+
+
+class RPCEndpoint:
+    """Health and latency bookkeeping for one RPC URL"""
+
+    def __init__(self, url: str, failure_threshold: int, reset_timeout: float):
+        self.url = url
+        self.breaker = CircuitBreaker(url, failure_threshold, reset_timeout)
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.last_sample = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, latency: float, ok: bool, error: Optional[BaseException] = None) -> None:
+        self.requests += 1
+        self.last_sample = time.monotonic()
+        self.error_rate = (1 - EWMA_ALPHA) * self.error_rate + EWMA_ALPHA * (0.0 if ok else 1.0)
+        if ok:
+            self.latency = latency if self.latency is None else (1 - EWMA_ALPHA) * self.latency + EWMA_ALPHA * latency
+            self.breaker.record_success()
+        else:
+            self.errors += 1
+            self.breaker.record_failure(error)
+
+    @property
+    def score(self) -> float:
+        """Expected cost of a read; lower is better"""
+        latency = self.latency if self.latency is not None else 0.0
+        return latency / max(0.05, 1.0 - self.error_rate)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "state": self.breaker.state,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+class RPCPool:
+    """
+    Several RPC endpoints for one chain.
+
+    Reads go to the healthy endpoint with the best latency / error-rate
+    score, failing over to the next one on transport errors. Writes are
+    pinned to one endpoint, so nonces and sends see the same mempool, and
+    the pin only moves when that endpoint fails. Each endpoint has a
+    circuit breaker, so a dead node is skipped until its reset timeout.
+    """
+
+    def __init__(self, urls: Sequence[str], failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        if not urls:
+            raise ValueError("RPCPool needs at least one URL")
+        self.endpoints = [RPCEndpoint(url, failure_threshold, reset_timeout) for url in dict.fromkeys(urls)]
+        self._write_index = 0
+        self._lock = threading.Lock()
+
+    @property
+    def primary_url(self) -> str:
+        return self.endpoints[0].url
+
+    @classmethod
+    def from_config(cls, urls: Sequence[str], config: Optional[Dict[str, Any]] = None) -> "RPCPool":
+        """Build from a connection's "rpc_pool" block, e.g. {"failure_threshold": 3, "reset_timeout": 30}"""
+        config = config or {}
+        return cls(
+            urls,
+            failure_threshold=config.get("failure_threshold", DEFAULT_FAILURE_THRESHOLD),
+            reset_timeout=config.get("reset_timeout", DEFAULT_RESET_TIMEOUT)
+        )
+
+    def _usable(self) -> List[RPCEndpoint]:
+        usable = [endpoint for endpoint in self.endpoints if endpoint.breaker.state != CircuitBreaker.OPEN]
+        # With every breaker open, still try them all rather than failing outright
+        return usable or list(self.endpoints)
+
+    def read_order(self) -> List[RPCEndpoint]:
+        """Endpoints in the order reads should try them"""
+        now = time.monotonic()
+        usable = self._usable()
+        stale = [e for e in usable if now - e.last_sample >= PROBE_INTERVAL]
+        fresh = sorted((e for e in usable if now - e.last_sample < PROBE_INTERVAL), key=lambda e: e.score)
+        return stale[:1] + fresh + stale[1:]
+
+    def write_order(self) -> List[RPCEndpoint]:
+        """The pinned write endpoint first, then the others in configured order"""
+        with self._lock:
+            pinned = self.endpoints[self._write_index]
+        usable = self._usable()
+        rest = [e for e in usable if e is not pinned]
+        return ([pinned] if pinned in usable else []) + rest
+
+    def pin_writes(self, endpoint: RPCEndpoint) -> None:
+        with self._lock:
+            index = self.endpoints.index(endpoint)
+            if index != self._write_index:
+                logger.warning(f"Moving RPC writes from {self.endpoints[self._write_index].url} to {endpoint.url}")
+                self._write_index = index
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            write_url = self.endpoints[self._write_index].url
+        return {"write_endpoint": write_url, "endpoints": [e.snapshot() for e in self.endpoints]}
+
+
+class PooledHTTPProvider(JSONBaseProvider):
+    """web3 provider that routes each request through an RPCPool"""
+
+    def __init__(self, pool: RPCPool, request_kwargs: Optional[Dict[str, Any]] = None):
+        super().__init__()
+        self.pool = pool
+        self._providers = {
+            endpoint.url: HTTPProvider(endpoint.url, request_kwargs=request_kwargs)
+            for endpoint in pool.endpoints
+        }
+
+    def make_request(self, method, params: Any):
+        is_write = method in WRITE_METHODS
+        candidates = self.pool.write_order() if is_write else self.pool.read_order()
+        last_error: Optional[BaseException] = None
+
+        for attempt, endpoint in enumerate(candidates):
+            started = time.monotonic()
+            try:
+                response = self._providers[endpoint.url].make_request(method, params)
+            except Exception as e:
+                # Transport-level failure (connection, timeout, HTTP status); JSON-RPC errors come back as responses
+                endpoint.record(time.monotonic() - started, ok=False, error=e)
+                logger.warning(f"RPC {method} failed on {endpoint.url}: {e}")
+                last_error = e
+                continue
+
+            endpoint.record(time.monotonic() - started, ok=True)
+            if is_write:
+                self.pool.pin_writes(endpoint)
+            if attempt and method == "eth_sendRawTransaction" and _is_already_known(response):
+                # An earlier endpoint accepted it before failing; the resend is the same signed transaction
+                return {"jsonrpc": "2.0", "id": response.get("id"), "result": Web3.to_hex(Web3.keccak(hexstr=params[0]))}
+            return response
+
+        raise last_error
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            response = self.make_request("web3_clientVersion", [])
+        except Exception:
+            if show_traceback:
+                raise
+            return False
+        return "error" not in response
+
+
+def _is_already_known(response: Dict[str, Any]) -> bool:
+    error = response.get("error")
+    message = (error.get("message") if isinstance(error, dict) else str(error or "")).lower()
+    return "already known" in message or "already imported" in message
@@ -0,0 +1,302 @@
+import contextlib
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger("helpers.shared_state")
+
+# Store URL read by every process: "memory", "sqlite:///path/to/file.sqlite" or "redis://host:6379/0"
+STATE_STORE_ENV = "ZEREPY_STATE_STORE"
+DEFAULT_SQLITE_PATH = Path.home() / ".zerepy" / "server_state.sqlite"
+DEFAULT_LOCK_TIMEOUT = 30.0
+REDIS_KEY_PREFIX = "zerepy:"
+
+
+class SharedStoreError(Exception):
+    """Raised when the shared state store is misconfigured or a lock cannot be taken"""
+    pass
+
+
+class SharedStore(ABC):
+    """
+    Key-value state shared by every worker process of a deployment.
+
+    Values are JSON documents. add() is an atomic set-if-absent, update()
+    an atomic read-modify-write, and lock() a cross-process mutex, which
+    is enough to keep nonce lanes, jobs, idempotency records and feedback
+    aggregates consistent between workers.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+
+    @abstractmethod
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Set key only if it is absent (or expired); True if it was set"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def lock(self, name: str, timeout: float = DEFAULT_LOCK_TIMEOUT) -> contextlib.AbstractContextManager:
+        pass
+
+    def update(self, key: str, fn: Callable[[Any], Any], ttl: Optional[float] = None) -> Any:
+        """Replace key's value (None if absent) with fn(value) atomically and return it"""
+        with self.lock(f"update:{key}"):
+            value = fn(self.get(key))
+            self.set(key, value, ttl)
+            return value
+
+
+class MemoryStore(SharedStore):
+    """Process-local store, for single-worker servers"""
+
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+        self._lock = threading.RLock()
+        self._named_locks: Dict[str, threading.Lock] = {}
+
+    def _live(self, key: str) -> Optional[tuple]:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._live(key)
+            return copy.deepcopy(entry[0]) if entry else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (copy.deepcopy(value), time.time() + ttl if ttl else None)
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            self.set(key, value, ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    @contextlib.contextmanager
+    def lock(self, name: str, timeout: float = DEFAULT_LOCK_TIMEOUT) -> Iterator[None]:
+        with self._lock:
+            named = self._named_locks.setdefault(name, threading.Lock())
+        if not named.acquire(timeout=timeout):
+            raise SharedStoreError(f"Timed out waiting for lock '{name}'")
+        try:
+            yield
+        finally:
+            named.release()
+
+    def update(self, key: str, fn: Callable[[Any], Any], ttl: Optional[float] = None) -> Any:
+        with self._lock:
+            value = fn(self.get(key))
+            self.set(key, value, ttl)
+            return value
+
+
+class SQLiteStore(SharedStore):
+    """
+    Store in one SQLite file (WAL mode) for workers on the same host;
+    lock() takes an exclusive file lock next to it
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_dir = self.path.parent / f"{self.path.name}.locks"
+        self._lock_dir.mkdir(exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode: multi-statement operations open BEGIN IMMEDIATE themselves
+        self._conn = sqlite3.connect(str(self.path), timeout=DEFAULT_LOCK_TIMEOUT,
+                                     isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS shared_state ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _read(conn: sqlite3.Connection, key: str) -> Any:
+        row = conn.execute(
+            "SELECT value FROM shared_state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, key: str, value: Any, ttl: Optional[float]) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time() + ttl if ttl else None)
+        )
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            return self._read(self._conn, key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._write(self._conn, key, value, ttl)
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        with self._transaction() as conn:
+            if self._read(conn, key) is not None:
+                return False
+            self._write(conn, key, value, ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM shared_state WHERE key = ?", (key,))
+
+    def update(self, key: str, fn: Callable[[Any], Any], ttl: Optional[float] = None) -> Any:
+        with self._transaction() as conn:
+            value = fn(self._read(conn, key))
+            self._write(conn, key, value, ttl)
+            return value
+
+    @contextlib.contextmanager
+    def lock(self, name: str, timeout: float = DEFAULT_LOCK_TIMEOUT) -> Iterator[None]:
+        import fcntl
+
+        path = self._lock_dir / (hashlib.sha1(name.encode()).hexdigest() + ".lock")
+        deadline = time.monotonic() + timeout
+        with open(path, "a") as handle:
+            while True:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise SharedStoreError(f"Timed out waiting for lock '{name}'")
+                    time.sleep(0.01)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class RedisStore(SharedStore):
+    """Store on a Redis-protocol server (Redis, Valkey, KeyDB or a local stand-in), for workers on several hosts"""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise SharedStoreError("The redis state store needs the redis package: pip install redis")
+        self._redis_module = redis
+        self._redis = redis.Redis.from_url(url)
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return REDIS_KEY_PREFIX + key
+
+    @staticmethod
+    def _ttl_ms(ttl: Optional[float]) -> Optional[int]:
+        return max(1, int(ttl * 1000)) if ttl else None
+
+    def get(self, key: str) -> Any:
+        raw = self._redis.get(self._key(key))
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._redis.set(self._key(key), json.dumps(value), px=self._ttl_ms(ttl))
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return bool(self._redis.set(self._key(key), json.dumps(value), nx=True, px=self._ttl_ms(ttl)))
+
+    def delete(self, key: str) -> None:
+        self._redis.delete(self._key(key))
+
+    def update(self, key: str, fn: Callable[[Any], Any], ttl: Optional[float] = None) -> Any:
+        # Optimistic WATCH/MULTI: retried if another worker wrote the key in between
+        redis_key = self._key(key)
+        with self._redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(redis_key)
+                    raw = pipe.get(redis_key)
+                    value = fn(json.loads(raw) if raw is not None else None)
+                    pipe.multi()
+                    pipe.set(redis_key, json.dumps(value), px=self._ttl_ms(ttl))
+                    pipe.execute()
+                    return value
+                except self._redis_module.WatchError:
+                    continue
+
+    @contextlib.contextmanager
+    def lock(self, name: str, timeout: float = DEFAULT_LOCK_TIMEOUT) -> Iterator[None]:
+        # The lease outlives a crashed holder by at most `timeout` seconds
+        lock = self._redis.lock(self._key(f"lock:{name}"), timeout=timeout, blocking_timeout=timeout)
+        if not lock.acquire():
+            raise SharedStoreError(f"Timed out waiting for lock '{name}'")
+        try:
+            yield
+        finally:
+            lock.release()
+
+
+def open_shared_store(url: str) -> SharedStore:
+    """Build a store from its URL: "memory", "sqlite:///path" (or "sqlite" for the default file) or "redis://..." """
+    if url == "memory":
+        return MemoryStore()
+    if url == "sqlite":
+        return SQLiteStore(DEFAULT_SQLITE_PATH)
+    if url.startswith("sqlite:///"):
+        return SQLiteStore(Path(url[len("sqlite:///"):]).expanduser())
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStore(url)
+    raise SharedStoreError(f"Unknown {STATE_STORE_ENV} '{url}'. Use memory, sqlite:///<path> or redis://<host>")
+
+
+_shared_store: Optional[SharedStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_shared_store() -> Optional[SharedStore]:
+    """
+    The process's store for state shared across workers, from ZEREPY_STATE_STORE;
+    None when unset, meaning a single process owns all state
+    """
+    global _shared_store
+    url = os.getenv(STATE_STORE_ENV)
+    if not url:
+        return None
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = open_shared_store(url)
+            logger.info(f"Using shared state store {url}")
+        return _shared_store
@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.helpers.jsonrpc import JsonRpcBatchClient
+from src.helpers.sonic.indexer import RecordIndex, records_from_tx
+
+logger = logging.getLogger("helpers.sonic.backfill")
+
+DEFAULT_CHUNK_SIZE = 50
+DEFAULT_WORKERS = 4
+# Seconds between progress log lines when no on_progress callback is given
+PROGRESS_LOG_INTERVAL = 5.0
+
+
+@dataclass
+class BackfillProgress:
+    total_blocks: int
+    done_blocks: int = 0
+    skipped_blocks: int = 0
+    records: int = 0
+    failed_chunks: List[Tuple[int, int]] = field(default_factory=list)
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def blocks_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.done_blocks / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.blocks_per_second
+        remaining = self.total_blocks - self.done_blocks - self.skipped_blocks
+        return remaining / rate if rate > 0 else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        eta = self.eta_seconds
+        return {
+            "total_blocks": self.total_blocks,
+            "done_blocks": self.done_blocks,
+            "skipped_blocks": self.skipped_blocks,
+            "records": self.records,
+            "failed_chunks": self.failed_chunks,
+            "blocks_per_second": round(self.blocks_per_second, 1),
+            "eta_seconds": round(eta) if eta is not None else None,
+        }
+
+
+class Backfill:
+    """
+    Backfills store-data records for a block range.
+
+    The range is split into chunks; each chunk is fetched as a single
+    JSON-RPC batch of eth_getBlockByNumber(n, full_transactions=True) calls,
+    and chunks run on a bounded worker pool. Decoded records are handed to
+    the index as each chunk completes and the chunk is marked done, so an
+    interrupted backfill resumes by skipping finished chunks.
+    """
+
+    def __init__(self, rpc: JsonRpcBatchClient, address: str, index: RecordIndex,
+                 decode: Callable[[bytes], Dict[str, Any]],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = DEFAULT_WORKERS,
+                 on_progress: Optional[Callable[[BackfillProgress], None]] = None,
+                 senders: Iterable[str] = ()):
+        self.rpc = rpc
+        self.address = address
+        # Besides address itself, the signers whose store-data records count (see records_from_tx)
+        self.senders = frozenset(sender.lower() for sender in senders)
+        self.index = index
+        self.decode = decode
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.on_progress = on_progress or self._log_progress
+        self._lock = threading.Lock()
+        self._last_logged = 0.0
+
+    def _chunks(self, start: int, end: int) -> List[Tuple[int, int]]:
+        return [(s, min(end, s + self.chunk_size - 1)) for s in range(start, end + 1, self.chunk_size)]
+
+    def fetch_chunk(self, start: int, end: int) -> List[Dict[str, Any]]:
+        """Fetch blocks start..end in one batch and return their decoded records"""
+        blocks = self.rpc.batch([
+            ("eth_getBlockByNumber", [hex(number), True]) for number in range(start, end + 1)
+        ])
+        records = []
+        for number, block in zip(range(start, end + 1), blocks):
+            if block is None:
+                raise ValueError(f"Block {number} not available yet")
+            for tx in block.get("transactions", []):
+                records.extend(records_from_tx(tx, number, self.address, self.decode, self.senders))
+        return records
+
+    def _run_chunk(self, start: int, end: int, progress: BackfillProgress) -> None:
+        records = self.fetch_chunk(start, end)
+        self.index.add_records(records)
+        self.index.mark_backfilled(start, end)
+        with self._lock:
+            progress.done_blocks += end - start + 1
+            progress.records += len(records)
+        self.on_progress(progress)
+
+    def _log_progress(self, progress: BackfillProgress) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_logged < PROGRESS_LOG_INTERVAL:
+                return
+            self._last_logged = now
+        logger.info(f"Backfill progress: {progress.to_dict()}")
+
+    def run(self, start: int, end: int) -> BackfillProgress:
+        """
+        Backfill blocks start..end inclusive, skipping chunks finished by an earlier run
+
+        Failed chunks are reported in the result and left unmarked, so running
+        the same range again retries only those.
+        """
+        done = self.index.backfilled_chunks()
+        chunks = self._chunks(start, end)
+        pending = [(s, e) for s, e in chunks if done.get(s) != e]
+
+        progress = BackfillProgress(total_blocks=end - start + 1)
+        progress.skipped_blocks = sum(e - s + 1 for s, e in chunks if done.get(s) == e)
+        logger.info(
+            f"Backfilling blocks {start}-{end}: {len(pending)} chunks pending, "
+            f"{progress.skipped_blocks} blocks already done"
+        )
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sonic-backfill") as pool:
+            futures = {pool.submit(self._run_chunk, s, e, progress): (s, e) for s, e in pending}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.warning(f"Backfill chunk {chunk[0]}-{chunk[1]} failed: {e}")
+                    progress.failed_chunks.append(chunk)
+
+        logger.info(f"Backfill finished: {progress.to_dict()}")
+        return progress
@@ -0,0 +1,169 @@
+import json
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from web3 import Web3
+
+logger = logging.getLogger("helpers.sonic.batcher")
+
+DEFAULT_WINDOW = 2.0
+DEFAULT_MAX_BYTES = 24_000
+DEFAULT_MAX_RECORDS = 100
+# How long store-data waits for its batch to be sent before giving up on it
+DEFAULT_SUBMIT_TIMEOUT = 120.0
+
+# Domain tags so a leaf can never be passed off as an internal node (second preimage)
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """Canonical bytes of a record, used both for the byte budget and as the Merkle leaf preimage"""
+    return json.dumps(record, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _hash_leaf(record: Dict[str, Any]) -> bytes:
+    return bytes(Web3.keccak(LEAF_PREFIX + encode_record(record)))
+
+
+def _hash_pair(a: bytes, b: bytes) -> bytes:
+    # Sorted pairs, so a proof is just the list of siblings without left/right flags
+    return bytes(Web3.keccak(NODE_PREFIX + min(a, b) + max(a, b)))
+
+
+def _merkle_levels(leaves: List[bytes]) -> List[List[bytes]]:
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [
+            _hash_pair(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+        levels.append(parents)
+    return levels
+
+
+def merkle_root_and_proofs(records: List[Dict[str, Any]]) -> Tuple[str, List[List[str]]]:
+    """Return the hex Merkle root of the records and each record's inclusion proof"""
+    leaves = [_hash_leaf(record) for record in records]
+    levels = _merkle_levels(leaves)
+    proofs = []
+    for index in range(len(leaves)):
+        proof, position = [], index
+        for level in levels[:-1]:
+            sibling = position ^ 1
+            if sibling < len(level):
+                proof.append(Web3.to_hex(level[sibling]))
+            position //= 2
+        proofs.append(proof)
+    return Web3.to_hex(levels[-1][0]), proofs
+
+
+def verify_proof(record: Dict[str, Any], proof: List[str], root: str) -> bool:
+    """Check that record is included in the batch with the given Merkle root"""
+    node = _hash_leaf(record)
+    for sibling in proof:
+        node = _hash_pair(node, bytes(Web3.to_bytes(hexstr=sibling)))
+    return Web3.to_hex(node) == root
+
+
+@dataclass
+class BatchReceipt:
+    """Where one submitted record ended up"""
+    tx_hash: str
+    index: int
+    batch_size: int
+    root: str
+    proof: List[str]
+
+
+class WriteBatcher:
+    """
+    Collects records submitted from many callers and writes them in one
+    transaction, flushing when the window elapses, the byte budget would be
+    exceeded or max_records is reached.
+
+    send_batch(records, root) must send the transaction and return its hash;
+    every submit() future then resolves to that caller's BatchReceipt.
+    Callers should wait at most submit_timeout seconds for it.
+    """
+
+    def __init__(self, send_batch: Callable[[List[Dict[str, Any]], str], str],
+                 window: float = DEFAULT_WINDOW, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_records: int = DEFAULT_MAX_RECORDS, submit_timeout: float = DEFAULT_SUBMIT_TIMEOUT):
+        self.send_batch = send_batch
+        self.window = window
+        self.max_bytes = max_bytes
+        self.max_records = max_records
+        self.submit_timeout = submit_timeout
+        self._pending: List[Tuple[Dict[str, Any], Future]] = []
+        self._pending_bytes = 0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, send_batch: Callable[[List[Dict[str, Any]], str], str],
+                    config: Dict[str, Any]) -> "WriteBatcher":
+        return cls(
+            send_batch,
+            window=config.get("window", DEFAULT_WINDOW),
+            max_bytes=config.get("max_bytes", DEFAULT_MAX_BYTES),
+            max_records=config.get("max_records", DEFAULT_MAX_RECORDS),
+            submit_timeout=config.get("submit_timeout", DEFAULT_SUBMIT_TIMEOUT)
+        )
+
+    def submit(self, record: Dict[str, Any]) -> Future:
+        """Queue a record for the next batch"""
+        future: Future = Future()
+        size = len(encode_record(record))
+        ready = []
+        with self._lock:
+            if self._pending and self._pending_bytes + size > self.max_bytes:
+                ready.append(self._take())
+            self._pending.append((record, future))
+            self._pending_bytes += size
+            if len(self._pending) >= self.max_records or self._pending_bytes >= self.max_bytes:
+                ready.append(self._take())
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        for batch in ready:
+            threading.Thread(target=self._send, args=(batch,), name="sonic-batch", daemon=True).start()
+        return future
+
+    def _take(self) -> List[Tuple[Dict[str, Any], Future]]:
+        """Detach the pending batch; caller holds the lock"""
+        batch = self._pending
+        self._pending = []
+        self._pending_bytes = 0
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def flush(self) -> None:
+        """Send whatever is pending now, on the calling thread"""
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._send(batch)
+
+    def _send(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        records = [record for record, _ in batch]
+        try:
+            root, proofs = merkle_root_and_proofs(records)
+            tx_hash = self.send_batch(records, root)
+        except Exception as e:
+            logger.error(f"Batch of {len(records)} records failed: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        logger.info(f"Sent batch of {len(records)} records in {tx_hash}")
+        for index, (_, future) in enumerate(batch):
+            future.set_result(BatchReceipt(tx_hash, index, len(records), root, proofs[index]))
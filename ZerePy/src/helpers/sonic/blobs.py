@@ -0,0 +1,169 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.helpers.transport import http
+
+logger = logging.getLogger("helpers.sonic.blobs")
+
+HASH_PREFIX = "sha256:"
+DEFAULT_MIN_SIZE = 1024
+
+
+class BlobError(Exception):
+    """Raised when a blob is missing or does not match its anchored hash"""
+    pass
+
+
+def content_hash(content: bytes) -> str:
+    return HASH_PREFIX + hashlib.sha256(content).hexdigest()
+
+
+def hash_user_id(user_id: str) -> str:
+    """Stand-in for user_id in anchored records, so the chain never carries raw ids"""
+    return hashlib.sha256(f"zerepy:user:{user_id}".encode()).hexdigest()
+
+
+def is_anchor(data: Any) -> bool:
+    return isinstance(data, dict) and isinstance(data.get("blob"), str) and data["blob"].startswith(HASH_PREFIX)
+
+
+class BlobStore(ABC):
+    """
+    Content-addressed storage for payloads kept off chain. put() returns a
+    backend locator (None when the hash alone locates the blob); get() is
+    given the hash and that locator.
+    """
+
+    @abstractmethod
+    def put(self, digest: str, content: bytes) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def get(self, digest: str, ref: Optional[str] = None) -> bytes:
+        pass
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files named by their hash under a root directory"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        hexdigest = digest[len(HASH_PREFIX):]
+        return self.root / hexdigest[:2] / hexdigest
+
+    def put(self, digest: str, content: bytes) -> Optional[str]:
+        path = self._path(digest)
+        if path.exists():
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so a crash never leaves a truncated blob under its hash
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+        return None
+
+    def get(self, digest: str, ref: Optional[str] = None) -> bytes:
+        try:
+            return self._path(digest).read_bytes()
+        except FileNotFoundError:
+            raise BlobError(f"Blob {digest} not found in {self.root}")
+
+
+class IPFSBlobStore(BlobStore):
+    """Blobs pinned through an IPFS HTTP API (e.g. a local kubo node); the CID is the locator"""
+
+    def __init__(self, api_url: str = "http://127.0.0.1:5001", gateway_url: Optional[str] = None):
+        self.api_url = api_url.rstrip("/")
+        self.gateway_url = gateway_url.rstrip("/") if gateway_url else None
+
+    def put(self, digest: str, content: bytes) -> Optional[str]:
+        response = http.post(f"{self.api_url}/api/v0/add", params={"pin": "true"}, files={"file": content})
+        response.raise_for_status()
+        return response.json()["Hash"]
+
+    def get(self, digest: str, ref: Optional[str] = None) -> bytes:
+        if not ref:
+            raise BlobError(f"Blob {digest} has no IPFS CID")
+        if self.gateway_url:
+            response = http.get(f"{self.gateway_url}/ipfs/{ref}")
+        else:
+            response = http.post(f"{self.api_url}/api/v0/cat", params={"arg": ref})
+        response.raise_for_status()
+        return response.content
+
+
+# backend name -> factory(config, default_root); register more here to plug them in
+BACKENDS = {
+    "local": lambda config, default_root: LocalBlobStore(config.get("path") or default_root),
+    "ipfs": lambda config, default_root: IPFSBlobStore(
+        config.get("api_url", "http://127.0.0.1:5001"), config.get("gateway_url")
+    ),
+}
+
+
+class BlobAnchors:
+    """
+    Moves large store-data payloads off chain: the payload goes to a
+    BlobStore and only a compact anchor (user_id hash, content hash, size,
+    locator) is written on chain. resolve() fetches and verifies it again.
+    """
+
+    def __init__(self, store: BlobStore, min_size: int = DEFAULT_MIN_SIZE):
+        self.store = store
+        self.min_size = min_size
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], default_root: Path) -> "BlobAnchors":
+        """
+        Build from the "blob_store" config block, e.g. {"backend": "local", "path": "...",
+        "min_size": 1024} or {"backend": "ipfs", "api_url": "http://127.0.0.1:5001"}
+        """
+        backend = config.get("backend", "local")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown blob store backend '{backend}'. Must be one of: {', '.join(BACKENDS)}")
+        return cls(BACKENDS[backend](config, default_root), config.get("min_size", DEFAULT_MIN_SIZE))
+
+    def anchor(self, data: str) -> str:
+        """Return the string to store on chain: data itself if small, else its anchor"""
+        content = data.encode()
+        if len(content) < self.min_size:
+            return data
+
+        user_id = None
+        try:
+            parsed = json.loads(data)
+            if isinstance(parsed, dict):
+                user_id = parsed.get("user_id")
+        except ValueError:
+            pass
+
+        digest = content_hash(content)
+        ref = self.store.put(digest, content)
+        anchor = {"blob": digest, "size": len(content)}
+        if user_id is not None:
+            anchor["user_id_hash"] = hash_user_id(str(user_id))
+        if ref:
+            anchor["ref"] = ref
+        return json.dumps(anchor, separators=(",", ":"))
+
+    def resolve(self, anchor: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fetch the payload an anchor points to and check it against the hash
+
+        Raises:
+            BlobError: If the blob is missing or its hash does not match
+        """
+        content = self.store.get(anchor["blob"], anchor.get("ref"))
+        if content_hash(content) != anchor["blob"]:
+            raise BlobError(f"Blob {anchor['blob']} failed hash verification")
+        return json.loads(content)
@@ -0,0 +1,210 @@
+import json
+import logging
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import msgpack
+except ImportError:  # a declared dependency; trimmed installs fall back to compact JSON bodies
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # a declared dependency; trimmed installs fall back to zlib
+    zstandard = None
+
+logger = logging.getLogger("helpers.sonic.envelope")
+
+# Layout: MAGIC | VERSION | codec byte (compression << 4 | body format) | type id | body
+MAGIC = 0xE5
+VERSION = 1
+HEADER_SIZE = 4
+
+FORMAT_JSON = 0
+FORMAT_MSGPACK = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+# Well-known record types get a one-byte id; anything else is carried in the body
+TYPE_CUSTOM = 0
+TYPE_IDS = {
+    "behavior_analysis": 1,
+    "habit_completion": 2,
+    "batch": 3,
+}
+TYPE_NAMES = {type_id: name for name, type_id in TYPE_IDS.items()}
+
+
+class EnvelopeError(Exception):
+    """Raised when a payload cannot be encoded or decoded"""
+    pass
+
+
+def is_envelope(raw: bytes) -> bool:
+    return len(raw) >= HEADER_SIZE and raw[0] == MAGIC
+
+
+def train_dictionary(samples: List[bytes], size: int = 16384) -> bytes:
+    """Train a zstd dictionary from sample record bodies (e.g. past analysis texts)"""
+    if zstandard is None:
+        raise EnvelopeError("zstandard is not installed")
+    return zstandard.train_dictionary(size, samples).as_bytes()
+
+
+def _compact_record(record: Dict[str, Any], with_type: bool) -> Dict[str, Any]:
+    compact = {"t": record.get("timestamp"), "d": record.get("data")}
+    if with_type:
+        compact["y"] = record.get("type")
+    return compact
+
+
+def _expand_record(compact: Dict[str, Any], record_type: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "type": compact.get("y", record_type),
+        "data": compact.get("d"),
+        "timestamp": compact.get("t"),
+    }
+
+
+class EnvelopeCodec:
+    """
+    Versioned binary envelope for store-data payloads.
+
+    Record data strings are carried as-is in a msgpack body (compact JSON when
+    msgpack is not installed), so they are no longer JSON-escaped a second
+    time. Bodies over min_compress_size are compressed with zstd (optionally
+    with a shared dictionary) or zlib, whichever is available, and only when
+    that actually makes them smaller.
+    """
+
+    def __init__(self, body_format: Optional[int] = None, compression: Optional[int] = None,
+                 zstd_dictionary: Optional[bytes] = None, min_compress_size: int = 128):
+        if body_format is None:
+            body_format = FORMAT_MSGPACK if msgpack is not None else FORMAT_JSON
+        if compression is None:
+            compression = COMPRESSION_ZSTD if zstandard is not None else COMPRESSION_ZLIB
+        if body_format == FORMAT_MSGPACK and msgpack is None:
+            raise EnvelopeError("msgpack is not installed")
+        if compression == COMPRESSION_ZSTD and zstandard is None:
+            raise EnvelopeError("zstandard is not installed")
+
+        self.body_format = body_format
+        self.compression = compression
+        self.min_compress_size = min_compress_size
+        self._zstd_dict = zstandard.ZstdCompressionDict(zstd_dictionary) if zstd_dictionary and zstandard else None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "EnvelopeCodec":
+        """
+        Build a codec from the "envelope" config block, e.g.
+        {"format": "msgpack", "compression": "zstd", "dictionary": "data/analysis.zdict"}
+        """
+        formats = {"json": FORMAT_JSON, "msgpack": FORMAT_MSGPACK}
+        compressions = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "zstd": COMPRESSION_ZSTD}
+        dictionary = None
+        if config.get("dictionary"):
+            dictionary = Path(config["dictionary"]).read_bytes()
+        return cls(
+            body_format=formats[config["format"]] if "format" in config else None,
+            compression=compressions[config["compression"]] if "compression" in config else None,
+            zstd_dictionary=dictionary,
+            min_compress_size=config.get("min_compress_size", 128)
+        )
+
+    def _pack(self, body: Dict[str, Any]) -> bytes:
+        if self.body_format == FORMAT_MSGPACK:
+            return msgpack.packb(body, use_bin_type=True)
+        return json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode()
+
+    @staticmethod
+    def _unpack(body_format: int, body: bytes) -> Dict[str, Any]:
+        if body_format == FORMAT_MSGPACK:
+            if msgpack is None:
+                raise EnvelopeError("Payload uses msgpack but msgpack is not installed")
+            return msgpack.unpackb(body, raw=False)
+        if body_format == FORMAT_JSON:
+            return json.loads(body)
+        raise EnvelopeError(f"Unknown body format {body_format}")
+
+    def _compress(self, body: bytes):
+        if self.compression == COMPRESSION_NONE or len(body) < self.min_compress_size:
+            return COMPRESSION_NONE, body
+        if self.compression == COMPRESSION_ZSTD:
+            compressed = zstandard.ZstdCompressor(level=19, dict_data=self._zstd_dict).compress(body)
+        else:
+            compressed = zlib.compress(body, 9)
+        if len(compressed) >= len(body):
+            return COMPRESSION_NONE, body
+        return self.compression, compressed
+
+    def _decompress(self, compression: int, body: bytes) -> bytes:
+        if compression == COMPRESSION_NONE:
+            return body
+        if compression == COMPRESSION_ZLIB:
+            return zlib.decompress(body)
+        if compression == COMPRESSION_ZSTD:
+            if zstandard is None:
+                raise EnvelopeError("Payload uses zstd but zstandard is not installed")
+            return zstandard.ZstdDecompressor(dict_data=self._zstd_dict).decompress(body)
+        raise EnvelopeError(f"Unknown compression {compression}")
+
+    def encode(self, payload: Dict[str, Any]) -> bytes:
+        """
+        Encode a store-data payload: either a single record
+        {"type", "data", "timestamp"} or a batch {"type": "batch", "root", "records"}
+        """
+        payload_type = payload.get("type")
+        type_id = TYPE_IDS.get(payload_type, TYPE_CUSTOM)
+
+        if payload_type == "batch":
+            body = {
+                "root": payload.get("root"),
+                "r": [_compact_record(record, with_type=True) for record in payload.get("records", [])],
+            }
+        else:
+            body = _compact_record(payload, with_type=type_id == TYPE_CUSTOM)
+
+        compression, packed = self._compress(self._pack(body))
+        header = bytes([MAGIC, VERSION, (compression << 4) | self.body_format, type_id])
+        return header + packed
+
+    def decode(self, raw: bytes) -> Dict[str, Any]:
+        """Decode an envelope back into the payload shape encode() accepted"""
+        if not is_envelope(raw):
+            raise EnvelopeError("Not an envelope payload")
+        version, codec, type_id = raw[1], raw[2], raw[3]
+        if version != VERSION:
+            raise EnvelopeError(f"Unsupported envelope version {version}")
+
+        body = self._unpack(codec & 0x0F, self._decompress(codec >> 4, raw[HEADER_SIZE:]))
+        payload_type = TYPE_NAMES.get(type_id)
+
+        if payload_type == "batch":
+            return {
+                "type": "batch",
+                "root": body.get("root"),
+                "records": [_expand_record(record) for record in body.get("r", [])],
+            }
+        return _expand_record(body, payload_type)
+
+
+def decode_payload(raw: bytes, codec: Optional[EnvelopeCodec] = None) -> Dict[str, Any]:
+    """Decode stored calldata, accepting both envelopes and the legacy JSON text format"""
+    if is_envelope(raw):
+        return (codec or EnvelopeCodec()).decode(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def iter_records(payload: Dict[str, Any]):
+    """
+    Yield (batch_index, record) for each record in a decoded payload;
+    batch_index is None for single-record payloads
+    """
+    if payload.get("type") == "batch":
+        for index, record in enumerate(payload.get("records", [])):
+            yield index, record
+    else:
+        yield None, payload
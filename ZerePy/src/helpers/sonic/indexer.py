@@ -0,0 +1,321 @@
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import AbstractSet, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.helpers.sonic.blobs import hash_user_id
+from src.helpers.sonic.envelope import iter_records
+
+logger = logging.getLogger("helpers.sonic.indexer")
+
+DEFAULT_REORG_DEPTH = 64
+DEFAULT_POLL_INTERVAL = 5.0
+
+
+class RecordIndex:
+    """
+    SQLite index of store-data records, keyed by the user_id inside each
+    record, plus the scan checkpoint and recent block hashes for reorg checks
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # WAL lets other worker processes read while the elected indexer writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS records ("
+            " tx_hash TEXT NOT NULL, batch_index INTEGER NOT NULL, user_id TEXT,"
+            " data_type TEXT, block_number INTEGER NOT NULL, timestamp INTEGER, data TEXT,"
+            " PRIMARY KEY (tx_hash, batch_index));"
+            "CREATE INDEX IF NOT EXISTS records_by_user ON records (user_id, data_type, block_number);"
+            "CREATE TABLE IF NOT EXISTS blocks (number INTEGER PRIMARY KEY, hash TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS backfill_chunks (start INTEGER PRIMARY KEY, end INTEGER NOT NULL);"
+        )
+        self._conn.commit()
+
+    def get_checkpoint(self) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'checkpoint'").fetchone()
+        return int(row[0]) if row else None
+
+    def block_hash(self, number: int) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT hash FROM blocks WHERE number = ?", (number,)).fetchone()
+        return row[0] if row else None
+
+    def commit_blocks(self, blocks: Iterable[Tuple[int, str]], records: Iterable[Dict[str, Any]],
+                      checkpoint: int, keep_blocks: int) -> None:
+        """Atomically add scanned blocks and their records and advance the checkpoint"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO blocks (number, hash) VALUES (?, ?)", list(blocks)
+            )
+            self._insert_records(records)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('checkpoint', ?)", (str(checkpoint),)
+            )
+            # Only the reorg window needs block hashes
+            self._conn.execute("DELETE FROM blocks WHERE number <= ?", (checkpoint - keep_blocks,))
+
+    def rollback_to(self, number: int) -> None:
+        """Drop everything indexed above block `number` and rewind the checkpoint to it"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM records WHERE block_number > ?", (number,))
+            self._conn.execute("DELETE FROM blocks WHERE number > ?", (number,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('checkpoint', ?)", (str(number),)
+            )
+
+    def add_records(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Insert records without touching the checkpoint (used by backfills)"""
+        with self._lock, self._conn:
+            self._insert_records(records)
+
+    def _insert_records(self, records: Iterable[Dict[str, Any]]) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO records (tx_hash, batch_index, user_id, data_type,"
+            " block_number, timestamp, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (r["tx_hash"], r["batch_index"], r["user_id"], r["data_type"],
+                 r["block_number"], r["timestamp"], r["data"])
+                for r in records
+            ]
+        )
+
+    def mark_backfilled(self, start: int, end: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO backfill_chunks (start, end) VALUES (?, ?)", (start, end)
+            )
+
+    def backfilled_chunks(self) -> Dict[int, int]:
+        """start -> end of every backfill chunk already completed"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT start, end FROM backfill_chunks").fetchall())
+
+    def records_for(self, user_id: str, data_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """All indexed records of a user, oldest first, including blob anchors keyed by the user's hash"""
+        query = ("SELECT tx_hash, batch_index, data_type, block_number, timestamp, data"
+                 " FROM records WHERE user_id IN (?, ?)")
+        args: List[Any] = [user_id, hash_user_id(user_id)]
+        if data_type:
+            query += " AND data_type = ?"
+            args.append(data_type)
+        query += " ORDER BY block_number, tx_hash, batch_index"
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+
+        results = []
+        for tx_hash, batch_index, record_type, block_number, timestamp, data in rows:
+            result = {
+                "tx_hash": tx_hash,
+                "block_number": block_number,
+                "timestamp": timestamp,
+                "type": record_type,
+                "data": json.loads(data) if data else {}
+            }
+            # -1 marks a single-record transaction
+            if batch_index >= 0:
+                result["batch_index"] = batch_index
+            results.append(result)
+        return results
+
+
+def _as_bytes(value) -> bytes:
+    """Calldata as bytes, from either a web3 HexBytes or a raw JSON-RPC hex string"""
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    return bytes(value or b"")
+
+
+def _as_hex(value) -> str:
+    return value if isinstance(value, str) else "0x" + bytes(value).hex()
+
+
+def records_from_tx(tx, block_number: int, address: str,
+                    decode: Callable[[bytes], Dict[str, Any]],
+                    senders: Optional[AbstractSet[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Index rows for a store-data transaction sent to `address`, else []
+
+    Only transactions signed by `address` itself or one of `senders`
+    (lowercase; e.g. wallet pool lanes) count: anyone can send calldata to
+    the storage account, and their records must not be indexed as ours.
+    """
+    address = address.lower()
+    sender = (tx.get("from") or "").lower()
+    recipient = (tx.get("to") or "").lower()
+    if recipient != address or (sender != address and sender not in (senders or ())):
+        return []
+
+    raw = _as_bytes(tx.get("input"))
+    if not raw:
+        return []
+    try:
+        payload = decode(raw)
+    except Exception:
+        # Plain transfers and anything else that is not a store-data payload
+        return []
+    if not isinstance(payload, dict):
+        return []
+    return extract_records(_as_hex(tx["hash"]), block_number, payload)
+
+
+def extract_records(tx_hash: str, block_number: int, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Turn a decoded store-data payload into index rows"""
+    rows = []
+    for batch_index, record in iter_records(payload):
+        data = record.get("data") or "{}"
+        try:
+            parsed = json.loads(data)
+            # Blob anchors carry a hash in place of the raw user_id
+            user_id = parsed.get("user_id") or parsed.get("user_id_hash")
+        except (TypeError, ValueError, AttributeError):
+            user_id = None
+        rows.append({
+            "tx_hash": tx_hash,
+            "batch_index": -1 if batch_index is None else batch_index,
+            "user_id": user_id,
+            "data_type": record.get("type"),
+            "block_number": block_number,
+            "timestamp": record.get("timestamp"),
+            "data": data
+        })
+    return rows
+
+
+class StoreIndexer:
+    """
+    Incrementally scans blocks for store-data transactions of one account and
+    keeps a RecordIndex up to date. Records count only when sent by the
+    account itself or one of `senders` (its wallet pool lanes).
+
+    Scanning resumes from the stored checkpoint. Before each pass the hash of
+    the checkpoint block is compared with the chain; on mismatch the indexer
+    walks back (up to reorg_depth blocks) to the last block that still
+    matches and re-indexes from there.
+    """
+
+    def __init__(self, web3, address: str, index: RecordIndex,
+                 decode: Callable[[bytes], Dict[str, Any]],
+                 reorg_depth: int = DEFAULT_REORG_DEPTH, start_block: Optional[int] = None,
+                 chunk_size: int = 100, senders: Iterable[str] = (), rpc=None):
+        self._web3 = web3
+        # JsonRpcBatchClient; when given, each chunk of blocks is fetched in one batch request
+        self.rpc = rpc
+        self.address = address.lower()
+        self.senders = frozenset(sender.lower() for sender in senders)
+        self.index = index
+        self.decode = decode
+        self.reorg_depth = reorg_depth
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self._sync_lock = threading.Lock()
+        self._stop: Optional[threading.Event] = None
+
+    def _check_reorg(self, checkpoint: int) -> int:
+        """Return the checkpoint to resume from, rolling back if the chain diverged"""
+        number = checkpoint
+        lowest = max(0, checkpoint - self.reorg_depth)
+        while number > lowest:
+            known = self.index.block_hash(number)
+            if known is None:
+                break
+            if _as_hex(self._web3.eth.get_block(number)["hash"]) == known:
+                break
+            number -= 1
+
+        if number != checkpoint:
+            logger.warning(f"Reorg detected, rolling index back from block {checkpoint} to {number}")
+            self.index.rollback_to(number)
+        return number
+
+    def _fetch_blocks(self, start: int, end: int) -> List[Any]:
+        if self.rpc is None:
+            return [self._web3.eth.get_block(number, full_transactions=True) for number in range(start, end + 1)]
+        blocks = self.rpc.batch([
+            ("eth_getBlockByNumber", [hex(number), True]) for number in range(start, end + 1)
+        ])
+        for number, block in zip(range(start, end + 1), blocks):
+            if block is None:
+                raise ValueError(f"Block {number} not available yet")
+        return blocks
+
+    def scan_range(self, start: int, end: int) -> Tuple[List[Tuple[int, str]], List[Dict[str, Any]]]:
+        """Fetch and decode blocks start..end inclusive"""
+        blocks, records = [], []
+        for number, block in zip(range(start, end + 1), self._fetch_blocks(start, end)):
+            blocks.append((number, _as_hex(block["hash"])))
+            for tx in block["transactions"]:
+                records.extend(records_from_tx(tx, number, self.address, self.decode, self.senders))
+        return blocks, records
+
+    def sync(self, max_blocks: Optional[int] = None, claim: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Index new blocks up to the chain head
+
+        With claim, the writer lease is renewed before each chunk is
+        committed, and the pass stops as soon as it is lost, so a long
+        catch-up never writes alongside the worker that took over.
+
+        Returns:
+            Number of blocks scanned
+        """
+        with self._sync_lock:
+            head = self._web3.eth.block_number
+            checkpoint = self.index.get_checkpoint()
+            if checkpoint is None:
+                # Without a configured start, begin at the head; older history needs a backfill
+                checkpoint = (self.start_block - 1) if self.start_block is not None else head
+                self.index.rollback_to(checkpoint)
+            else:
+                checkpoint = self._check_reorg(checkpoint)
+
+            target = head if max_blocks is None else min(head, checkpoint + max_blocks)
+            scanned = 0
+            while checkpoint < target:
+                end = min(target, checkpoint + self.chunk_size)
+                blocks, records = self.scan_range(checkpoint + 1, end)
+                if claim is not None and not claim():
+                    logger.info("Lost the index writer lease, stopping this pass")
+                    break
+                self.index.commit_blocks(blocks, records, end, keep_blocks=self.reorg_depth)
+                if records:
+                    logger.info(f"Indexed {len(records)} records from blocks {checkpoint + 1}-{end}")
+                scanned += end - checkpoint
+                checkpoint = end
+            return scanned
+
+    def start(self, interval: float = DEFAULT_POLL_INTERVAL,
+              claim: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Keep the index in sync from a daemon thread. With several processes
+        sharing the index file, only the one whose claim() returns True
+        writes; the others keep polling so they can take over.
+        """
+        if self._stop is not None:
+            return
+        stop_event = threading.Event()
+        self._stop = stop_event
+
+        def _run():
+            while not stop_event.is_set():
+                try:
+                    if claim is None or claim():
+                        self.sync(claim=claim)
+                except Exception as e:
+                    logger.warning(f"Index sync failed: {e}")
+                stop_event.wait(timeout=interval)
+
+        threading.Thread(target=_run, name="sonic-indexer", daemon=True).start()
+
+    def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
@@ -0,0 +1,159 @@
+import heapq
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.helpers.shared_state import SharedStore
+
+logger = logging.getLogger("helpers.sonic.nonce")
+
+# Node error fragments meaning our local view of the account nonce is stale
+STALE_NONCE_ERRORS = ("nonce too low", "replacement transaction underpriced")
+
+
+def is_stale_nonce_error(error: BaseException) -> bool:
+    message = str(error).lower()
+    return any(fragment in message for fragment in STALE_NONCE_ERRORS)
+
+
+class NonceManager:
+    """
+    Local nonce allocator for one sending account.
+
+    Syncs once from the node's pending transaction count, then hands out
+    nonces from memory under a lock so concurrent writes (threads or tasks
+    running on the action executor) never collide and skip the extra RPC.
+    Nonces whose send failed are released and handed out again first, so a
+    failed send does not leave a gap that blocks every later transaction.
+
+    Given a SharedStore, the lane state lives there instead, so several
+    worker processes sending from the same account share one sequence.
+    """
+
+    def __init__(self, web3, address: str, store: Optional[SharedStore] = None, store_key: Optional[str] = None):
+        self._web3 = web3
+        self.address = address
+        self._next: Optional[int] = None
+        self._released: List[int] = []
+        self._lock = threading.Lock()
+        self._store = store
+        self._store_key = store_key or f"nonce:{address}"
+
+    def _mutate(self, op: Callable[[Optional[int], List[int]], Tuple[Optional[int], List[int], Any]]) -> Any:
+        """Apply op(next, released) -> (next, released, result) atomically, locally or in the shared store"""
+        if self._store is None:
+            with self._lock:
+                self._next, self._released, result = op(self._next, self._released)
+                return result
+
+        outcome = {}
+
+        def apply(state):
+            state = state or {"next": None, "released": []}
+            next_nonce, released, outcome["result"] = op(state["next"], state["released"])
+            return {"next": next_nonce, "released": released}
+
+        self._store.update(self._store_key, apply)
+        return outcome["result"]
+
+    def _sync(self) -> int:
+        next_nonce = self._web3.eth.get_transaction_count(self.address, "pending")
+        logger.debug(f"Synced nonce for {self.address}: {next_nonce}")
+        return next_nonce
+
+    def allocate(self) -> int:
+        """Reserve the next nonce, reusing released ones first"""
+        # The pending count is fetched outside _mutate, so no RPC runs while
+        # the lane lock (or the shared store's transaction) is held
+        synced: Optional[int] = None
+        while True:
+            def op(next_nonce, released):
+                if next_nonce is None:
+                    if synced is None:
+                        return next_nonce, released, None
+                    next_nonce, released = synced, []
+                elif synced is not None:
+                    next_nonce = max(next_nonce, synced)
+                if released:
+                    return next_nonce, released, heapq.heappop(released)
+                return next_nonce + 1, released, next_nonce
+
+            nonce = self._mutate(op)
+            if nonce is not None:
+                return nonce
+            synced = self._sync()
+
+    def release(self, nonce: int) -> None:
+        """Return a nonce whose transaction never reached the node"""
+        def op(next_nonce, released):
+            if next_nonce is None:
+                return next_nonce, released, None
+            if nonce == next_nonce - 1:
+                next_nonce = nonce
+            elif nonce < next_nonce and nonce not in released:
+                heapq.heappush(released, nonce)
+            return next_nonce, released, None
+
+        self._mutate(op)
+
+    def resync(self) -> None:
+        """Forget local state; the next allocate() re-reads the pending count"""
+        self._mutate(lambda next_nonce, released: (None, [], None))
+        logger.info(f"Nonce for {self.address} will be resynced from chain")
+
+    def take_gaps(self) -> List[int]:
+        """Pop released nonces that sit below already-sent ones and must be filled"""
+        return self._mutate(lambda next_nonce, released: (next_nonce, [], sorted(released)))
+
+    def send(self, send_fn: Callable[[int], object], fill_gap: Optional[Callable[[int], object]] = None):
+        """
+        Allocate a nonce and run send_fn(nonce), keeping the allocator consistent
+
+        A stale-nonce rejection triggers a resync and one retry with a fresh
+        nonce. Any other failure releases the nonce; if later nonces are
+        already in flight, fill_gap(nonce) is used to plug the hole (typically
+        a zero-value self-transfer) so they are not stuck behind it.
+        """
+        for attempt in range(2):
+            nonce = self.allocate()
+            try:
+                return send_fn(nonce)
+            except Exception as e:
+                if is_stale_nonce_error(e) and attempt == 0:
+                    logger.warning(f"Stale nonce {nonce} for {self.address}: {e}")
+                    self.resync()
+                    continue
+                self.release(nonce)
+                if fill_gap is not None:
+                    self._fill_gaps(fill_gap)
+                raise
+
+    def _fill_gaps(self, fill_gap: Callable[[int], object]) -> None:
+        for nonce in self.take_gaps():
+            try:
+                fill_gap(nonce)
+                logger.info(f"Filled nonce gap {nonce} for {self.address}")
+            except Exception as e:
+                logger.warning(f"Could not fill nonce gap {nonce} for {self.address}: {e}")
+                self.resync()
+                return
+
+
+_managers: Dict[Tuple[str, str], NonceManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_nonce_manager(rpc_url: str, web3, address: str, store: Optional[SharedStore] = None,
+                      store_key: Optional[str] = None) -> NonceManager:
+    """
+    Shared allocator per (RPC endpoint, sending address). A connection built
+    by an agent reload gets the same one as the connection it replaces, so
+    nonces still in flight from the old one are never handed out again.
+    web3, store and store_key only apply when the allocator is first created.
+    """
+    with _managers_lock:
+        manager = _managers.get((rpc_url, address))
+        if manager is None:
+            manager = NonceManager(web3, address, store=store, store_key=store_key)
+            _managers[(rpc_url, address)] = manager
+        return manager
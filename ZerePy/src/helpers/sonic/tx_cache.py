@@ -0,0 +1,87 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("helpers.sonic.tx_cache")
+
+
+def normalize_tx_hash(tx_hash) -> str:
+    """Lowercase 0x-prefixed hex, from either a string or HexBytes"""
+    if not isinstance(tx_hash, str):
+        tx_hash = bytes(tx_hash).hex()
+    tx_hash = tx_hash.lower()
+    return tx_hash if tx_hash.startswith("0x") else "0x" + tx_hash
+
+
+@dataclass
+class CachedTx:
+    """Decoded store-data payload of one transaction"""
+    tx_hash: str
+    payload: Dict[str, Any]
+    block_number: Optional[int] = None
+    block_hash: Optional[str] = None
+
+
+class TxCache:
+    """
+    Permanent SQLite cache of decoded store-data transactions, keyed by tx hash.
+
+    Entries written by our own sends start out pending (block_number is
+    None) and are upgraded by put_finalized() once their block is final;
+    only finalized entries may be served without a network round trip.
+    A finalized transaction never changes, so entries have no TTL.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS txs ("
+            " tx_hash TEXT PRIMARY KEY, payload TEXT NOT NULL,"
+            " block_number INTEGER, block_hash TEXT, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, tx_hash) -> Optional[CachedTx]:
+        tx_hash = normalize_tx_hash(tx_hash)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, block_number, block_hash FROM txs WHERE tx_hash = ?", (tx_hash,)
+            ).fetchone()
+        if row is None:
+            return None
+        payload, block_number, block_hash = row
+        try:
+            return CachedTx(tx_hash, json.loads(payload), block_number, block_hash)
+        except ValueError as e:
+            logger.warning(f"Dropping unreadable tx cache entry {tx_hash}: {e}")
+            self.delete(tx_hash)
+            return None
+
+    def put_pending(self, tx_hash, payload: Dict[str, Any]) -> None:
+        """Write-through for a transaction we just sent; keeps an existing finalized entry"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO txs (tx_hash, payload, stored_at) VALUES (?, ?, ?)",
+                (normalize_tx_hash(tx_hash), json.dumps(payload), time.time())
+            )
+
+    def put_finalized(self, tx_hash, payload: Dict[str, Any], block_number: int,
+                      block_hash: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO txs (tx_hash, payload, block_number, block_hash, stored_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (normalize_tx_hash(tx_hash), json.dumps(payload), block_number, block_hash, time.time())
+            )
+
+    def delete(self, tx_hash) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM txs WHERE tx_hash = ?", (normalize_tx_hash(tx_hash),))
@@ -0,0 +1,160 @@
+import itertools
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("helpers.sonic.wallets")
+
+ROUND_ROBIN = "round_robin"
+LEAST_PENDING = "least_pending"
+DEFAULT_TOP_UP_INTERVAL = 300.0
+# BIP-44 path of Ethereum-style accounts; lane i uses index i
+DERIVATION_PATH = "m/44'/60'/0'/0/{}"
+
+
+@dataclass
+class SenderLane:
+    """One signer account of the pool and its in-flight bookkeeping"""
+    account: Any
+    pending: int = 0
+    sent: int = 0
+    low_balance: bool = False
+    funding: bool = False
+
+    @property
+    def address(self) -> str:
+        return self.account.address
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "address": self.address,
+            "pending": self.pending,
+            "sent": self.sent,
+            "low_balance": self.low_balance,
+            "funding": self.funding,
+        }
+
+
+def load_sender_accounts(account_api, size: int) -> List[Any]:
+    """
+    Derive the pool's signer accounts once: `size` accounts from
+    SONIC_WALLET_MNEMONIC, or the comma-separated SONIC_WALLET_KEYS
+    """
+    mnemonic = os.getenv("SONIC_WALLET_MNEMONIC")
+    if mnemonic:
+        account_api.enable_unaudited_hdwallet_features()
+        return [
+            account_api.from_mnemonic(mnemonic, account_path=DERIVATION_PATH.format(index))
+            for index in range(size)
+        ]
+    keys = [key.strip() for key in os.getenv("SONIC_WALLET_KEYS", "").split(",") if key.strip()]
+    return [account_api.from_key(key) for key in keys[:size]]
+
+
+class WalletPool:
+    """
+    Signer accounts used in parallel for store-data writes.
+
+    Each account is its own nonce lane, so writes are not serialized behind
+    a single nonce sequence. acquire() picks a lane round-robin or by fewest
+    unconfirmed transactions; the caller release()s it once the transaction
+    is confirmed (or failed to send). An optional top-up job keeps lanes
+    funded from a treasury account.
+    """
+
+    def __init__(self, accounts: List[Any], strategy: str = LEAST_PENDING):
+        if not accounts:
+            raise ValueError("WalletPool needs at least one account")
+        if strategy not in (ROUND_ROBIN, LEAST_PENDING):
+            raise ValueError(f"Unknown wallet pool strategy '{strategy}'")
+        self.lanes = [SenderLane(account) for account in accounts]
+        self.strategy = strategy
+        self._cursor = itertools.count()
+        self._lock = threading.Lock()
+        self._stop: Optional[threading.Event] = None
+
+    def acquire(self) -> SenderLane:
+        """Pick the lane for the next write and count it as pending"""
+        with self._lock:
+            # Lanes waiting for a top-up only get work when every lane is low
+            lanes = [lane for lane in self.lanes if not lane.low_balance] or self.lanes
+            start = next(self._cursor) % len(lanes)
+            rotated = lanes[start:] + lanes[:start]
+            lane = rotated[0] if self.strategy == ROUND_ROBIN else min(rotated, key=lambda l: l.pending)
+            lane.pending += 1
+            lane.sent += 1
+            return lane
+
+    def release(self, lane: SenderLane) -> None:
+        with self._lock:
+            lane.pending = max(0, lane.pending - 1)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [lane.to_dict() for lane in self.lanes]
+
+    def top_up(self, get_balance: Callable[[str], int], fund: Callable[[str, int], Future],
+               min_balance: int, target_balance: int) -> int:
+        """
+        Fund every lane below min_balance (wei) back up to target_balance
+
+        fund(address, amount) sends the transfer and returns a Future that
+        resolves once it is confirmed. Returns the number of transfers sent.
+        """
+        funded = 0
+        for lane in self.lanes:
+            if lane.funding:
+                continue
+            balance = get_balance(lane.address)
+            lane.low_balance = balance < min_balance
+            if not lane.low_balance:
+                continue
+            amount = target_balance - balance
+            logger.info(f"Topping up sender {lane.address} with {amount} wei")
+            try:
+                future = fund(lane.address, amount)
+            except Exception as e:
+                logger.error(f"Top-up of {lane.address} failed: {e}")
+                continue
+            lane.funding = True
+            funded += 1
+
+            def _done(_, lane=lane):
+                lane.funding = False
+                lane.low_balance = False
+
+            future.add_done_callback(_done)
+        return funded
+
+    def start_top_up(self, get_balance: Callable[[str], int], fund: Callable[[str, int], Future],
+                     min_balance: int, target_balance: int,
+                     interval: float = DEFAULT_TOP_UP_INTERVAL,
+                     claim: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Run top_up() every interval seconds on a daemon thread. With several
+        processes sharing the lanes, claim() returning False skips a pass
+        another process has already taken.
+        """
+        if self._stop is not None:
+            return
+        stop_event = threading.Event()
+        self._stop = stop_event
+
+        def _run():
+            while not stop_event.is_set():
+                try:
+                    if claim is None or claim():
+                        self.top_up(get_balance, fund, min_balance, target_balance)
+                except Exception as e:
+                    logger.warning(f"Wallet top-up pass failed: {e}")
+                stop_event.wait(timeout=interval)
+
+        threading.Thread(target=_run, name="sonic-wallet-top-up", daemon=True).start()
+
+    def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
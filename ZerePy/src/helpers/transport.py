@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("helpers.transport")
+
+# A float, or a (connect, read) pair as accepted by requests; None means no limit
+Timeout = Union[float, Tuple[Optional[float], Optional[float]]]
+
+DEFAULT_POOL_MAXSIZE = int(os.getenv("ZEREPY_HTTP_POOL_MAXSIZE", "20"))
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("ZEREPY_HTTP_CONNECT_TIMEOUT", "10"))
+# Without ZEREPY_HTTP_TIMEOUT only connecting is bounded: LLM generations
+# (e.g. Ollama) can legitimately take minutes to respond
+_timeout_env = os.getenv("ZEREPY_HTTP_TIMEOUT")
+DEFAULT_TIMEOUT: Timeout = float(_timeout_env) if _timeout_env else (DEFAULT_CONNECT_TIMEOUT, None)
+
+
+class HTTPTransport:
+    """
+    Process-wide registry of keep-alive HTTP sessions, one per host.
+
+    Exposes a requests-like get/post/request API so call sites can switch from
+    `requests.get(...)` to `http.get(...)` and reuse TCP/TLS connections across
+    calls. Per-host pool sizes and default timeouts can be set with configure_host();
+    without one, a call that passes no timeout only gets a bounded connect phase.
+
+    Async callers use arequest()/aget()/apost(), backed by one aiohttp session
+    per host and event loop with the same pool size and timeout settings.
+    """
+
+    def __init__(self, pool_maxsize: int = DEFAULT_POOL_MAXSIZE, timeout: Optional[Timeout] = DEFAULT_TIMEOUT):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self._host_settings: Dict[str, Dict[str, Any]] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+        # event loop -> {host: aiohttp.ClientSession}; async sessions cannot outlive their loop
+        self._async_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    def configure_host(self, host: str, pool_maxsize: Optional[int] = None, timeout: Optional[Timeout] = None) -> None:
+        """
+        Override pool size and/or default timeout for one host
+
+        Args:
+            host: Base URL of the host, e.g. "https://api.dexscreener.com"
+            pool_maxsize: Max keep-alive connections kept for the host
+            timeout: Default request timeout in seconds, or a (connect, read) pair,
+                when the caller passes none
+        """
+        key = self._host_key(host if "://" in host else f"https://{host}")
+        with self._lock:
+            settings = self._host_settings.setdefault(key, {})
+            if pool_maxsize is not None:
+                settings["pool_maxsize"] = pool_maxsize
+            if timeout is not None:
+                settings["timeout"] = timeout
+            # Rebuild the sessions on next use so the new settings apply
+            session = self._sessions.pop(key, None)
+            stale = [
+                (loop, clients.pop(key)) for loop, clients in self._async_sessions.items() if key in clients
+            ]
+        if session is not None:
+            session.close()
+        for loop, async_session in stale:
+            _close_async_session(loop, async_session)
+
+    def _setting(self, key: str, name: str) -> Any:
+        return self._host_settings.get(key, {}).get(name, getattr(self, name))
+
+    def get_session(self, url: str) -> requests.Session:
+        """Return the shared session for the url's host, creating it on first use"""
+        key = self._host_key(url)
+        session = self._sessions.get(key)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                pool_maxsize = self._setting(key, "pool_maxsize")
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[key] = session
+                logger.debug(f"Created HTTP pool for {key} (maxsize={pool_maxsize})")
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the host's pooled session"""
+        if "timeout" not in kwargs:
+            timeout = self._setting(self._host_key(url), "timeout")
+            if timeout is not None:
+                kwargs["timeout"] = timeout
+        return self.get_session(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    @staticmethod
+    def _client_timeout(timeout: Optional[Timeout]):
+        import aiohttp
+
+        if timeout is None:
+            return aiohttp.ClientTimeout(total=None)
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return aiohttp.ClientTimeout(total=None, sock_connect=connect, sock_read=read)
+        return aiohttp.ClientTimeout(total=timeout)
+
+    def get_async_session(self, url: str):
+        """
+        Return the pooled aiohttp.ClientSession for the url's host, bound to the running loop
+
+        aiohttp is imported lazily so sync-only processes never load it.
+        """
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        key = self._host_key(url)
+        with self._lock:
+            clients = self._async_sessions.setdefault(loop, {})
+            session = clients.get(key)
+            if session is None or session.closed:
+                pool_maxsize = self._setting(key, "pool_maxsize")
+                session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=pool_maxsize),
+                    timeout=self._client_timeout(self._setting(key, "timeout"))
+                )
+                clients[key] = session
+                logger.debug(f"Created async HTTP pool for {key} (maxsize={pool_maxsize})")
+        return session
+
+    async def arequest(self, method: str, url: str, **kwargs):
+        """
+        Send a request through the host's pooled aiohttp session
+
+        The response body is read before returning, so the caller gets a
+        released aiohttp.ClientResponse whose json()/text() can still be awaited.
+        """
+        if "timeout" in kwargs:
+            kwargs["timeout"] = self._client_timeout(kwargs["timeout"])
+        async with self.get_async_session(url).request(method, url, **kwargs) as response:
+            await response.read()
+        return response
+
+    async def aget(self, url: str, **kwargs):
+        return await self.arequest("GET", url, **kwargs)
+
+    async def apost(self, url: str, **kwargs):
+        return await self.arequest("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close the async sessions bound to the running loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_sessions.pop(loop, {})
+        for session in clients.values():
+            await session.close()
+
+    def close(self) -> None:
+        """Close all pooled sync sessions (async ones close with aclose() on their loop)"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+def _close_async_session(loop: asyncio.AbstractEventLoop, session) -> None:
+    """Close an aiohttp session from any thread, on the loop it belongs to"""
+    if loop.is_closed():
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        loop.create_task(session.close())
+    else:
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+
+http = HTTPTransport()
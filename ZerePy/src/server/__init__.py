@@ -1,7 +1,26 @@
+import logging
+import os
+
 import uvicorn
 from .app import create_app
+from src.helpers.shared_state import STATE_STORE_ENV
+
+logger = logging.getLogger("server")
+
+def start_server(host: str = "0.0.0.0", port: int = 8000, workers: int = 1):
+    """
+    Start the ZerePy server
+
+    With workers > 1, uvicorn runs that many processes; they share state
+    through the store named by ZEREPY_STATE_STORE (a local SQLite file by default).
+    """
+    if workers <= 1:
+        app = create_app()
+        uvicorn.run(app, host=host, port=port)
+        return
 
-def start_server(host: str = "0.0.0.0", port: int = 8000):
-    """Start the ZerePy server"""
-    app = create_app()
-    uvicorn.run(app, host=host, port=port)
\ No newline at end of file
+    # Worker processes inherit the environment, so they all open the same store
+    os.environ.setdefault(STATE_STORE_ENV, "sqlite")
+    if os.environ[STATE_STORE_ENV] == "memory":
+        logger.warning("ZEREPY_STATE_STORE=memory gives each worker its own state; use sqlite or redis")
+    uvicorn.run("src.server.app:create_app", factory=True, host=host, port=port, workers=workers)
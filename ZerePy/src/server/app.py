@@ -1,25 +1,49 @@
 import json
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import logging
 import asyncio
+import os
 import signal
+import socket
 import threading
+import time
 from pathlib import Path
 from src.cli import ZerePyCLI
+from src.connections.base_connection import is_successful_result
+from src.helpers.resilience import CircuitOpenError
+from src.helpers.shared_state import get_shared_store
+from src.helpers.transport import http
+from src.server.idempotency import IdempotencyConflict, IdempotencyStore
+from src.server.jobs import DEFAULT_MAX_PENDING, DEFAULT_WORKERS, FAILED, Job, JobQueue, JobQueueFull
 from datetime import datetime, timezone
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("server/app")
 
+# Set on responses replayed for a retried request instead of executed again
+REPLAYED_HEADER = "Idempotent-Replayed"
+# Shared store keys: the agent every worker should have loaded, and the owner of the agent loop
+AGENT_KEY = "server:agent"
+AGENT_LOOP_KEY = "server:agent_loop"
+# The loop owner renews its claim this often; a claim left by a dead worker expires after the TTL
+AGENT_LOOP_TTL = 30.0
+AGENT_LOOP_HEARTBEAT = 10.0
+
 class ActionRequest(BaseModel):
     """Request model for agent actions"""
     connection: str
     action: str
     params: Optional[List[str]] = []
 
+class BatchActionRequest(BaseModel):
+    """Request model for running several agent actions concurrently"""
+    actions: List[ActionRequest]
+    max_concurrency: Optional[Dict[str, int]] = None
+
 class ConfigureRequest(BaseModel):
     """Request model for configuring connections"""
     connection: str
@@ -41,27 +65,141 @@ class HabitFeedbackRequest(BaseModel):
     implementation_duration: Optional[int] = 0
 
 class ServerState:
-    """Simple state management for the server"""
+    """
+    Simple state management for the server
+
+    When ZEREPY_STATE_STORE is set (always, with several workers), the
+    loaded agent, agent loop, jobs and idempotency records are kept in the
+    shared store so every worker process answers the same way.
+    """
     def __init__(self):
         self.cli = ZerePyCLI()
+        self.store = get_shared_store()
+        self.agent_file: Optional[str] = None
         self.agent_running = False
         self.agent_task = None
         self._stop_event = threading.Event()
+        self._agent_lock = threading.Lock()
+        self._loop_owner = {"host": socket.gethostname(), "pid": os.getpid()}
+        self.jobs = JobQueue(
+            workers=int(os.getenv("ZEREPY_JOB_WORKERS", DEFAULT_WORKERS)),
+            max_pending=int(os.getenv("ZEREPY_JOB_MAX_PENDING", DEFAULT_MAX_PENDING)),
+            store=self.store
+        )
+        self.idempotency = IdempotencyStore(shared=self.store)
+
+    def _switch_agent(self, name: str) -> None:
+        """
+        Load the named agent unless it is the one already loaded
+
+        Raises:
+            ValueError: If the agent could not be loaded
+        """
+        # Loads run in worker threads; one at a time
+        with self._agent_lock:
+            if name == self.agent_file and self.cli.agent is not None:
+                return
+            previous = self.cli.agent
+            # Stops the previous agent's connection threads before the new ones start
+            self.cli._load_agent_from_file(name)
+            if self.cli.agent is None or self.cli.agent is previous:
+                if previous is not None:
+                    # Still serving the previous agent, so restart the threads its close() stopped
+                    self.on_agent_loaded()
+                raise ValueError(f"Could not load agent {name}")
+            self.agent_file = name
+            self.on_agent_loaded()
+
+    def activate_agent(self, name: str) -> None:
+        """Load an agent by name and make it the one every worker serves"""
+        self._switch_agent(name)
+        if self.store is not None:
+            self.store.set(AGENT_KEY, name)
 
     async def load_agent(self, name: str) -> bool:
         """Load an agent by name"""
         try:
-            self.cli._load_agent_from_file(name)
+            # Loading and the shared store write both block, so they run off the event loop
+            await asyncio.to_thread(self.activate_agent, name)
             return True
         except Exception as e:
             logger.error(f"Error loading agent {name}: {e}")
             return False
 
+    async def sync_agent(self) -> None:
+        """Load the agent another worker switched the deployment to, if it differs from ours"""
+        if self.store is None:
+            return
+        # Store reads can block (file locks, network), so they stay off the event loop
+        name = await asyncio.to_thread(self.store.get, AGENT_KEY)
+        if name and name != self.agent_file:
+            logger.info(f"Loading agent {name} selected by another worker")
+            try:
+                await asyncio.to_thread(self._switch_agent, name)
+            except Exception as e:
+                logger.error(f"Error loading agent {name}: {e}")
+
+    def is_agent_running(self) -> bool:
+        if self.store is not None:
+            return self.store.get(AGENT_LOOP_KEY) is not None
+        return self.agent_running
+
+    def on_agent_loaded(self):
+        """Warm per-connection readiness so action requests skip the network check"""
+        self.cli.agent.connection_manager.start_readiness_revalidators()
+
+    def close(self) -> None:
+        """Stop the agent loop and the loaded agent's background threads when the server shuts down"""
+        # The loop thread releases its shared claim on the way out
+        self._stop_event.set()
+        if self.cli.agent is not None:
+            self.cli.agent.connection_manager.close()
+
+    def ensure_available(self, *connection_names: str) -> None:
+        """Fail fast with 503 while any of the given upstreams has an open circuit"""
+        try:
+            for name in connection_names:
+                self.cli.agent.connection_manager.check_available(name)
+        except CircuitOpenError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(max(1, int(e.retry_in)))}
+            )
+
+    async def run_idempotent(self, scope: str, idempotency_key: Optional[str], data: Dict[str, Any],
+                             coro_fn, response: Response, reusable=None, fallback: bool = True) -> Any:
+        """Run a write once per Idempotency-Key (or identical body), replaying it for retries"""
+        try:
+            result, replayed = await self.idempotency.run(scope, idempotency_key, data, coro_fn, reusable, fallback)
+        except IdempotencyConflict as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if replayed:
+            response.headers[REPLAYED_HEADER] = "true"
+        return result
+
+    def _renew_loop_claim(self) -> bool:
+        """Extend this worker's claim on the agent loop; False once a stop elsewhere removed it"""
+        with self.store.lock(AGENT_LOOP_KEY):
+            if self.store.get(AGENT_LOOP_KEY) != self._loop_owner:
+                return False
+            self.store.set(AGENT_LOOP_KEY, self._loop_owner, ttl=AGENT_LOOP_TTL)
+            return True
+
     def _run_agent_loop(self):
         """Run agent loop in a separate thread"""
         try:
             log_once = False
+            renewed_at = time.monotonic()
             while not self._stop_event.is_set():
+                if self.store is not None:
+                    # A stop through another worker clears the shared claim
+                    if self.store.get(AGENT_LOOP_KEY) != self._loop_owner:
+                        break
+                    if time.monotonic() - renewed_at >= AGENT_LOOP_HEARTBEAT:
+                        if not self._renew_loop_claim():
+                            break
+                        renewed_at = time.monotonic()
                 if self.cli.agent:
                     try:
                         if not log_once:
@@ -72,12 +210,22 @@ class ServerState:
                         logger.error(f"Error in agent action: {e}")
                         if self._stop_event.wait(timeout=30):
                             break
+                if self._stop_event.wait(timeout=1):
+                    break
         except Exception as e:
             logger.error(f"Error in agent loop thread: {e}")
         finally:
             self.agent_running = False
+            if self.store is not None:
+                with self.store.lock(AGENT_LOOP_KEY):
+                    if self.store.get(AGENT_LOOP_KEY) == self._loop_owner:
+                        self.store.delete(AGENT_LOOP_KEY)
             logger.info("Agent loop stopped")
 
+    def _release_loop_claim(self) -> None:
+        with self.store.lock(AGENT_LOOP_KEY):
+            self.store.delete(AGENT_LOOP_KEY)
+
     async def start_agent_loop(self):
         """Start the agent loop in background thread"""
         if not self.cli.agent:
@@ -85,6 +233,10 @@ class ServerState:
         
         if self.agent_running:
             raise ValueError("Agent already running")
+        # Only one worker process runs the loop
+        if self.store is not None and not await asyncio.to_thread(
+                self.store.add, AGENT_LOOP_KEY, self._loop_owner, ttl=AGENT_LOOP_TTL):
+            raise ValueError("Agent already running")
 
         self.agent_running = True
         self._stop_event.clear()
@@ -93,6 +245,9 @@ class ServerState:
 
     async def stop_agent_loop(self):
         """Stop the agent loop"""
+        if self.store is not None:
+            # The owning worker's loop sees the claim gone and exits
+            await asyncio.to_thread(self._release_loop_claim)
         if self.agent_running:
             self._stop_event.set()
             if self.agent_task:
@@ -113,6 +268,19 @@ class ZerePyServer:
             allow_headers=["*"],
         )
         
+        if self.state.store is not None:
+            @self.app.middleware("http")
+            async def follow_shared_agent(request, call_next):
+                """Pick up an agent switch made through another worker process"""
+                await self.state.sync_agent()
+                return await call_next(request)
+
+        @self.app.on_event("shutdown")
+        async def shutdown():
+            await self.state.jobs.shutdown()
+            await http.aclose()
+            self.state.close()
+
         self.setup_routes()
 
     def setup_routes(self):
@@ -122,7 +290,7 @@ class ZerePyServer:
             return {
                 "status": "running",
                 "agent": self.state.cli.agent.name if self.state.cli.agent else None,
-                "agent_running": self.state.agent_running
+                "agent_running": await asyncio.to_thread(self.state.is_agent_running)
             }
 
         @self.app.get("/agents")
@@ -143,7 +311,7 @@ class ZerePyServer:
         async def load_agent(name: str):
             """Load a specific agent"""
             try:
-                self.state.cli._load_agent_from_file(name)
+                await asyncio.to_thread(self.state.activate_agent, name)
                 return {
                     "status": "success",
                     "agent": name
@@ -161,7 +329,7 @@ class ZerePyServer:
                 connections = {}
                 for name, conn in self.state.cli.agent.connection_manager.connections.items():
                     connections[name] = {
-                        "configured": conn.is_configured(),
+                        "configured": conn.is_ready(),
                         "is_llm_provider": conn.is_llm_provider
                     }
                 return {"connections": connections}
@@ -175,8 +343,7 @@ class ZerePyServer:
                 raise HTTPException(status_code=400, detail="No agent loaded")
             
             try:
-                result = await asyncio.to_thread(
-                    self.state.cli.agent.perform_action,
+                result = await self.state.cli.agent.aperform_action(
                     connection=action_request.connection,
                     action=action_request.action,
                     params=action_request.params
@@ -185,6 +352,50 @@ class ZerePyServer:
             except Exception as e:
                 raise HTTPException(status_code=400, detail=str(e))
 
+        @self.app.post("/agent/actions/batch")
+        async def agent_actions_batch(batch_request: BatchActionRequest):
+            """Execute several agent actions concurrently, reporting errors per action"""
+            if not self.state.cli.agent:
+                raise HTTPException(status_code=400, detail="No agent loaded")
+
+            try:
+                results = await self.state.cli.agent.aperform_actions(
+                    [(a.connection, a.action, a.params) for a in batch_request.actions],
+                    max_concurrency=batch_request.max_concurrency
+                )
+                return {"status": "success", "results": results}
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        @self.app.get("/cache/stats")
+        async def cache_stats():
+            """Response cache hit/miss counters per connection action"""
+            if not self.state.cli.agent:
+                raise HTTPException(status_code=400, detail="No agent loaded")
+            return {"cache": self.state.cli.agent.connection_manager.response_cache.stats()}
+
+        @self.app.get("/health/breakers")
+        async def breaker_states():
+            """Circuit breaker state per connection"""
+            if not self.state.cli.agent:
+                raise HTTPException(status_code=400, detail="No agent loaded")
+            return {"breakers": self.state.cli.agent.connection_manager.breaker_states()}
+
+        @self.app.get("/tx/{tx_hash}/status")
+        async def transaction_status(tx_hash: str, wait: Optional[float] = None):
+            """Confirmation status of a Sonic transaction; ?wait=N waits up to N seconds for one this server sent"""
+            if not self.state.cli.agent:
+                raise HTTPException(status_code=400, detail="No agent loaded")
+            params = [tx_hash] if wait is None else [tx_hash, str(min(wait, 60.0))]
+            try:
+                return await self.state.cli.agent.aperform_action(
+                    connection="sonic",
+                    action="get-transaction-status",
+                    params=params
+                )
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+
         @self.app.post("/agent/start")
         async def start_agent():
             """Start the agent loop"""
@@ -218,6 +429,7 @@ class ZerePyServer:
                     raise HTTPException(status_code=404, detail=f"Connection {name} not found")
                 
                 success = connection.configure(**config.params)
+                connection.invalidate_readiness()
                 if success:
                     return {"status": "success", "message": f"Connection {name} configured successfully"}
                 else:
@@ -239,123 +451,288 @@ class ZerePyServer:
                     
                 return {
                     "name": name,
-                    "configured": connection.is_configured(verbose=True),
+                    "configured": connection.refresh_readiness(verbose=True),
                     "is_llm_provider": connection.is_llm_provider
                 }
                 
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
-        @self.app.post("/analyze")
-        async def analyze_behavior(request: BehaviorRequest):
-            """Analyze behavior and suggest habits"""
-            if not self.state.cli.agent:
-                if not await self.state.load_agent("mentalhealthai"):
-                    raise HTTPException(status_code=400, detail="No agent loaded. Please load an agent first.")
-            
+        def health_metrics_for(request: BehaviorRequest) -> str:
+            """suggest-daily-habits input built from the questionnaire answers"""
+            return json.dumps({
+                "Current Behavior": request.current_behavior,
+                "Trigger Situations": request.trigger_situations,
+                "Consequences": request.consequences,
+                "Previous Attempts": request.previous_attempts
+            })
+
+        async def store_analysis(request: BehaviorRequest, analysis: str) -> Dict[str, Any]:
+            """Store the answers and their analysis on Sonic, returning the /analyze response"""
+            # Prepare user data for storage
+            user_responses = {
+                "current_behavior": request.current_behavior,
+                "trigger_situations": request.trigger_situations,
+                "consequences": request.consequences,
+                "previous_attempts": request.previous_attempts
+            }
+
             try:
-                # Prepare user data for storage
-                user_responses = {
-                    "current_behavior": request.current_behavior,
-                    "trigger_situations": request.trigger_situations,
-                    "consequences": request.consequences,
-                    "previous_attempts": request.previous_attempts
+                storage_data = {
+                    "user_id": request.user_id,
+                    "responses": user_responses,
+                    "analysis": analysis,
+                    "timestamp": datetime.now(timezone.utc).isoformat()
                 }
 
-                # Use suggest-daily-habits action directly
-                health_metrics = {
-                    "Current Behavior": request.current_behavior,
-                    "Trigger Situations": request.trigger_situations,
-                    "Consequences": request.consequences,
-                    "Previous Attempts": request.previous_attempts
-                }
+                tx_hash = await self.state.cli.agent.aperform_action(
+                    connection="sonic",
+                    action="store-data",
+                    params=[json.dumps(storage_data), "behavior_analysis"]
+                )
                 
+                if not tx_hash:
+                    raise Exception("Failed to store data on blockchain")
+                    
+            except Exception as e:
+                logger.error(f"Failed to store analysis on blockchain: {e}")
+                raise HTTPException(
+                    status_code=500, 
+                    detail="Analysis completed but storage failed"
+                )
+
+            return {
+                "status": "success",
+                "analysis": analysis,
+                "message": "Behavioral analysis completed and stored successfully",
+                "blockchain_tx": tx_hash,
+                "user_responses": user_responses
+            }
+
+        async def run_analysis(request: BehaviorRequest, job: Optional[Job] = None) -> Dict[str, Any]:
+            """Generate the analysis with EternalAI, then store it on Sonic"""
+            try:
+                if job:
+                    job.set_stage("generating")
                 logger.info("Calling suggest-daily-habits action")
                 result = await asyncio.wait_for(
-                    asyncio.to_thread(
-                        self.state.cli.agent.perform_action,
+                    self.state.cli.agent.aperform_action(
                         connection="eternalai",
                         action="suggest-daily-habits",
-                        params=[json.dumps(health_metrics)]
+                        params=[health_metrics_for(request)]
                     ),
                     timeout=100.0
                 )
                 
                 if not result:
                     raise HTTPException(status_code=400, detail="Failed to generate analysis")
-                
+
+                if job:
+                    job.set_stage("storing")
+                return await store_analysis(request, result)
+
+            except HTTPException:
+                raise
+            except asyncio.TimeoutError as e:
+                logger.error("Request to EternalAI timed out")
+                self.state.cli.agent.connection_manager.record_failure("eternalai", e)
+                raise HTTPException(status_code=504, detail="Request timed out")
+            except Exception as e:
+                logger.error(f"Error in analyze_behavior: {e}")
+                raise HTTPException(status_code=500, detail=str(e))
+
+        @self.app.post("/analyze")
+        async def analyze_behavior(
+            request: BehaviorRequest,
+            response: Response,
+            wait: bool = False,
+            idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+        ):
+            """
+            Analyze behavior and suggest habits. Queues a job and answers 202 with
+            its id; ?wait=true runs the pipeline inline and returns the result.
+            Retries with the same Idempotency-Key (or body) get the same job.
+            """
+            if not self.state.cli.agent:
+                if not await self.state.load_agent("mentalhealthai"):
+                    raise HTTPException(status_code=400, detail="No agent loaded. Please load an agent first.")
+
+            # Answer immediately instead of waiting out the timeout on a known-down upstream
+            self.state.ensure_available("eternalai", "sonic")
+
+            async def submit() -> Dict[str, Any]:
+                if wait:
+                    return await run_analysis(request)
+
                 try:
-                    storage_data = {
-                        "user_id": request.user_id,
-                        "responses": user_responses,
-                        "analysis": result,
+                    job = self.state.jobs.submit("analyze", lambda job: run_analysis(request, job))
+                except JobQueueFull as e:
+                    raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+                return {
+                    "status": "accepted",
+                    "job_id": job.id,
+                    "status_url": f"/jobs/{job.id}",
+                    "events_url": f"/jobs/{job.id}/events"
+                }
+
+            def job_reusable(result: Dict[str, Any]) -> bool:
+                # A retry after the job failed (or expired) starts a new one
+                if "job_id" not in result:
+                    return True
+                job = self.state.jobs.status(result["job_id"])
+                return job is not None and job["status"] != FAILED
+
+            result = await self.state.run_idempotent(
+                "POST /analyze", idempotency_key, {**dict(request), "wait": wait},
+                submit, response, reusable=job_reusable
+            )
+            if "job_id" in result:
+                response.status_code = 202
+            return result
+
+        @self.app.post("/analyze/stream")
+        async def analyze_behavior_stream(request: BehaviorRequest):
+            """
+            Analyze behavior as Server-Sent Events: "delta" events carry the
+            analysis as it is generated, then "stage" marks the Sonic write and
+            "done" carries the same body POST /analyze returns ("error" on failure)
+            """
+            if not self.state.cli.agent:
+                if not await self.state.load_agent("mentalhealthai"):
+                    raise HTTPException(status_code=400, detail="No agent loaded. Please load an agent first.")
+
+            self.state.ensure_available("eternalai", "sonic")
+
+            def sse(event: str, data: Dict[str, Any]) -> str:
+                return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+            async def stream():
+                chunks = []
+                try:
+                    logger.info("Streaming stream-daily-habits action")
+                    async for delta in self.state.cli.agent.astream_action(
+                        connection="eternalai",
+                        action="stream-daily-habits",
+                        params=[health_metrics_for(request)]
+                    ):
+                        chunks.append(delta)
+                        yield sse("delta", {"text": delta})
+                except Exception as e:
+                    logger.error(f"Error streaming analysis: {e}")
+                    yield sse("error", {"status_code": 502, "detail": f"Analysis failed: {e}"})
+                    return
+
+                analysis = "".join(chunks).strip()
+                if not analysis:
+                    yield sse("error", {"status_code": 400, "detail": "Failed to generate analysis"})
+                    return
+
+                yield sse("stage", {"stage": "storing"})
+                # Shielded so a client that disconnects now still gets its analysis stored
+                store = asyncio.ensure_future(store_analysis(request, analysis))
+                try:
+                    result = await asyncio.shield(store)
+                except HTTPException as e:
+                    yield sse("error", {"status_code": e.status_code, "detail": e.detail})
+                    return
+                yield sse("done", result)
+
+            return StreamingResponse(
+                stream(),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+
+        @self.app.get("/jobs/metrics")
+        async def job_metrics():
+            """
+            Job queue depth, worker usage and outcome counters of the worker
+            process that answers ("pid"); with several workers each one
+            reports only its own queue and idempotency records
+            """
+            return {"jobs": self.state.jobs.metrics(), "idempotency": self.state.idempotency.stats()}
+
+        @self.app.get("/jobs/{job_id}")
+        async def job_status(job_id: str, wait: Optional[float] = None):
+            """State of a queued job; ?wait=N waits up to N seconds for it to finish"""
+            if wait:
+                status = await self.state.jobs.wait_status(job_id, min(wait, 60.0))
+            else:
+                status = await self.state.jobs.astatus(job_id)
+            if status is None:
+                raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+            return status
+
+        @self.app.get("/jobs/{job_id}/events")
+        async def job_events(job_id: str):
+            """Server-Sent Events stream of a job's stage changes, ending when it finishes"""
+            if await self.state.jobs.astatus(job_id) is None:
+                raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+            async def stream():
+                async for event in self.state.jobs.watch(job_id, idle_timeout=15.0):
+                    if event is None:
+                        # Comment line keeps proxies from closing an idle stream
+                        yield ": keep-alive\n\n"
+                    else:
+                        yield f"event: {event['status']}\ndata: {json.dumps(event)}\n\n"
+
+            return StreamingResponse(
+                stream(),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+
+        @self.app.patch("/habits/{habit_id}")
+        async def update_habit(
+            habit_id: str,
+            user_id: str,
+            completed: bool,
+            response: Response,
+            idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+        ):
+            """Update habit completion status"""
+            if not self.state.cli.agent:
+                raise HTTPException(status_code=400, detail="No agent loaded")
+
+            async def store() -> Dict[str, Any]:
+                try:
+                    habit_data = {
+                        "user_id": user_id,
+                        "habit_id": habit_id,
+                        "completed": completed,
                         "timestamp": datetime.now(timezone.utc).isoformat()
                     }
                     
-                    tx_hash = await asyncio.to_thread(
-                        self.state.cli.agent.perform_action,
+                    tx_hash = await self.state.cli.agent.aperform_action(
                         connection="sonic",
                         action="store-data",
-                        params=[json.dumps(storage_data), "behavior_analysis"]
+                        params=[json.dumps(habit_data), "habit_completion"]
                     )
-                    
+
                     if not tx_hash:
                         raise Exception("Failed to store data on blockchain")
-                        
+
                     return {
                         "status": "success",
-                        "analysis": result,
-                        "message": "Behavioral analysis completed and stored successfully",
-                        "blockchain_tx": tx_hash,
-                        "user_responses": user_responses
+                        "message": "Habit update stored successfully",
+                        "blockchain_tx": tx_hash
                     }
-                    
                 except Exception as e:
-                    logger.error(f"Failed to store analysis on blockchain: {e}")
-                    raise HTTPException(
-                        status_code=500, 
-                        detail="Analysis completed but storage failed"
-                    )
-                    
-            except asyncio.TimeoutError:
-                logger.error("Request to EternalAI timed out")
-                raise HTTPException(status_code=504, detail="Request timed out")
-            except Exception as e:
-                logger.error(f"Error in analyze_behavior: {e}")
-                raise HTTPException(status_code=500, detail=str(e))
+                    logger.error(f"Error updating habit: {e}")
+                    raise HTTPException(status_code=500, detail=str(e))
 
-        @self.app.patch("/habits/{habit_id}")
-        async def update_habit(habit_id: str, user_id: str, completed: bool):
-            """Update habit completion status"""
-            if not self.state.cli.agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
-            
-            try:
-                habit_data = {
-                    "user_id": user_id,
-                    "habit_id": habit_id,
-                    "completed": completed,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }
-                
-                tx_hash = await asyncio.to_thread(
-                    self.state.cli.agent.perform_action,
-                    connection="sonic",
-                    action="store-data",
-                    params=[json.dumps(habit_data), "habit_completion"]
-                )
-
-                if not tx_hash:
-                    raise Exception("Failed to store data on blockchain")
-
-                return {
-                    "status": "success",
-                    "message": "Habit update stored successfully",
-                    "blockchain_tx": tx_hash
-                }
-            except Exception as e:
-                logger.error(f"Error updating habit: {e}")
-                raise HTTPException(status_code=500, detail=str(e))
+            # Toggling a habit back and forth repeats the same body on purpose,
+            # so only requests with an Idempotency-Key are deduplicated
+            return await self.state.run_idempotent(
+                "PATCH /habits",
+                idempotency_key,
+                {"habit_id": habit_id, "user_id": user_id, "completed": completed},
+                store,
+                response,
+                fallback=False
+            )
 
         @self.app.get("/habits/progress/{user_id}")
         async def get_progress(user_id: str):
@@ -364,8 +741,7 @@ class ZerePyServer:
                 raise HTTPException(status_code=400, detail="No agent loaded")
             
             try:
-                stored_data = await asyncio.to_thread(
-                    self.state.cli.agent.perform_action,
+                stored_data = await self.state.cli.agent.aperform_action(
                     connection="sonic",
                     action="get-stored-data",
                     params=[user_id, "habit_completion"]  
@@ -392,8 +768,7 @@ class ZerePyServer:
                 raise HTTPException(status_code=400, detail="Transaction hash is required")
             
             try:
-                stored_data = await asyncio.to_thread(
-                    self.state.cli.agent.perform_action,
+                stored_data = await self.state.cli.agent.aperform_action(
                     connection="sonic",
                     action="get-stored-data",
                     params=[user_id, "behavior_analysis", tx_hash]
@@ -447,37 +822,47 @@ class ZerePyServer:
                 raise HTTPException(status_code=500, detail=str(e))
 
         @self.app.post("/habits/feedback")
-        async def submit_habit_feedback(feedback_request: HabitFeedbackRequest):
+        async def submit_habit_feedback(
+            feedback_request: HabitFeedbackRequest,
+            response: Response,
+            idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+        ):
             """Submit feedback about a habit's effectiveness"""
             if not self.state.cli.agent:
                 if not await self.state.load_agent("mentalhealthai"):
                     raise HTTPException(status_code=400, detail="No agent loaded. Please load an agent first.")
-            
-            try:
-                # Convertendo para lista de parâmetros
-                params = [
-                    feedback_request.habit_id,
-                    feedback_request.patient_id,
-                    feedback_request.effectiveness,
-                    feedback_request.feedback,
-                    feedback_request.implementation_duration
-                ]
-                
-                result = await asyncio.to_thread(
-                    self.state.cli.agent.perform_action,
-                    connection="allora",
-                    action="submit-habit-feedback",
-                    params=params
-                )
-                
-                return {
-                    "status": "success",
-                    "message": "Feedback submitted successfully",
-                    "result": result
-                }
-            except Exception as e:
-                logger.error(f"Error submitting habit feedback: {e}")
-                raise HTTPException(status_code=500, detail=str(e))
+
+            async def submit() -> Dict[str, Any]:
+                try:
+                    # Convertendo para lista de parâmetros
+                    params = [
+                        feedback_request.habit_id,
+                        feedback_request.patient_id,
+                        feedback_request.effectiveness,
+                        feedback_request.feedback,
+                        feedback_request.implementation_duration
+                    ]
+                    
+                    result = await self.state.cli.agent.aperform_action(
+                        connection="allora",
+                        action="submit-habit-feedback",
+                        params=params
+                    )
+                    
+                    return {
+                        "status": "success",
+                        "message": "Feedback submitted successfully",
+                        "result": result
+                    }
+                except Exception as e:
+                    logger.error(f"Error submitting habit feedback: {e}")
+                    raise HTTPException(status_code=500, detail=str(e))
+
+            # A failed submission comes back as a {"status": "error"} result; let a retry run it again
+            return await self.state.run_idempotent(
+                "POST /habits/feedback", idempotency_key, dict(feedback_request), submit, response,
+                reusable=lambda result: is_successful_result(result["result"])
+            )
 
         @self.app.get("/habits/insights")
         async def get_collective_insights():
@@ -487,8 +872,7 @@ class ZerePyServer:
                     raise HTTPException(status_code=400, detail="No agent loaded. Please load an agent first.")
             
             try:
-                insights = await asyncio.to_thread(
-                    self.state.cli.agent.perform_action,
+                insights = await self.state.cli.agent.aperform_action(
                     connection="allora",
                     action="get-collective-insights",
                     params=[]
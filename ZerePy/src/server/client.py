@@ -1,5 +1,6 @@
 import requests
-from typing import Optional, List, Dict, Any
+from src.helpers.transport import http
+from typing import Optional, List, Dict, Any, Tuple
 
 class ZerePyClient:
     def __init__(self, base_url: str = "http://localhost:8000"):
@@ -9,7 +10,7 @@ class ZerePyClient:
         """Make HTTP request with error handling"""
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         try:
-            response = requests.request(method, url, **kwargs)
+            response = http.request(method, url, **kwargs)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -41,6 +42,19 @@ class ZerePyClient:
         }
         return self._make_request("POST", "/agent/action", json=data)
 
+    def perform_actions(self, actions: List[Tuple[str, str, Optional[List[str]]]],
+                        max_concurrency: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """Execute several agent actions concurrently, one result per (connection, action, params)"""
+        data = {
+            "actions": [
+                {"connection": connection, "action": action, "params": params or []}
+                for connection, action, params in actions
+            ],
+            "max_concurrency": max_concurrency
+        }
+        response = self._make_request("POST", "/agent/actions/batch", json=data)
+        return response.get("results", [])
+
     def start_agent(self) -> Dict[str, Any]:
         """Start the agent loop"""
         return self._make_request("POST", "/agent/start")
@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.helpers.cache import normalize_params
+from src.helpers.shared_state import SharedStore
+
+logger = logging.getLogger("server/idempotency")
+
+# Results for a client-supplied Idempotency-Key are replayed this long
+DEFAULT_KEY_TTL = 24 * 3600.0
+# Without a key, identical requests only count as retries inside this window,
+# so a user repeating an action on purpose later is not deduplicated
+DEFAULT_FALLBACK_TTL = 120.0
+DEFAULT_MAX_ENTRIES = 10000
+# How long another worker's in-flight claim on a key is honoured before it is presumed dead
+PENDING_TTL = 300.0
+REMOTE_POLL_INTERVAL = 0.5
+
+
+class IdempotencyConflict(Exception):
+    """Raised when an Idempotency-Key is reused with a different request"""
+    pass
+
+
+def request_fingerprint(scope: str, data: Dict[str, Any]) -> str:
+    """Hash of a request's route and parameters (body plus path and query values)"""
+    return hashlib.sha256(f"{scope}\n{normalize_params(data)}".encode()).hexdigest()
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    task: asyncio.Task
+    expires_at: float
+
+
+class IdempotencyStore:
+    """
+    Replays the outcome of write requests retried by clients.
+
+    The first request for a key runs; retries that arrive while it is in
+    flight attach to the same task, and later ones get its stored result
+    until the entry expires. The shared execution runs as its own task, so
+    a client that disconnects does not cancel it for its retry. Failures
+    are not stored, so a retry after an error runs again.
+
+    With a SharedStore, keys are also claimed there, so a retry that lands
+    on another worker process waits for and replays the same outcome.
+    """
+
+    def __init__(self, key_ttl: float = DEFAULT_KEY_TTL, fallback_ttl: float = DEFAULT_FALLBACK_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, shared: Optional[SharedStore] = None):
+        self.shared = shared
+        self.key_ttl = key_ttl
+        self.fallback_ttl = fallback_ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, _Entry] = {}
+        self.executed = 0
+        self.replayed = 0
+
+    async def run(self, scope: str, idempotency_key: Optional[str], data: Dict[str, Any],
+                  coro_fn: Callable[[], Awaitable[Any]],
+                  reusable: Optional[Callable[[Any], bool]] = None,
+                  fallback: bool = True) -> Tuple[Any, bool]:
+        """
+        Run coro_fn once per key and return (result, replayed)
+
+        Args:
+            scope: Route the key belongs to, e.g. "POST /analyze"
+            idempotency_key: The client's Idempotency-Key header; falls back
+                to the request fingerprint when missing
+            data: Request parameters, fingerprinted to detect key reuse
+            reusable: Optional check on a stored result; False runs the request again.
+                Called in a worker thread, so it may block
+            fallback: False for requests a client may legitimately repeat with
+                the same body (e.g. toggles), which are then only deduplicated
+                when they carry an Idempotency-Key
+
+        Raises:
+            IdempotencyConflict: If the key was used for a different request
+        """
+        if not idempotency_key and not fallback:
+            self.executed += 1
+            return await coro_fn(), False
+
+        fingerprint = request_fingerprint(scope, data)
+        if idempotency_key:
+            key, ttl = f"{scope}:key:{idempotency_key}", self.key_ttl
+        else:
+            key, ttl = f"{scope}:body:{fingerprint}", self.fallback_ttl
+
+        self._prune()
+        entry = self._entries.get(key)
+        if entry is not None and entry.task.get_loop() is not asyncio.get_running_loop():
+            entry = None
+        if entry is not None and entry.task.done() and (entry.task.cancelled() or entry.task.exception() is not None):
+            # Failed, and _settle has not dropped it yet: run the request again
+            entry = None
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyConflict(f"Idempotency-Key '{idempotency_key}' was used for a different request")
+            # reusable may read the shared store, so it runs in a thread like in _claim_shared
+            if (not entry.task.done() or reusable is None
+                    or await asyncio.to_thread(reusable, entry.task.result())):
+                self.replayed += 1
+                logger.info(f"Replaying {scope} for idempotency key {key[len(scope) + 1:][:24]}")
+                return await asyncio.shield(entry.task), True
+
+        if self.shared is not None:
+            stored = await self._claim_shared(key, fingerprint, idempotency_key, reusable)
+            if stored is not None:
+                self.replayed += 1
+                return stored["result"], True
+
+        task = asyncio.ensure_future(coro_fn())
+        self._entries[key] = _Entry(fingerprint, task, time.monotonic() + ttl)
+        task.add_done_callback(lambda t: self._settle(key, fingerprint, ttl, t))
+        self.executed += 1
+        return await asyncio.shield(task), False
+
+    async def _claim_shared(self, key: str, fingerprint: str, idempotency_key: Optional[str],
+                            reusable: Optional[Callable[[Any], bool]]) -> Optional[Dict[str, Any]]:
+        """
+        Claim key in the shared store for this worker, or return the record of
+        another worker's finished run to replay, waiting while it is in flight.
+        Store calls (and reusable, which may read the store) run in a thread
+        so they never block the event loop.
+        """
+        record_key = f"idempotency:{key}"
+        pending = {"fingerprint": fingerprint, "state": "pending"}
+        while not await asyncio.to_thread(self.shared.add, record_key, pending, ttl=PENDING_TTL):
+            record = await asyncio.to_thread(self.shared.get, record_key)
+            if record is None:
+                continue
+            if record["fingerprint"] != fingerprint:
+                raise IdempotencyConflict(f"Idempotency-Key '{idempotency_key}' was used for a different request")
+            if record["state"] == "done":
+                if reusable is None or await asyncio.to_thread(reusable, record["result"]):
+                    return record
+                await asyncio.to_thread(self.shared.delete, record_key)
+                continue
+            await asyncio.sleep(REMOTE_POLL_INTERVAL)
+        return None
+
+    def _record_shared(self, key: str, record: Optional[Dict[str, Any]], ttl: float) -> None:
+        """Store a finished run's record for other workers, or drop the claim of a failed one"""
+        record_key = f"idempotency:{key}"
+        try:
+            if record is None:
+                self.shared.delete(record_key)
+            else:
+                self.shared.set(record_key, record, ttl)
+        except Exception as e:
+            # Other workers fall back to running the request themselves once the claim expires
+            logger.warning(f"Could not record idempotency key {key}: {e}")
+            try:
+                self.shared.delete(record_key)
+            except Exception:
+                pass
+
+    def _settle(self, key: str, fingerprint: str, ttl: float, task: asyncio.Task) -> None:
+        failed = task.cancelled() or task.exception() is not None
+        if self.shared is not None:
+            record = None if failed else {"fingerprint": fingerprint, "state": "done", "result": task.result()}
+            # Done callbacks run on the event loop; the store write goes to a thread
+            task.get_loop().run_in_executor(None, self._record_shared, key, record, ttl)
+
+        entry = self._entries.get(key)
+        if entry is None or entry.task is not task:
+            return
+        if failed:
+            del self._entries[key]
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry.task.done() and entry.expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        if len(self._entries) > self.max_entries:
+            # Evict the finished entries closest to expiry first
+            finished = sorted(
+                (key for key, entry in self._entries.items() if entry.task.done()),
+                key=lambda k: self._entries[k].expires_at
+            )
+            for key in finished[:len(self._entries) - self.max_entries]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "executed": self.executed, "replayed": self.replayed}
@@ -0,0 +1,320 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from src.helpers.shared_state import SharedStore
+
+logger = logging.getLogger("server/jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 100
+# Finished jobs stay readable this long, so a client that reconnects still gets its result
+DEFAULT_RESULT_TTL = 3600.0
+# How often a worker re-reads a job another worker process is running
+REMOTE_POLL_INTERVAL = 0.5
+
+
+class JobQueueFull(Exception):
+    """Raised when the queue already holds max_pending jobs"""
+    pass
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat() if timestamp else None
+
+
+@dataclass
+class Job:
+    """One queued unit of work and where it is up to"""
+    id: str
+    kind: str
+    run: Callable[["Job"], Awaitable[Any]]
+    status: str = QUEUED
+    stage: Optional[str] = None
+    result: Any = None
+    error: Optional[str] = None
+    error_status: Optional[int] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _subscribers: List[asyncio.Queue] = field(default_factory=list, repr=False)
+    _done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _listener: Optional[Callable[["Job"], None]] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def set_stage(self, stage: str) -> None:
+        """Called by the job function as it moves between stages"""
+        self.stage = stage
+        self._emit()
+
+    def _emit(self) -> None:
+        event = self.to_dict()
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+        if self._listener is not None:
+            self._listener(self)
+        if self.finished:
+            self._done.set()
+
+    async def wait(self, timeout: float) -> None:
+        """Wait up to timeout seconds for the job to finish"""
+        try:
+            await asyncio.wait_for(asyncio.shield(self._done.wait()), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def events(self, idle_timeout: Optional[float] = None) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        The current state, then every change until the job finishes; yields
+        None after idle_timeout seconds without a change
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        try:
+            event = self.to_dict()
+            while True:
+                yield event
+                if event is not None and event["status"] in FINISHED:
+                    return
+                try:
+                    event = await asyncio.wait_for(queue.get(), idle_timeout)
+                except asyncio.TimeoutError:
+                    event = None
+        finally:
+            self._subscribers.remove(queue)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "result": self.result,
+            "error": self.error,
+            "error_status": self.error_status,
+            "created_at": _iso(self.created_at),
+            "started_at": _iso(self.started_at),
+            "finished_at": _iso(self.finished_at),
+        }
+
+
+class JobQueue:
+    """
+    Bounded worker pool for long-running requests.
+
+    submit() enqueues a coroutine function and returns its Job at once;
+    `workers` tasks run jobs in FIFO order. Clients read the outcome with
+    get() / Job.wait() or follow Job.events(). At most max_pending jobs
+    may wait for a worker, so overload is refused instead of piling up.
+
+    With a SharedStore, every state change is also published there, so
+    status() / wait_status() / watch() answer for jobs that another
+    server worker process is running.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING,
+                 result_ttl: float = DEFAULT_RESULT_TTL, store: Optional[SharedStore] = None):
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self.running = 0
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self._wait_time = 0.0
+        self._run_time = 0.0
+        # One thread writes job states to the store, in order and off the event loop
+        self._publisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-publish") if store else None
+
+    def _start(self) -> None:
+        # Created lazily so the queue and workers belong to the server's running loop
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    def submit(self, kind: str, run: Callable[[Job], Awaitable[Any]]) -> Job:
+        """
+        Enqueue run(job) and return the job
+
+        Raises:
+            JobQueueFull: If max_pending jobs are already waiting
+        """
+        if self._queue is None:
+            self._start()
+        self._prune()
+        job = Job(id=uuid.uuid4().hex, kind=kind, run=run)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise JobQueueFull(f"Job queue is full ({self.max_pending} pending)")
+        self.jobs[job.id] = job
+        self.submitted += 1
+        if self.store is not None:
+            job._listener = self._publish
+            self._publish(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """A job this process runs"""
+        return self.jobs.get(job_id)
+
+    def _publish(self, job: Job) -> None:
+        self._publisher.submit(self._write_state, job.id, job.to_dict())
+
+    def _write_state(self, job_id: str, state: Dict[str, Any]) -> None:
+        try:
+            self.store.set(f"job:{job_id}", state, ttl=self.result_ttl)
+        except Exception as e:
+            logger.warning(f"Could not publish job {job_id} to the shared store: {e}")
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """State of a job run by this or (with a shared store) any other worker"""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.store is not None:
+            return self.store.get(f"job:{job_id}")
+        return None
+
+    async def astatus(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """status(), reading another worker's job from the store off the event loop"""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.store is not None:
+            return await asyncio.to_thread(self.store.get, f"job:{job_id}")
+        return None
+
+    async def wait_status(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """status(), after waiting up to timeout seconds for the job to finish"""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            if not job.finished:
+                await job.wait(timeout)
+            return job.to_dict()
+
+        deadline = time.monotonic() + timeout
+        status = await self.astatus(job_id)
+        while status is not None and status["status"] not in FINISHED and time.monotonic() < deadline:
+            await asyncio.sleep(REMOTE_POLL_INTERVAL)
+            status = await self.astatus(job_id)
+        return status
+
+    async def watch(self, job_id: str, idle_timeout: Optional[float] = None) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Job.events() for a job run by this or any other worker"""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            async for event in job.events(idle_timeout):
+                yield event
+            return
+
+        last = None
+        idle_since = time.monotonic()
+        while True:
+            status = await self.astatus(job_id)
+            if status is None:
+                return
+            if status != last:
+                last, idle_since = status, time.monotonic()
+                yield status
+                if status["status"] in FINISHED:
+                    return
+            elif idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                idle_since = time.monotonic()
+                yield None
+            await asyncio.sleep(REMOTE_POLL_INTERVAL)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._execute(job)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job: Job) -> None:
+        job.started_at = time.time()
+        job.status = RUNNING
+        self.running += 1
+        self._wait_time += job.started_at - job.created_at
+        job._emit()
+        try:
+            job.result = await job.run(job)
+            job.status = SUCCEEDED
+            self.succeeded += 1
+        except Exception as e:
+            # HTTPException-style errors keep their status code and detail for the client
+            job.error = str(getattr(e, "detail", None) or e)
+            job.error_status = getattr(e, "status_code", 500)
+            job.status = FAILED
+            self.failed += 1
+            logger.error(f"Job {job.id} ({job.kind}) failed: {job.error}")
+        finally:
+            self.running -= 1
+            job.finished_at = time.time()
+            self._run_time += job.finished_at - job.started_at
+            job._emit()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self.jobs.items() if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters of this process's queue; other worker processes keep their own"""
+        finished = self.succeeded + self.failed
+        return {
+            "pid": os.getpid(),
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait_seconds": round(self._wait_time / (finished + self.running), 3) if finished + self.running else None,
+            "avg_run_seconds": round(self._run_time / finished, 3) if finished else None,
+        }
+
+    async def shutdown(self) -> None:
+        """Cancel the workers and fail the jobs they had not finished"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            if not job.finished:
+                job.error = "Server shut down before the job finished"
+                job.error_status = 503
+                job.status = FAILED
+                job.finished_at = time.time()
+                job._emit()
+        if self._publisher is not None:
+            # Let the final states reach the store before the process exits
+            await asyncio.wrap_future(self._publisher.submit(lambda: None))
+        self._tasks = []
+        self._queue = None
@@ -0,0 +1,38 @@
+import pytest
+
+from src.helpers.sonic.batcher import merkle_root_and_proofs, verify_proof
+
+
+def make_records(count):
+    return [{"type": "habit_completion", "data": f'{{"user_id": "u{i}"}}', "timestamp": i} for i in range(count)]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 4, 5, 8, 13])
+def test_every_record_verifies_against_the_root(count):
+    records = make_records(count)
+    root, proofs = merkle_root_and_proofs(records)
+    assert len(proofs) == count
+    for record, proof in zip(records, proofs):
+        assert verify_proof(record, proof, root)
+
+
+def test_root_does_not_depend_on_key_order():
+    record = {"type": "habit_completion", "data": "{}", "timestamp": 1}
+    reordered = {"timestamp": 1, "data": "{}", "type": "habit_completion"}
+    assert merkle_root_and_proofs([record])[0] == merkle_root_and_proofs([reordered])[0]
+
+
+def test_tampered_record_fails_verification():
+    records = make_records(5)
+    root, proofs = merkle_root_and_proofs(records)
+    tampered = dict(records[2], data='{"user_id": "mallory"}')
+    assert not verify_proof(tampered, proofs[2], root)
+
+
+def test_proof_is_bound_to_its_root_and_record():
+    records = make_records(4)
+    root, proofs = merkle_root_and_proofs(records)
+    other_root, _ = merkle_root_and_proofs(make_records(5))
+    assert not verify_proof(records[0], proofs[0], other_root)
+    assert not verify_proof(records[0], proofs[1], root)
+
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from src.helpers.sonic.envelope import (
+    COMPRESSION_NONE, COMPRESSION_ZLIB, FORMAT_JSON, MAGIC, EnvelopeCodec, EnvelopeError,
+    decode_payload, is_envelope, iter_records
+)
+
+ANALYSIS = {
+    "type": "behavior_analysis",
+    "data": json.dumps({"user_id": "u1", "analysis": "Keep a steady bedtime. " * 40}),
+    "timestamp": 1700000000,
+}
+HABIT = {"type": "habit_completion", "data": '{"user_id": "u1", "habit": "walk"}', "timestamp": 1700000001}
+
+
+@pytest.fixture(params=["default", "json-zlib", "json-plain"])
+def codec(request):
+    if request.param == "json-zlib":
+        return EnvelopeCodec(body_format=FORMAT_JSON, compression=COMPRESSION_ZLIB)
+    if request.param == "json-plain":
+        return EnvelopeCodec(body_format=FORMAT_JSON, compression=COMPRESSION_NONE)
+    return EnvelopeCodec()
+
+
+@pytest.mark.parametrize("payload", [ANALYSIS, HABIT, {"type": "custom_note", "data": "{}", "timestamp": 5}])
+def test_single_record_round_trip(codec, payload):
+    raw = codec.encode(payload)
+    assert is_envelope(raw)
+    assert codec.decode(raw) == payload
+
+
+def test_batch_round_trip(codec):
+    batch = {"type": "batch", "root": "0x" + "ab" * 32, "records": [ANALYSIS, HABIT]}
+    decoded = codec.decode(codec.encode(batch))
+    assert decoded == batch
+    assert [index for index, _ in iter_records(decoded)] == [0, 1]
+
+
+def test_envelope_is_smaller_than_legacy_json():
+    codec = EnvelopeCodec(body_format=FORMAT_JSON, compression=COMPRESSION_NONE)
+    legacy = json.dumps(HABIT).encode()
+    assert len(codec.encode(HABIT)) < len(legacy)
+
+
+def test_large_bodies_are_compressed_small_ones_are_not():
+    codec = EnvelopeCodec(body_format=FORMAT_JSON, compression=COMPRESSION_ZLIB, min_compress_size=128)
+    assert codec.encode(ANALYSIS)[2] >> 4 == COMPRESSION_ZLIB
+    assert codec.encode(HABIT)[2] >> 4 == COMPRESSION_NONE
+
+
+def test_decode_payload_reads_legacy_json_text():
+    assert decode_payload(json.dumps(HABIT).encode()) == HABIT
+    assert list(iter_records(HABIT)) == [(None, HABIT)]
+
+
+def test_decode_payload_reads_envelopes():
+    raw = EnvelopeCodec(body_format=FORMAT_JSON, compression=COMPRESSION_ZLIB).encode(ANALYSIS)
+    assert decode_payload(raw) == ANALYSIS
+
+
+def test_unknown_version_is_rejected():
+    raw = bytearray(EnvelopeCodec().encode(HABIT))
+    assert raw[0] == MAGIC
+    raw[1] = 99
+    with pytest.raises(EnvelopeError):
+        EnvelopeCodec().decode(bytes(raw))
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("uvicorn")
+
+from src.helpers.shared_state import MemoryStore
+from src.server import idempotency as idempotency_module
+from src.server.idempotency import IdempotencyConflict, IdempotencyStore
+
+SCOPE = "POST /analyze"
+BODY = {"user_id": "u1", "behavior": "doomscrolling"}
+
+
+class Handler:
+    """Counts executions and returns a fresh result for each"""
+
+    def __init__(self, fail_times=0, delay=0.0):
+        self.calls = 0
+        self.fail_times = fail_times
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.calls <= self.fail_times:
+            raise RuntimeError("upstream failed")
+        return {"run": self.calls}
+
+
+def test_same_key_replays_the_first_result():
+    store, handler = IdempotencyStore(), Handler()
+
+    async def scenario():
+        first = await store.run(SCOPE, "key-1", BODY, handler)
+        second = await store.run(SCOPE, "key-1", BODY, handler)
+        return first, second
+
+    assert asyncio.run(scenario()) == (({"run": 1}, False), ({"run": 1}, True))
+    assert handler.calls == 1
+
+
+def test_concurrent_retries_share_one_execution():
+    store, handler = IdempotencyStore(), Handler(delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(*(store.run(SCOPE, "key-1", BODY, handler) for _ in range(3)))
+
+    results = asyncio.run(scenario())
+    assert handler.calls == 1
+    assert [replayed for _, replayed in results] == [False, True, True]
+
+
+def test_key_reused_for_another_request_conflicts():
+    store = IdempotencyStore()
+
+    async def scenario():
+        await store.run(SCOPE, "key-1", BODY, Handler())
+        await store.run(SCOPE, "key-1", dict(BODY, behavior="snacking"), Handler())
+
+    with pytest.raises(IdempotencyConflict):
+        asyncio.run(scenario())
+
+
+def test_failures_are_not_replayed():
+    store, handler = IdempotencyStore(), Handler(fail_times=1)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await store.run(SCOPE, "key-1", BODY, handler)
+        return await store.run(SCOPE, "key-1", BODY, handler)
+
+    assert asyncio.run(scenario()) == ({"run": 2}, False)
+
+
+def test_unusable_result_runs_again():
+    store, handler = IdempotencyStore(), Handler()
+
+    async def scenario():
+        await store.run(SCOPE, "key-1", BODY, handler)
+        return await store.run(SCOPE, "key-1", BODY, handler, reusable=lambda result: False)
+
+    assert asyncio.run(scenario()) == ({"run": 2}, False)
+
+
+def test_requests_without_a_key_dedupe_by_body_unless_disabled():
+    store, handler = IdempotencyStore(), Handler()
+
+    async def scenario():
+        await store.run(SCOPE, None, BODY, handler)
+        deduped = await store.run(SCOPE, None, BODY, handler)
+        repeated = await store.run(SCOPE, None, BODY, handler, fallback=False)
+        return deduped, repeated
+
+    assert asyncio.run(scenario()) == (({"run": 1}, True), ({"run": 2}, False))
+
+
+def test_retry_on_another_worker_replays_through_the_shared_store(monkeypatch):
+    monkeypatch.setattr(idempotency_module, "REMOTE_POLL_INTERVAL", 0.01)
+    shared = MemoryStore()
+    first_worker, second_worker = IdempotencyStore(shared=shared), IdempotencyStore(shared=shared)
+    handler = Handler(delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(
+            first_worker.run(SCOPE, "key-1", BODY, handler),
+            second_worker.run(SCOPE, "key-1", BODY, handler),
+        )
+
+    first, second = asyncio.run(scenario())
+    assert handler.calls == 1
+    assert sorted([first, second], key=lambda outcome: outcome[1]) == [({"run": 1}, False), ({"run": 1}, True)]
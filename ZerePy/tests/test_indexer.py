@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from src.helpers.sonic.envelope import decode_payload
+from src.helpers.sonic.indexer import RecordIndex, StoreIndexer
+
+ACCOUNT = "0x00000000000000000000000000000000000000aa"
+STRANGER = "0x00000000000000000000000000000000000000bb"
+
+
+def store_tx(tx_hash, user_id, sender=ACCOUNT, data_type="habit_completion"):
+    payload = {"type": data_type, "data": json.dumps({"user_id": user_id}), "timestamp": 1}
+    return {"hash": tx_hash, "from": sender, "to": ACCOUNT, "input": "0x" + json.dumps(payload).encode().hex()}
+
+
+class FakeChain:
+    """Blocks by number; replacing some of them simulates a reorg"""
+
+    def __init__(self, transactions_by_block, fork="a"):
+        self.blocks = {}
+        self.extend(transactions_by_block, fork)
+
+    def extend(self, transactions_by_block, fork):
+        for number, transactions in transactions_by_block.items():
+            self.blocks[number] = {"hash": f"0x{fork}{number:063x}", "transactions": transactions}
+
+    @property
+    def block_number(self):
+        return max(self.blocks)
+
+    def get_block(self, number, full_transactions=False):
+        return self.blocks[number]
+
+
+class FakeWeb3:
+    def __init__(self, chain):
+        self.eth = chain
+
+
+@pytest.fixture
+def index(tmp_path):
+    return RecordIndex(tmp_path / "index.sqlite")
+
+
+def make_indexer(chain, index, **kwargs):
+    return StoreIndexer(FakeWeb3(chain), ACCOUNT, index, decode_payload, start_block=1, chunk_size=2, **kwargs)
+
+
+def tx_hashes(index, user_id):
+    return [record["tx_hash"] for record in index.records_for(user_id)]
+
+
+def test_sync_indexes_own_records_by_user(index):
+    chain = FakeChain({
+        1: [],
+        2: [store_tx("0x01", "alice")],
+        3: [store_tx("0x02", "bob"), store_tx("0x03", "alice", sender=STRANGER)],
+        4: [store_tx("0x04", "alice", data_type="behavior_analysis")],
+    })
+    indexer = make_indexer(chain, index)
+    assert indexer.sync() == 4
+    assert index.get_checkpoint() == 4
+    assert tx_hashes(index, "alice") == ["0x01", "0x04"]
+    assert tx_hashes(index, "bob") == ["0x02"]
+    assert [r["type"] for r in index.records_for("alice", "behavior_analysis")] == ["behavior_analysis"]
+
+
+def test_wallet_pool_senders_are_indexed(index):
+    chain = FakeChain({1: [store_tx("0x01", "alice", sender=STRANGER)]})
+    make_indexer(chain, index, senders=[STRANGER.upper()]).sync()
+    assert tx_hashes(index, "alice") == ["0x01"]
+
+
+def test_reorg_rolls_back_to_the_common_ancestor(index):
+    chain = FakeChain({
+        1: [store_tx("0x01", "alice")],
+        2: [],
+        3: [store_tx("0x03", "alice")],
+        4: [store_tx("0x04", "alice")],
+    })
+    indexer = make_indexer(chain, index)
+    indexer.sync()
+    assert tx_hashes(index, "alice") == ["0x01", "0x03", "0x04"]
+
+    # Blocks 3 and 4 are replaced; 0x04 is dropped and 0x03 moves to the new block 4
+    chain.extend({3: [], 4: [store_tx("0x03", "alice")], 5: [store_tx("0x05", "alice")]}, fork="b")
+    assert indexer.sync() == 3
+    assert index.get_checkpoint() == 5
+    assert [(r["tx_hash"], r["block_number"]) for r in index.records_for("alice")] == [
+        ("0x01", 1), ("0x03", 4), ("0x05", 5)
+    ]
+    assert index.block_hash(3) == chain.blocks[3]["hash"]
+
+
+def test_incremental_sync_without_reorg_rescans_nothing(index):
+    chain = FakeChain({1: [], 2: [store_tx("0x02", "alice")]})
+    indexer = make_indexer(chain, index)
+    indexer.sync()
+    assert indexer.sync() == 0
+    chain.extend({3: [store_tx("0x03", "alice")]}, fork="a")
+    assert indexer.sync() == 1
+    assert tx_hashes(index, "alice") == ["0x02", "0x03"]
+
+
+def test_lost_lease_stops_the_pass_before_writing(index):
+    chain = FakeChain({number: [store_tx(f"0x{number:02x}", "alice")] for number in range(1, 7)})
+    indexer = make_indexer(chain, index)
+    leases = iter([True, False])
+    assert indexer.sync(claim=lambda: next(leases)) == 2
+    assert index.get_checkpoint() == 2
+    assert tx_hashes(index, "alice") == ["0x01", "0x02"]
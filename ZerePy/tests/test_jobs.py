@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("uvicorn")
+
+from src.helpers.shared_state import MemoryStore
+from src.server import jobs as jobs_module
+from src.server.jobs import FAILED, SUCCEEDED, JobQueue, JobQueueFull
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_jobs_run_and_report_their_result():
+    async def scenario():
+        queue = JobQueue(workers=2)
+
+        async def work(job):
+            job.set_stage("thinking")
+            return {"answer": 42}
+
+        job = queue.submit("analyze", work)
+        await job.wait(timeout=1)
+        await queue.shutdown()
+        return queue, job
+
+    queue, job = run(scenario())
+    assert job.status == SUCCEEDED
+    assert queue.status(job.id)["result"] == {"answer": 42}
+    assert queue.metrics()["succeeded"] == 1
+
+
+def test_failures_keep_the_error_status():
+    class NotFound(Exception):
+        status_code = 404
+        detail = "agent not loaded"
+
+    async def scenario():
+        queue = JobQueue(workers=1)
+
+        async def work(job):
+            raise NotFound()
+
+        job = queue.submit("analyze", work)
+        await job.wait(timeout=1)
+        await queue.shutdown()
+        return job
+
+    job = run(scenario())
+    assert (job.status, job.error, job.error_status) == (FAILED, "agent not loaded", 404)
+
+
+def test_full_queue_refuses_new_jobs():
+    async def scenario():
+        queue = JobQueue(workers=0, max_pending=1)
+
+        async def work(job):
+            return None
+
+        queue.submit("analyze", work)
+        with pytest.raises(JobQueueFull):
+            queue.submit("analyze", work)
+        assert queue.metrics()["rejected"] == 1
+        await queue.shutdown()
+
+    run(scenario())
+
+
+def test_events_follow_the_job_until_it_finishes():
+    async def scenario():
+        queue = JobQueue(workers=1)
+        release = asyncio.Event()
+
+        async def work(job):
+            job.set_stage("fetching")
+            await release.wait()
+            return "done"
+
+        job = queue.submit("analyze", work)
+        events = []
+        async for event in job.events():
+            events.append((event["status"], event["stage"]))
+            if event["stage"] == "fetching":
+                release.set()
+        await queue.shutdown()
+        return events
+
+    events = run(scenario())
+    assert events[0] == ("queued", None)
+    assert ("running", "fetching") in events
+    assert events[-1] == ("succeeded", "fetching")
+
+
+def test_shutdown_fails_unfinished_jobs():
+    async def scenario():
+        queue = JobQueue(workers=1)
+
+        async def work(job):
+            await asyncio.sleep(60)
+
+        job = queue.submit("analyze", work)
+        await asyncio.sleep(0)
+        await queue.shutdown()
+        return job
+
+    job = run(scenario())
+    assert (job.status, job.error_status) == (FAILED, 503)
+
+
+def test_other_workers_read_job_state_from_the_store(monkeypatch):
+    monkeypatch.setattr(jobs_module, "REMOTE_POLL_INTERVAL", 0.01)
+    store = MemoryStore()
+
+    async def scenario():
+        owner = JobQueue(workers=1, store=store)
+        reader = JobQueue(workers=1, store=store)
+
+        async def work(job):
+            return "shared"
+
+        job = owner.submit("analyze", work)
+        status = await reader.wait_status(job.id, timeout=2)
+        await owner.shutdown()
+        return status
+
+    status = run(scenario())
+    assert status["status"] == SUCCEEDED
+    assert status["result"] == "shared"
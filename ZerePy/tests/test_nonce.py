@@ -0,0 +1,106 @@
+import pytest
+
+from src.helpers.shared_state import MemoryStore, SQLiteStore
+from src.helpers.sonic.nonce import NonceManager
+
+
+class FakeEth:
+    def __init__(self, pending):
+        self.pending = pending
+        self.syncs = 0
+
+    def get_transaction_count(self, address, block_identifier):
+        assert block_identifier == "pending"
+        self.syncs += 1
+        return self.pending
+
+
+class FakeWeb3:
+    def __init__(self, pending=7):
+        self.eth = FakeEth(pending)
+
+
+@pytest.fixture(params=["local", "memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStore()
+    if request.param == "sqlite":
+        return SQLiteStore(tmp_path / "state.sqlite")
+    return None
+
+
+def test_allocates_sequentially_after_one_sync(store):
+    web3 = FakeWeb3(pending=7)
+    manager = NonceManager(web3, "0xabc", store=store)
+    assert [manager.allocate() for _ in range(3)] == [7, 8, 9]
+    assert web3.eth.syncs == 1
+
+
+def test_released_nonces_are_reused_lowest_first(store):
+    manager = NonceManager(FakeWeb3(pending=7), "0xabc", store=store)
+    nonces = [manager.allocate() for _ in range(4)]
+    manager.release(nonces[2])
+    manager.release(nonces[0])
+    assert manager.allocate() == 7
+    assert manager.allocate() == 9
+    assert manager.allocate() == 11
+
+
+def test_releasing_the_newest_nonce_rewinds(store):
+    manager = NonceManager(FakeWeb3(pending=7), "0xabc", store=store)
+    manager.allocate()
+    manager.release(manager.allocate())
+    assert manager.take_gaps() == []
+    assert manager.allocate() == 8
+
+
+def test_resync_rereads_the_pending_count(store):
+    web3 = FakeWeb3(pending=7)
+    manager = NonceManager(web3, "0xabc", store=store)
+    manager.allocate()
+    web3.eth.pending = 20
+    manager.resync()
+    assert manager.allocate() == 20
+    assert web3.eth.syncs == 2
+
+
+def test_workers_sharing_a_store_share_one_sequence(tmp_path):
+    store = SQLiteStore(tmp_path / "state.sqlite")
+    first = NonceManager(FakeWeb3(pending=7), "0xabc", store=store)
+    second = NonceManager(FakeWeb3(pending=7), "0xabc", store=store)
+    assert [first.allocate(), second.allocate(), first.allocate()] == [7, 8, 9]
+
+
+def test_stale_nonce_rejection_resyncs_and_retries():
+    web3 = FakeWeb3(pending=7)
+    manager = NonceManager(web3, "0xabc")
+    sent = []
+
+    def send(nonce):
+        if not sent:
+            web3.eth.pending = 12
+            sent.append(nonce)
+            raise ValueError("nonce too low")
+        sent.append(nonce)
+        return f"tx-{nonce}"
+
+    assert manager.send(send) == "tx-12"
+    assert sent == [7, 12]
+
+
+def test_failed_send_fills_the_gap_it_leaves():
+    manager = NonceManager(FakeWeb3(pending=7), "0xabc")
+    manager.allocate()
+    unsent = manager.allocate()
+    manager.allocate()
+    # The retry of 8 fails too, while 9 is already out
+    manager.release(unsent)
+    filled = []
+
+    def send(nonce):
+        raise RuntimeError("insufficient funds")
+
+    with pytest.raises(RuntimeError):
+        manager.send(send, fill_gap=filled.append)
+    assert filled == [8]
+    assert manager.allocate() == 10
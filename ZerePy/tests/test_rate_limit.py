@@ -0,0 +1,64 @@
+import pytest
+
+from src.helpers.rate_limit import RateLimiter, TokenBucket
+
+
+def test_unlimited_bucket_never_waits(clock):
+    bucket = TokenBucket()
+    assert [bucket.reserve() for _ in range(100)] == [0.0] * 100
+
+
+def test_burst_then_fifo_reservations(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    # The balance goes negative, so each later caller queues behind the previous one
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_tokens_refill_up_to_capacity(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+    clock.advance(60)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_pause_applies_to_unlimited_buckets(clock):
+    bucket = TokenBucket()
+    bucket.pause(3)
+    assert bucket.reserve() == pytest.approx(3)
+    clock.advance(3)
+    assert bucket.reserve() == 0.0
+
+
+def test_learned_quota_lowers_rate_until_window_resets(clock):
+    bucket = TokenBucket(rate=5, burst=1)
+    bucket.learn(remaining=1, reset_in=10)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(10)
+    clock.advance(20)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.2)
+
+
+def test_exhausted_quota_pauses(clock):
+    bucket = TokenBucket(rate=5)
+    bucket.learn(remaining=0, reset_in=7)
+    assert bucket.reserve() == pytest.approx(7)
+
+
+def test_endpoint_bucket_is_checked_with_the_default(clock):
+    limiter = RateLimiter.from_config({"rate": 100, "burst": 100, "endpoints": {"post-tweet": {"rate": 1, "burst": 1}}})
+    assert limiter.reserve("post-tweet") == 0.0
+    assert limiter.reserve("post-tweet") == pytest.approx(1)
+    assert limiter.reserve("get-latest-tweets") == 0.0
+
+
+def test_retry_after_header_pauses_the_bucket(clock):
+    limiter = RateLimiter()
+    assert limiter.update_from_headers({"Retry-After": "2"}) == pytest.approx(2)
+    assert limiter.reserve() == pytest.approx(2)
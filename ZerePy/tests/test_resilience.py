@@ -0,0 +1,90 @@
+import pytest
+
+from src.helpers.rate_limit import RateLimitExceeded
+from src.helpers.resilience import CircuitBreaker, CircuitOpenError, RetryBudget, RetryPolicy
+
+
+def open_breaker(breaker, failures):
+    for _ in range(failures):
+        assert breaker.allow()
+        breaker.record_failure(RuntimeError("upstream down"))
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+    open_breaker(breaker, 2)
+    assert breaker.state == CircuitBreaker.CLOSED
+    open_breaker(breaker, 1)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.check()
+    assert error.value.retry_in == pytest.approx(30)
+    assert breaker.snapshot()["last_error"] == "upstream down"
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("test", failure_threshold=2)
+    open_breaker(breaker, 1)
+    breaker.record_success()
+    open_breaker(breaker, 1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=30)
+    open_breaker(breaker, 1)
+    clock.advance(29)
+    assert not breaker.allow()
+    clock.advance(1)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_the_circuit(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+    open_breaker(breaker, 3)
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_in() == pytest.approx(30)
+
+
+def test_released_probe_slot_can_be_claimed_again(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=30)
+    open_breaker(breaker, 1)
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_backoff_stays_within_jittered_bounds():
+    policy = RetryPolicy(base_delay=1, max_delay=8, multiplier=2)
+    for attempt, cap in [(0, 1), (1, 2), (2, 4), (3, 8), (10, 8)]:
+        delays = [policy.backoff(attempt) for _ in range(50)]
+        assert all(cap / 2 <= delay <= cap for delay in delays)
+
+
+def test_caller_errors_are_not_retried():
+    assert RetryPolicy.is_retryable(ConnectionError())
+    assert not RetryPolicy.is_retryable(ValueError())
+    assert not RetryPolicy.is_retryable(RateLimitExceeded("slow down"))
+    assert not RetryPolicy.is_retryable(CircuitOpenError("test", 1))
+
+
+def test_retry_budget_scales_with_call_volume(clock):
+    budget = RetryBudget(ratio=0.5, min_retries=1, window=10)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    for _ in range(4):
+        budget.record_call()
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    clock.advance(11)
+    assert budget.try_spend()
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from src.helpers import shared_state
+from src.helpers.shared_state import (
+    MemoryStore, SharedStore, SharedStoreError, SQLiteStore, get_shared_store, open_shared_store
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStore()
+    return SQLiteStore(tmp_path / "state.sqlite")
+
+
+def test_set_get_delete(store):
+    assert store.get("missing") is None
+    store.set("agent", {"name": "example", "tags": ["a"]})
+    assert store.get("agent") == {"name": "example", "tags": ["a"]}
+    store.delete("agent")
+    assert store.get("agent") is None
+
+
+def test_values_are_copies(store):
+    value = {"tags": ["a"]}
+    store.set("agent", value)
+    value["tags"].append("b")
+    store.get("agent")["tags"].append("c")
+    assert store.get("agent") == {"tags": ["a"]}
+
+
+def test_add_only_claims_free_keys(store):
+    assert store.add("claim", "worker-1")
+    assert not store.add("claim", "worker-2")
+    assert store.get("claim") == "worker-1"
+
+
+def test_entries_expire(store, monkeypatch):
+    now = time.time()
+    store.set("lease", "worker-1", ttl=10)
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert store.get("lease") is None
+    assert store.add("lease", "worker-2", ttl=10)
+
+
+def test_update_is_atomic_across_threads(store):
+    def increment():
+        for _ in range(50):
+            store.update("counter", lambda value: (value or 0) + 1)
+
+    threads = [threading.Thread(target=increment) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.get("counter") == 200
+
+
+def test_lock_times_out_while_held(store):
+    held = threading.Event()
+    release = threading.Event()
+
+    def holder():
+        with store.lock("agent-loop"):
+            held.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    held.wait(5)
+    try:
+        with pytest.raises(SharedStoreError):
+            with store.lock("agent-loop", timeout=0.05):
+                pass
+    finally:
+        release.set()
+        thread.join()
+    with store.lock("agent-loop", timeout=1):
+        pass
+
+
+def test_sqlite_stores_on_one_file_share_state(tmp_path):
+    first = SQLiteStore(tmp_path / "state.sqlite")
+    second = SQLiteStore(tmp_path / "state.sqlite")
+    assert first.add("claim", "worker-1")
+    assert not second.add("claim", "worker-2")
+    assert second.get("claim") == "worker-1"
+
+
+def test_stores_must_implement_every_operation():
+    class Partial(SharedStore):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_store_selection_from_the_environment(monkeypatch, tmp_path):
+    monkeypatch.setattr(shared_state, "_shared_store", None)
+    monkeypatch.delenv(shared_state.STATE_STORE_ENV, raising=False)
+    assert get_shared_store() is None
+
+    monkeypatch.setenv(shared_state.STATE_STORE_ENV, f"sqlite:///{tmp_path}/state.sqlite")
+    store = get_shared_store()
+    assert isinstance(store, SQLiteStore)
+    assert get_shared_store() is store
+
+    assert isinstance(open_shared_store("memory"), MemoryStore)
+    with pytest.raises(SharedStoreError):
+        open_shared_store("postgres://localhost")
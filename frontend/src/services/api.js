@@ -18,6 +18,24 @@ export async function loadAgent(agentName) {
   }
 }
 
+// Random v4 UUID; crypto.randomUUID only exists in secure contexts (HTTPS or localhost)
+function generateIdempotencyKey() {
+  if (typeof crypto.randomUUID === "function") {
+    return crypto.randomUUID();
+  }
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  bytes[6] = (bytes[6] & 0x0f) | 0x40;
+  bytes[8] = (bytes[8] & 0x3f) | 0x80;
+  const hex = Array.from(bytes, (byte) => byte.toString(16).padStart(2, "0"));
+  return [
+    hex.slice(0, 4).join(""),
+    hex.slice(4, 6).join(""),
+    hex.slice(6, 8).join(""),
+    hex.slice(8, 10).join(""),
+    hex.slice(10, 16).join(""),
+  ].join("-");
+}
+
 // Function to retry an operation with retries
 async function retryOperation(operation, maxRetries = 3, delay = 2000) {
   let lastError;
@@ -45,15 +63,41 @@ async function retryOperation(operation, maxRetries = 3, delay = 2000) {
   throw lastError;
 }
 
+// Function to wait for a queued server job, long-polling until it finishes
+async function waitForJob(jobId, pollSeconds = 25) {
+  for (;;) {
+    const response = await fetch(
+      `${API_BASE_URL}/jobs/${jobId}?wait=${pollSeconds}`
+    );
+
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    const job = await response.json();
+
+    if (job.status === "succeeded") {
+      return job.result;
+    }
+    if (job.status === "failed") {
+      throw new Error(job.error || "Analysis job failed");
+    }
+  }
+}
+
 export async function analyzeBehavior(behaviorData) {
   try {
     await loadAgent("mentalhealthai");
 
+    // Same key on every retry, so the server replays the first job instead of starting another
+    const idempotencyKey = generateIdempotencyKey();
+
     const makeRequest = async () => {
       const response = await fetch(`${API_BASE_URL}/analyze`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
+          "Idempotency-Key": idempotencyKey,
         },
         body: JSON.stringify({
           user_id: behaviorData.user_id,
@@ -74,7 +118,9 @@ export async function analyzeBehavior(behaviorData) {
       return response.json();
     };
 
-    const data = await retryOperation(makeRequest);
+    // The server queues the analysis and answers with a job id right away
+    const job = await retryOperation(makeRequest);
+    const data = await waitForJob(job.job_id);
 
     if (data.status === "success") {
       const txHash = data.blockchain_tx?.match(/0x[a-fA-F0-9]{64}/)?.[0];